@@ -12,7 +12,7 @@ import sqlalchemy as sa
 
 # revision identifiers, used by Alembic.
 revision = "0006_merge_heads"
-down_revision = ("0005_country_company", "765bab9d2e9")
+down_revision = ("0005_add_country_company_to_users", "765bab9d2e9")
 branch_labels = None
 depends_on = None
 
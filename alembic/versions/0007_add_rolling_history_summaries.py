@@ -0,0 +1,43 @@
+"""add rolling history summary columns to chat_sessions and discussion_topics
+
+Revision ID: 0007_rolling_history_summaries
+Revises: 0006_merge_heads
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007_rolling_history_summaries'
+down_revision = '0006_merge_heads'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Summary of older messages + id of the last message folded into it
+    op.execute("""
+        ALTER TABLE chat_sessions
+        ADD COLUMN IF NOT EXISTS history_summary TEXT,
+        ADD COLUMN IF NOT EXISTS history_summary_message_id INTEGER;
+    """)
+    op.execute("""
+        ALTER TABLE discussion_topics
+        ADD COLUMN IF NOT EXISTS history_summary TEXT,
+        ADD COLUMN IF NOT EXISTS history_summary_message_id INTEGER;
+    """)
+
+
+def downgrade():
+    op.execute("""
+        ALTER TABLE chat_sessions
+        DROP COLUMN IF EXISTS history_summary,
+        DROP COLUMN IF EXISTS history_summary_message_id;
+    """)
+    op.execute("""
+        ALTER TABLE discussion_topics
+        DROP COLUMN IF EXISTS history_summary,
+        DROP COLUMN IF EXISTS history_summary_message_id;
+    """)
@@ -0,0 +1,45 @@
+"""create email_outbox table
+
+Revision ID: 0008_create_email_outbox
+Revises: 0007_rolling_history_summaries
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008_create_email_outbox'
+down_revision = '0007_rolling_history_summaries'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS email_outbox (
+            id SERIAL PRIMARY KEY,
+            kind VARCHAR(50) NOT NULL DEFAULT 'generic',
+            retrospective_id INTEGER NULL REFERENCES retrospectives(id),
+            to_email VARCHAR(255) NOT NULL,
+            subject VARCHAR(500) NOT NULL,
+            html_content TEXT NOT NULL,
+            text_content TEXT NULL,
+            attachments JSON NULL,
+            status VARCHAR(20) NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL DEFAULT 5,
+            next_attempt_at TIMESTAMPTZ DEFAULT NOW(),
+            last_error TEXT NULL,
+            sent_at TIMESTAMPTZ NULL,
+            created_at TIMESTAMPTZ DEFAULT NOW(),
+            updated_at TIMESTAMPTZ NULL
+        );
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS ix_email_outbox_id ON email_outbox (id);")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_email_outbox_status_next_attempt ON email_outbox (status, next_attempt_at);")
+
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS email_outbox;")
@@ -0,0 +1,27 @@
+"""add (status, scheduled_for) index for the reminder dispatcher
+
+Revision ID: 0009_reminder_dispatch_index
+Revises: 0008_create_email_outbox
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009_reminder_dispatch_index'
+down_revision = '0008_create_email_outbox'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_automated_reminders_status_scheduled_for "
+        "ON automated_reminders (status, scheduled_for);"
+    )
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_automated_reminders_status_scheduled_for;")
@@ -0,0 +1,38 @@
+"""create summary_exports table (cached summary PDFs)
+
+Revision ID: 0010_create_summary_exports
+Revises: 0009_reminder_dispatch_index
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010_create_summary_exports'
+down_revision = '0009_reminder_dispatch_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS summary_exports (
+            id SERIAL PRIMARY KEY,
+            retrospective_id INTEGER NOT NULL REFERENCES retrospectives(id) ON DELETE CASCADE,
+            kind VARCHAR(20) NOT NULL DEFAULT 'summary_pdf',
+            content_version VARCHAR(64) NOT NULL,
+            media_type VARCHAR(100) NOT NULL DEFAULT 'application/pdf',
+            content BYTEA NOT NULL,
+            size_bytes INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMPTZ DEFAULT NOW(),
+            CONSTRAINT uq_summary_export_version UNIQUE (retrospective_id, kind, content_version)
+        );
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS ix_summary_exports_id ON summary_exports (id);")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_summary_exports_retrospective_id ON summary_exports (retrospective_id);")
+
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS summary_exports;")
@@ -0,0 +1,25 @@
+"""add summary_snapshot to retrospectives
+
+Revision ID: 0011_summary_snapshot
+Revises: 0010_create_summary_exports
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0011_summary_snapshot'
+down_revision = '0010_create_summary_exports'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Final voting results, written by finalize_voting
+    op.execute("ALTER TABLE retrospectives ADD COLUMN IF NOT EXISTS summary_snapshot JSON;")
+
+
+def downgrade():
+    op.execute("ALTER TABLE retrospectives DROP COLUMN IF EXISTS summary_snapshot;")
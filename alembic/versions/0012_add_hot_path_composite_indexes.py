@@ -0,0 +1,94 @@
+"""add composite indexes for hot access paths
+
+Revision ID: 0012_hot_path_indexes
+Revises: 0011_summary_snapshot
+Create Date: 2026-10-19
+
+On PostgreSQL the indexes are built CONCURRENTLY (outside a transaction) so live
+tables are not write-locked. A unique index is only created if the existing data has
+no duplicates; otherwise a plain index with the same columns is created instead and a
+warning printed, so the duplicates can be cleaned up and the migration re-run.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0012_hot_path_indexes'
+down_revision = '0011_summary_snapshot'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns, unique)
+INDEXES = [
+    ("uq_retrospective_participants_retro_user", "retrospective_participants", ["retrospective_id", "user_id"], True),
+    ("uq_vote_allocations_session_theme_user", "vote_allocations", ["voting_session_id", "theme_group_id", "user_id"], True),
+    ("ix_vote_allocations_session_user", "vote_allocations", ["voting_session_id", "user_id"], False),
+    ("uq_discussion_topics_retro_theme", "discussion_topics", ["retrospective_id", "theme_group_id"], True),
+    ("ix_chat_messages_session_created", "chat_messages", ["session_id", "created_at"], False),
+    ("ix_discussion_messages_topic_created", "discussion_messages", ["discussion_topic_id", "created_at"], False),
+    ("ix_workspace_members_ws_user_active", "workspace_members", ["workspace_id", "user_id", "is_active"], False),
+    ("ix_retrospective_responses_retro_theme", "retrospective_responses", ["retrospective_id", "theme_group_id"], False),
+]
+
+
+def _has_duplicates(bind, table, columns):
+    cols = ", ".join(columns)
+    row = bind.execute(sa.text(
+        f"SELECT 1 FROM {table} GROUP BY {cols} HAVING COUNT(*) > 1 LIMIT 1"
+    )).first()
+    return row is not None
+
+
+def _fallback_name(name):
+    return "ix_" + name[3:] if name.startswith("uq_") else name
+
+
+def upgrade():
+    bind = op.get_bind()
+    is_postgres = bind.dialect.name == "postgresql"
+
+    statements = []
+    for name, table, columns, unique in INDEXES:
+        if unique and _has_duplicates(bind, table, columns):
+            print(f"WARNING: duplicate ({', '.join(columns)}) rows in {table}; creating non-unique index instead of {name}")
+            name, unique = _fallback_name(name), False
+        statements.append((name, table, columns, unique))
+
+    if not is_postgres:
+        for name, table, columns, unique in statements:
+            op.execute(f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)});")
+        return
+
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique in statements:
+            # A failed CONCURRENTLY build leaves an INVALID index that IF NOT EXISTS would skip
+            invalid = bind.execute(sa.text(
+                "SELECT 1 FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid "
+                "WHERE c.relname = :name AND NOT i.indisvalid"
+            ), {"name": name}).first()
+            if invalid:
+                op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name};")
+            op.execute(
+                f"CREATE {'UNIQUE ' if unique else ''}INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                f"ON {table} ({', '.join(columns)});"
+            )
+
+
+def downgrade():
+    bind = op.get_bind()
+    names = []
+    for name, _, _, unique in INDEXES:
+        names.append(name)
+        if unique:
+            names.append(_fallback_name(name))
+
+    if bind.dialect.name != "postgresql":
+        for name in names:
+            op.execute(f"DROP INDEX IF EXISTS {name};")
+        return
+
+    with op.get_context().autocommit_block():
+        for name in names:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name};")
@@ -0,0 +1,46 @@
+"""create workspace_weekly_rollups table (pre-aggregated report data)
+
+Revision ID: 0013_weekly_rollups
+Revises: 0012_hot_path_indexes
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0013_weekly_rollups'
+down_revision = '0012_hot_path_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS workspace_weekly_rollups (
+            id SERIAL PRIMARY KEY,
+            workspace_id INTEGER NOT NULL REFERENCES workspaces(id) ON DELETE CASCADE,
+            week_start DATE NOT NULL,
+            retrospectives_completed INTEGER NOT NULL DEFAULT 0,
+            action_items_created INTEGER NOT NULL DEFAULT 0,
+            action_items_completed INTEGER NOT NULL DEFAULT 0,
+            completion_seconds_total DOUBLE PRECISION NOT NULL DEFAULT 0,
+            completed_with_duration INTEGER NOT NULL DEFAULT 0,
+            status_counts JSON,
+            assignee_counts JSON,
+            computed_at TIMESTAMPTZ DEFAULT NOW(),
+            CONSTRAINT uq_workspace_weekly_rollup UNIQUE (workspace_id, week_start)
+        );
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS ix_workspace_weekly_rollups_id ON workspace_weekly_rollups (id);")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_workspace_weekly_rollups_workspace_id ON workspace_weekly_rollups (workspace_id);")
+    # The report computes the current (not yet rolled up) week live from these
+    op.execute("CREATE INDEX IF NOT EXISTS ix_retrospectives_workspace_created ON retrospectives (workspace_id, created_at);")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_action_items_workspace_created ON action_items (workspace_id, created_at);")
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_action_items_workspace_created;")
+    op.execute("DROP INDEX IF EXISTS ix_retrospectives_workspace_created;")
+    op.execute("DROP TABLE IF EXISTS workspace_weekly_rollups;")
@@ -0,0 +1,41 @@
+"""create ai_usage_events table (AI token usage ledger)
+
+Revision ID: 0014_ai_usage_events
+Revises: 0013_weekly_rollups
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0014_ai_usage_events'
+down_revision = '0013_weekly_rollups'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS ai_usage_events (
+            id BIGSERIAL PRIMARY KEY,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            endpoint VARCHAR(100) NOT NULL,
+            model VARCHAR(100),
+            workspace_id INTEGER,
+            retrospective_id INTEGER,
+            user_id INTEGER,
+            prompt_tokens INTEGER NOT NULL DEFAULT 0,
+            completion_tokens INTEGER NOT NULL DEFAULT 0,
+            latency_ms DOUBLE PRECISION,
+            cached BOOLEAN NOT NULL DEFAULT FALSE
+        );
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS ix_ai_usage_events_created_at ON ai_usage_events (created_at);")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_ai_usage_events_workspace_created ON ai_usage_events (workspace_id, created_at);")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_ai_usage_events_retrospective_id ON ai_usage_events (retrospective_id);")
+
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS ai_usage_events;")
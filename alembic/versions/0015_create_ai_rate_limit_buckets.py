@@ -0,0 +1,30 @@
+"""create ai_rate_limit_buckets table (shared AI rate limits)
+
+Revision ID: 0015_rate_limit_buckets
+Revises: 0014_ai_usage_events
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0015_rate_limit_buckets'
+down_revision = '0014_ai_usage_events'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS ai_rate_limit_buckets (
+            key VARCHAR(200) PRIMARY KEY,
+            tokens DOUBLE PRECISION NOT NULL,
+            updated_at DOUBLE PRECISION NOT NULL
+        );
+    """)
+
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS ai_rate_limit_buckets;")
@@ -0,0 +1,175 @@
+"""
+Process-wide cap on outstanding LLM calls, with a bounded wait queue.
+
+At most AI_MAX_CONCURRENT_CALLS chat completions run at once in this process; further
+callers wait up to AI_QUEUE_TIMEOUT_SECONDS, and no more than AI_MAX_QUEUED_CALLS may
+wait. Whoever cannot get a slot gets AICapacityExceeded, carrying a Retry-After hint.
+
+Two ways in:
+  - AIClient.chat_complete wraps every network call in llm_slot(): a blocking wait in the
+    caller's thread. Routes treat AICapacityExceeded like any AI failure (fallback reply).
+  - Rate-limited routes reserve a slot for the whole request up front with
+    reserve_request_slot() (app/api/dependencies/rate_limit.py), waiting on the event loop
+    instead of a worker thread and answering 429 when the queue is full. AI calls made
+    while handling that request reuse the reservation instead of taking a second slot.
+
+The cap is per process: with N workers, up to N * AI_MAX_CONCURRENT_CALLS calls run.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterable, Iterator, Optional
+
+from app.core import metrics
+from app.core.config import settings
+
+
+class AICapacityExceeded(RuntimeError):
+    """No LLM slot within the queue timeout (or the queue is full)."""
+
+    def __init__(self, reason: str, retry_after_seconds: float):
+        super().__init__(f"AI capacity exceeded ({reason}); retry in {retry_after_seconds:.0f}s")
+        self.reason = reason
+        self.retry_after_seconds = retry_after_seconds
+
+
+AI_THROTTLED = metrics.Counter(
+    "ai_throttled_total", "AI requests refused by rate limits or the LLM concurrency cap", ("endpoint", "reason")
+)
+
+
+class LLMConcurrencyLimiter:
+    def __init__(self, max_concurrent: int, max_queued: int, queue_timeout_seconds: float):
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queued = max(0, max_queued)
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.in_use = 0
+        self.waiting = 0
+        self._cond = threading.Condition()
+
+    def _retry_after(self) -> float:
+        return max(1.0, self.queue_timeout_seconds)
+
+    def _try_acquire(self) -> bool:
+        if self.in_use < self.max_concurrent:
+            self.in_use += 1
+            return True
+        return False
+
+    def acquire(self, timeout: Optional[float] = None) -> None:
+        """Blocking acquire; raises AICapacityExceeded."""
+        timeout = self.queue_timeout_seconds if timeout is None else timeout
+        with self._cond:
+            if self._try_acquire():
+                return
+            if self.waiting >= self.max_queued:
+                raise AICapacityExceeded("queue full", self._retry_after())
+            self.waiting += 1
+            try:
+                deadline = time.monotonic() + timeout
+                while not self._try_acquire():
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise AICapacityExceeded("queue timeout", self._retry_after())
+                    self._cond.wait(remaining)
+            finally:
+                self.waiting -= 1
+
+    async def acquire_async(self, timeout: Optional[float] = None) -> None:
+        """Like acquire() but waits on the event loop, so queued requests hold no worker thread."""
+        timeout = self.queue_timeout_seconds if timeout is None else timeout
+        with self._cond:
+            if self._try_acquire():
+                return
+            if self.waiting >= self.max_queued:
+                raise AICapacityExceeded("queue full", self._retry_after())
+            self.waiting += 1
+        try:
+            deadline = time.monotonic() + timeout
+            delay = 0.01
+            while True:
+                await asyncio.sleep(delay)
+                with self._cond:
+                    if self._try_acquire():
+                        return
+                if time.monotonic() >= deadline:
+                    raise AICapacityExceeded("queue timeout", self._retry_after())
+                delay = min(0.1, delay * 2)
+        finally:
+            with self._cond:
+                self.waiting -= 1
+
+    def release(self) -> None:
+        with self._cond:
+            self.in_use -= 1
+            self._cond.notify()
+
+
+limiter = LLMConcurrencyLimiter(
+    max_concurrent=settings.AI_MAX_CONCURRENT_CALLS,
+    max_queued=settings.AI_MAX_QUEUED_CALLS,
+    queue_timeout_seconds=settings.AI_QUEUE_TIMEOUT_SECONDS,
+)
+
+
+class _Reservation:
+    __slots__ = ("active",)
+
+    def __init__(self):
+        self.active = True
+
+
+# Set for the duration of a request that reserved a slot up front
+_reservation: ContextVar[Optional[_Reservation]] = ContextVar("llm_reservation", default=None)
+
+
+@contextmanager
+def llm_slot(endpoint_name: str = "") -> Iterator[None]:
+    """Hold one LLM slot around a call (no-op inside a request that reserved one)."""
+    reservation = _reservation.get()
+    if reservation is not None and reservation.active:
+        yield
+        return
+    try:
+        limiter.acquire()
+    except AICapacityExceeded:
+        AI_THROTTLED.inc(endpoint=endpoint_name, reason="concurrency")
+        raise
+    try:
+        yield
+    finally:
+        limiter.release()
+
+
+async def reserve_request_slot(endpoint_name: str = "") -> Callable[[], None]:
+    """
+    Take one LLM slot for the rest of the request; returns the function that gives it back.
+    Raises AICapacityExceeded.
+    """
+    try:
+        await limiter.acquire_async()
+    except AICapacityExceeded:
+        AI_THROTTLED.inc(endpoint=endpoint_name, reason="concurrency")
+        raise
+    reservation = _Reservation()
+    _reservation.set(reservation)
+
+    def release() -> None:
+        if reservation.active:
+            reservation.active = False
+            limiter.release()
+
+    return release
+
+
+def _concurrency_samples() -> Iterable[metrics.Family]:
+    yield ("ai_llm_calls_in_progress", "gauge", "LLM slots in use", [({}, limiter.in_use)])
+    yield ("ai_llm_calls_queued", "gauge", "Callers waiting for an LLM slot", [({}, limiter.waiting)])
+
+
+metrics.register_collector(_concurrency_samples)
@@ -2,8 +2,9 @@ from __future__ import annotations
 
 from typing import Any, Dict, Optional
 
+from app.ai.model_routing import get_model_route
 from app.ai.openai_client import AIClient
-from app.ai.prompt_loader import load_prompt, render_prompt
+from app.ai.prompt_loader import load_prompt, prompt_version, render_prompt
 from app.ai.rag.chroma_store import ChromaStore
 from app.ai.utils import hash_cache_key
 from app.core.config import settings
@@ -22,7 +23,7 @@ def generate_da_recommendations(
     Assumption: `scripts/index_da_recommendations_collection.py` (or equivalent) has already indexed the DA markdown
     into Chroma Cloud database "Novel" under collection `da_recommendations`.
     """
-    model = getattr(settings, "AI_MODEL", "gpt-4") or "gpt-4"
+    model = get_model_route(endpoint_name).primary
     emb_model = getattr(settings, "AI_EMBEDDING_MODEL", "text-embedding-3-small") or "text-embedding-3-small"
 
     da_collection = getattr(settings, "CHROMA_DA_COLLECTION", "da_recommendations") or "da_recommendations"
@@ -46,7 +47,7 @@ def generate_da_recommendations(
     if cache:
         kb_count = store.count_chunks(where_filter={"source": "disciplined_agile", "kb": "disciplined_agile"}, limit=300).get("count")
         cache_key = hash_cache_key(
-            prompt=prompt_tpl,
+            prompt_version=prompt_version("da_recommendations_prompt.md"),
             inputs={
                 "themes_text": themes_text,
                 "collection": da_collection,
@@ -68,5 +69,5 @@ def generate_da_recommendations(
         cache_key=cache_key,
     )
 
-    return {"content": content, "usage": usage, "cached": cached, "model": model}
+    return {"content": content, "usage": usage, "cached": cached, "model": usage.get("model") or model}
 
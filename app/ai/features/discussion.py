@@ -2,9 +2,11 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Optional, Tuple
 
+from app.ai.features.history_summary import summary_system_message
+from app.ai.model_routing import get_model_route
 from app.ai.openai_client import AIClient
+from app.ai.prompt_builder import fit_history_to_budget, get_prompt_budget, truncate_text
 from app.ai.prompt_loader import load_prompt, render_prompt
-from app.core.config import settings
 
 
 def facilitate_discussion_message(
@@ -15,21 +17,30 @@ def facilitate_discussion_message(
     total_votes: int,
     history_messages: List[Dict[str, str]],
     endpoint_name: str,
+    history_summary: Optional[str] = None,
 ) -> Tuple[str, Dict[str, Any]]:
     """
     history_messages: [{"role":"user"|"assistant","content":"..."}]
+    history_summary: rolling summary of messages older than history_messages, if any
     """
-    model = getattr(settings, "AI_MODEL", "gpt-4") or "gpt-4"
+    model = get_model_route(endpoint_name).primary
     system_tpl = load_prompt("discussion_facilitator_system.md")
     system_prompt = render_prompt(
         system_tpl,
         {"theme_title": theme_title, "theme_description": theme_description, "total_votes": total_votes},
     )
 
+    fixed = [{"role": "system", "content": system_prompt}, *summary_system_message(history_summary)]
+    history = fit_history_to_budget(
+        fixed_messages=fixed,
+        history_messages=history_messages,
+        budget_tokens=get_prompt_budget(endpoint_name),
+    )
+
     content, usage, _cached = ai.chat_complete(
         endpoint_name=endpoint_name,
         model=model,
-        messages=[{"role": "system", "content": system_prompt}, *history_messages],
+        messages=[*fixed, *history],
         temperature=0.7,
         max_tokens=200,
         cache_key=None,
@@ -45,9 +56,13 @@ def answer_general_discussion_question(
     user_message: str,
     endpoint_name: str,
 ) -> Tuple[str, Dict[str, Any]]:
-    model = getattr(settings, "AI_MODEL", "gpt-4") or "gpt-4"
+    model = get_model_route(endpoint_name).primary
     system_tpl = load_prompt("discussion_general_system.md")
-    system_prompt = render_prompt(system_tpl, {"themes_context": themes_context, "da_context": da_context})
+    # DA recommendations can be long markdown; keep the themes intact and cap the DA context.
+    system_prompt = render_prompt(
+        system_tpl,
+        {"themes_context": themes_context, "da_context": truncate_text(da_context, 6000)},
+    )
 
     content, usage, _cached = ai.chat_complete(
         endpoint_name=endpoint_name,
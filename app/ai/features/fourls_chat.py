@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
+from app.ai.features.history_summary import summary_system_message
+from app.ai.model_routing import get_model_route
 from app.ai.openai_client import AIClient
+from app.ai.prompt_builder import fit_history_to_budget, get_prompt_budget
 from app.ai.prompt_loader import load_prompt, render_prompt
-from app.core.config import settings
 
 
 def generate_fourls_reply(
@@ -13,16 +15,26 @@ def generate_fourls_reply(
     current_category: str,
     conversation_messages: List[Dict[str, str]],
     endpoint_name: str,
+    history_summary: Optional[str] = None,
 ) -> Tuple[str, Dict[str, Any]]:
     """
     conversation_messages: list of {"role": "user"|"assistant", "content": "..."} (no system message)
+    history_summary: rolling summary of turns older than conversation_messages, if any
     """
-    model = getattr(settings, "AI_MODEL", "gpt-4") or "gpt-4"
+    model = get_model_route(endpoint_name).primary
     system_tpl = load_prompt("fourls_system.md")
     system_prompt = render_prompt(system_tpl, {"current_category_upper": (current_category or "").upper()})
 
     messages_for_ai: List[Dict[str, str]] = [{"role": "system", "content": system_prompt}]
-    messages_for_ai.extend(conversation_messages)
+    messages_for_ai.extend(summary_system_message(history_summary))
+    # Oldest turns are dropped first once the conversation outgrows the endpoint budget.
+    messages_for_ai.extend(
+        fit_history_to_budget(
+            fixed_messages=messages_for_ai,
+            history_messages=conversation_messages,
+            budget_tokens=get_prompt_budget(endpoint_name),
+        )
+    )
 
     content, usage, _cached = ai.chat_complete(
         endpoint_name=endpoint_name,
@@ -4,10 +4,11 @@ import json
 import re
 from typing import Any, Dict, List, Optional, Tuple
 
+from app.ai.model_routing import get_model_route
 from app.ai.openai_client import AIClient
-from app.ai.prompt_loader import load_prompt, render_prompt
+from app.ai.prompt_builder import compact_json, condense_items, estimate_tokens, get_prompt_budget
+from app.ai.prompt_loader import load_prompt, prompt_version, render_prompt
 from app.ai.utils import hash_cache_key
-from app.core.config import settings
 
 
 _ALLOWED_CATEGORIES = {"liked", "learned", "lacked", "longed_for"}
@@ -114,14 +115,19 @@ def generate_theme_grouping(
     """
     Generate grouping JSON (themes). Returns (themes, usage, cached).
     """
-    model = getattr(settings, "AI_MODEL", "gpt-4") or "gpt-4"
+    model = get_model_route(endpoint_name).primary
     prompt_tpl = load_prompt("grouping_prompt.md")
-    prompt = render_prompt(prompt_tpl, {"responses_json": json.dumps(responses_text, indent=2)})
+    system_prompt = "You are an expert at analyzing team retrospectives and identifying patterns and themes. Always respond with valid JSON only."
+
+    # Long responses are truncated (never dropped) so the payload fits the endpoint budget.
+    payload_budget = get_prompt_budget(endpoint_name) - estimate_tokens(prompt_tpl) - estimate_tokens(system_prompt) - 16
+    condensed = condense_items(responses_text, field="content", budget_tokens=payload_budget, endpoint_name=endpoint_name)
+    prompt = render_prompt(prompt_tpl, {"responses_json": compact_json(condensed)})
 
     cache_key: Optional[str] = None
     if cache:
         cache_key = hash_cache_key(
-            prompt=prompt_tpl,
+            prompt_version=prompt_version("grouping_prompt.md"),
             inputs={"responses_text": responses_text},
             model=model,
         )
@@ -130,7 +136,7 @@ def generate_theme_grouping(
         endpoint_name=endpoint_name,
         model=model,
         messages=[
-            {"role": "system", "content": "You are an expert at analyzing team retrospectives and identifying patterns and themes. Always respond with valid JSON only."},
+            {"role": "system", "content": system_prompt},
             {"role": "user", "content": prompt},
         ],
         temperature=0.3,
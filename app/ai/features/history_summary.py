@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.ai.model_routing import get_model_route
+from app.ai.openai_client import AIClient
+from app.ai.prompt_builder import truncate_text
+from app.ai.prompt_loader import load_prompt, render_prompt
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def summarize_history(
+    *,
+    ai: AIClient,
+    previous_summary: Optional[str],
+    new_messages: List[Dict[str, str]],
+    endpoint_name: str,
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Fold new_messages into previous_summary and return the updated summary.
+    """
+    model = get_model_route(endpoint_name).primary
+    system_tpl = load_prompt("history_summary_system.md")
+    user_tpl = load_prompt("history_summary_user.md")
+    transcript = "\n".join(
+        f"{'Facilitator' if m.get('role') == 'assistant' else 'Participant'}: {truncate_text(m.get('content') or '', 800)}"
+        for m in new_messages
+    )
+    user_prompt = render_prompt(
+        user_tpl,
+        {"previous_summary": previous_summary or "(none)", "new_messages": transcript},
+    )
+
+    content, usage, _cached = ai.chat_complete(
+        endpoint_name=endpoint_name,
+        model=model,
+        messages=[
+            {"role": "system", "content": system_tpl},
+            {"role": "user", "content": user_prompt},
+        ],
+        temperature=0.2,
+        max_tokens=250,
+        cache_key=None,
+    )
+    return content, usage
+
+
+def roll_conversation_window(
+    *,
+    ai: AIClient,
+    previous_summary: Optional[str],
+    history_messages: List[Dict[str, str]],
+    endpoint_name: str,
+    window: Optional[int] = None,
+    batch: Optional[int] = None,
+) -> Tuple[Optional[str], int, List[Dict[str, str]]]:
+    """
+    Keep the last `window` messages verbatim and fold older ones into a rolling summary.
+
+    history_messages are the messages not yet covered by previous_summary (oldest first).
+    Folding only happens once `batch` extra messages have accumulated past the window, so
+    the summarization call runs every few turns rather than on every turn.
+
+    Returns (summary, folded_count, verbatim_messages). The caller persists the summary and
+    advances its watermark past the first folded_count messages. If summarization fails the
+    older messages are simply left out of this prompt and nothing is folded.
+    """
+    window = window if window is not None else int(getattr(settings, "AI_CHAT_WINDOW_MESSAGES", 8) or 8)
+    batch = batch if batch is not None else int(getattr(settings, "AI_CHAT_SUMMARY_BATCH", 6) or 6)
+
+    if len(history_messages) <= window + batch:
+        return previous_summary, 0, history_messages
+
+    to_fold = history_messages[:-window]
+    verbatim = history_messages[-window:]
+    try:
+        summary, _usage = summarize_history(
+            ai=ai,
+            previous_summary=previous_summary,
+            new_messages=to_fold,
+            endpoint_name=endpoint_name,
+        )
+    except Exception as e:
+        logger.warning("ai.history_summary_failed", extra={"endpoint": endpoint_name, "error": str(e)})
+        return previous_summary, 0, verbatim
+
+    if not summary.strip():
+        return previous_summary, 0, verbatim
+    return summary.strip(), len(to_fold), verbatim
+
+
+def summary_system_message(summary: Optional[str]) -> List[Dict[str, str]]:
+    """
+    The rolling summary as a system message to place before the verbatim turns (empty if none).
+    """
+    if not summary:
+        return []
+    return [{"role": "system", "content": f"Summary of the earlier conversation:\n{summary}"}]
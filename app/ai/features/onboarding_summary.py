@@ -2,8 +2,9 @@ from __future__ import annotations
 
 from typing import Any, Dict, Optional
 
+from app.ai.model_routing import get_model_route
 from app.ai.openai_client import AIClient
-from app.ai.prompt_loader import load_prompt, render_prompt
+from app.ai.prompt_loader import load_prompt, prompt_version, render_prompt
 from app.ai.rag.chroma_store import ChromaStore
 from app.ai.utils import hash_cache_key
 from app.core.config import settings
@@ -20,7 +21,7 @@ def generate_onboarding_summary(
     """
     Summarize onboarding/project documents using RAG chunks (instead of full document context).
     """
-    model = "gpt-4o-mini"
+    model = get_model_route(endpoint_name).primary
     emb_model = getattr(settings, "AI_EMBEDDING_MODEL", "text-embedding-3-small") or "text-embedding-3-small"
 
     # NEW WORKFLOW: RAG comes from Chroma Cloud documents already indexed for this workspace.
@@ -51,7 +52,7 @@ def generate_onboarding_summary(
     cache_key: Optional[str] = None
     if cache:
         cache_key = hash_cache_key(
-            prompt=system_tpl + "\n---\n" + user_tpl,
+            prompt_version=prompt_version("onboarding_summary_system.md") + ":" + prompt_version("onboarding_summary_user.md"),
             inputs={
                 "workspace_id": workspace_id,
                 "doc_hash": doc_hash,
@@ -73,5 +74,5 @@ def generate_onboarding_summary(
         cache_key=cache_key,
     )
 
-    return {"summary": content, "usage": usage, "cached": cached, "model": model, "doc_hash": doc_hash, "rag_used": rag_used}
+    return {"summary": content, "usage": usage, "cached": cached, "model": usage.get("model") or model, "doc_hash": doc_hash, "rag_used": rag_used}
 
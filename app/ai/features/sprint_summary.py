@@ -3,10 +3,11 @@ from __future__ import annotations
 import json
 from typing import Any, Dict, Optional
 
+from app.ai.model_routing import get_model_route
 from app.ai.openai_client import AIClient
-from app.ai.prompt_loader import load_prompt, render_prompt
+from app.ai.prompt_builder import compact_json, condense_text_lists, estimate_tokens, get_prompt_budget
+from app.ai.prompt_loader import load_prompt, prompt_version, render_prompt
 from app.ai.utils import hash_cache_key
-from app.core.config import settings
 
 
 def generate_sprint_summary(
@@ -16,20 +17,29 @@ def generate_sprint_summary(
     endpoint_name: str,
     cache: bool = True,
 ) -> Dict[str, Any]:
-    model = getattr(settings, "AI_MODEL", "gpt-4") or "gpt-4"
+    model = get_model_route(endpoint_name).primary
 
     prompt_tpl = load_prompt("sprint_summary_prompt.md")
-    prompt = render_prompt(prompt_tpl, {"data_summary_json": json.dumps(data_summary, indent=2)})
+    system_prompt = "You are an expert agile coach analyzing retrospectives."
+
+    payload_budget = get_prompt_budget(endpoint_name) - estimate_tokens(prompt_tpl) - estimate_tokens(system_prompt) - 16
+    condensed = condense_text_lists(
+        data_summary,
+        keys=["liked", "learned", "lacked", "longed_for"],
+        budget_tokens=payload_budget,
+        endpoint_name=endpoint_name,
+    )
+    prompt = render_prompt(prompt_tpl, {"data_summary_json": compact_json(condensed)})
 
     cache_key: Optional[str] = None
     if cache:
-        cache_key = hash_cache_key(prompt=prompt_tpl, inputs={"data_summary": data_summary}, model=model)
+        cache_key = hash_cache_key(prompt_version=prompt_version("sprint_summary_prompt.md"), inputs={"data_summary": data_summary}, model=model)
 
     content, usage, cached = ai.chat_complete(
         endpoint_name=endpoint_name,
         model=model,
         messages=[
-            {"role": "system", "content": "You are an expert agile coach analyzing retrospectives."},
+            {"role": "system", "content": system_prompt},
             {"role": "user", "content": prompt},
         ],
         temperature=0.5,
@@ -48,5 +58,5 @@ def generate_sprint_summary(
             "recommendations": [],
         }
 
-    return {"summary_data": summary_data, "usage": usage, "cached": cached, "model": model}
+    return {"summary_data": summary_data, "usage": usage, "cached": cached, "model": usage.get("model") or model}
 
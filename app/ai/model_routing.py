@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass, replace
+from typing import Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ModelRoute:
+    """
+    How one endpoint_name talks to OpenAI.
+
+    primary/fallback of None mean "settings.AI_MODEL". fallback is tried once when the primary
+    keeps failing with timeouts / 429 / 5xx or its circuit is open; "" disables fallback.
+    timeout_seconds is the deadline for the whole call: primary, its max_retries retries and the
+    fallback, which only gets the time left.
+    """
+
+    primary: Optional[str] = None
+    fallback: Optional[str] = ""
+    timeout_seconds: float = 30.0
+    max_retries: int = 2
+
+    def resolved(self) -> "ModelRoute":
+        default_model = getattr(settings, "AI_MODEL", "gpt-4") or "gpt-4"
+        primary = self.primary or default_model
+        fallback = default_model if self.fallback is None else self.fallback
+        if fallback == primary:
+            fallback = ""
+        return replace(self, primary=primary, fallback=fallback)
+
+
+_FAST_MODEL = "gpt-4o-mini"
+
+# Short conversational replies go to the fast model (falling back to AI_MODEL);
+# heavy one-shot summaries keep AI_MODEL for quality (falling back to the fast model).
+DEFAULT_ROUTES: Dict[str, ModelRoute] = {
+    "fourls_chat.message": ModelRoute(primary=_FAST_MODEL, fallback=None, timeout_seconds=15, max_retries=1),
+    "fourls_chat.history_summary": ModelRoute(primary=_FAST_MODEL, fallback="", timeout_seconds=20, max_retries=1),
+    "discussion.topic_message": ModelRoute(primary=_FAST_MODEL, fallback=None, timeout_seconds=15, max_retries=1),
+    "discussion.general_chat": ModelRoute(primary=_FAST_MODEL, fallback=None, timeout_seconds=20, max_retries=1),
+    "discussion.history_summary": ModelRoute(primary=_FAST_MODEL, fallback="", timeout_seconds=20, max_retries=1),
+    "grouping.generate": ModelRoute(primary=None, fallback=_FAST_MODEL, timeout_seconds=60, max_retries=1),
+    "discussion.generate_summary": ModelRoute(primary=None, fallback=_FAST_MODEL, timeout_seconds=60, max_retries=1),
+    "discussion.da_recommendations": ModelRoute(primary=None, fallback=_FAST_MODEL, timeout_seconds=60, max_retries=1),
+    "onboarding.generate_summary": ModelRoute(primary=_FAST_MODEL, fallback="", timeout_seconds=45, max_retries=2),
+}
+
+
+def get_model_route(endpoint_name: str) -> ModelRoute:
+    """
+    Resolve the route for an endpoint.
+
+    AI_MODEL_ROUTES_JSON can override any field per endpoint, e.g.
+    {"fourls_chat.message": {"primary": "gpt-4o", "timeout_seconds": 10}}.
+    Unknown endpoints use AI_MODEL with AI_REQUEST_TIMEOUT_SECONDS and no fallback.
+    """
+    route = DEFAULT_ROUTES.get(endpoint_name) or ModelRoute(
+        timeout_seconds=float(getattr(settings, "AI_REQUEST_TIMEOUT_SECONDS", 30) or 30),
+    )
+
+    overrides_json = getattr(settings, "AI_MODEL_ROUTES_JSON", None)
+    if overrides_json:
+        try:
+            overrides = json.loads(overrides_json)
+            entry = overrides.get(endpoint_name) if isinstance(overrides, dict) else None
+            if isinstance(entry, dict):
+                fields = {k: entry[k] for k in ("primary", "fallback", "timeout_seconds", "max_retries") if k in entry}
+                route = replace(route, **fields)
+        except Exception:
+            logger.warning("ai.model_routes_config_invalid", extra={"endpoint": endpoint_name})
+
+    return route.resolved()
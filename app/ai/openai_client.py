@@ -1,12 +1,19 @@
 from __future__ import annotations
 
 import logging
+import time
 from typing import Any, Dict, List, Optional, Tuple
 
 from openai import OpenAI
 
+from app.core import metrics
 from app.core.config import settings
+from app.ai import usage_ledger
 from app.ai.cache import AIResponseCache
+from app.ai.concurrency import llm_slot
+from app.ai.model_routing import get_model_route
+from app.ai.prompt_builder import check_prompt_budget
+from app.ai.resilience import CircuitOpenError, DeadlineExceeded, call_with_resilience, is_retryable
 
 logger = logging.getLogger(__name__)
 
@@ -15,36 +22,75 @@ class AIClient:
     """
     Central OpenAI client wrapper:
     - Token monitoring logs
-    - Guardrails (warn on spikes / unusually large outputs)
+    - Guardrails (warn on spikes / unusually large outputs, refuse prompts over the endpoint budget)
     - Optional response caching via AIResponseCache
+    - Per-endpoint model routing (deadline, retries, fallback model when the primary is unavailable)
+    - Retries with jittered backoff and per-model circuit breakers (app/ai/resilience.py)
+    - Process-wide cap on concurrent LLM calls (app/ai/concurrency.py)
+    - Usage ledger: every call is recorded against the workspace / retrospective / user
+      passed here (app/ai/usage_ledger.py)
     """
 
-    def __init__(self, cache: Optional[AIResponseCache] = None):
+    def __init__(
+        self,
+        cache: Optional[AIResponseCache] = None,
+        *,
+        workspace_id: Optional[int] = None,
+        retrospective_id: Optional[int] = None,
+        user_id: Optional[int] = None,
+    ):
         api_key = settings.OPENAI_API_KEY
         if not api_key:
             raise ValueError("OPENAI_API_KEY is not set")
         self._client = OpenAI(api_key=api_key)
         self._cache = cache or AIResponseCache()
+        self.usage_context = {"workspace_id": workspace_id, "retrospective_id": retrospective_id, "user_id": user_id}
 
     def chat_complete(
         self,
         *,
         endpoint_name: str,
-        model: str,
         messages: List[Dict[str, str]],
         temperature: float,
         max_tokens: int,
+        model: Optional[str] = None,
         response_format: Optional[Dict[str, Any]] = None,
         cache_key: Optional[str] = None,
+        prompt_budget: Optional[int] = None,
     ) -> Tuple[str, Dict[str, Any], bool]:
         """
         Returns: (content, usage_dict, cached)
+
+        model defaults to the endpoint's routed primary model (see app/ai/model_routing.py).
+        Transient errors (429/5xx/timeouts) are retried with jittered backoff within the route's
+        deadline; if the primary still fails, or its circuit is open, the route's fallback model is
+        tried once within what is left of that deadline (skipped below AI_FALLBACK_MIN_SECONDS).
+        usage_dict["model"] is the model that actually produced the content.
+
+        Raises PromptBudgetExceeded (before any network call) when the locally estimated
+        prompt size is over prompt_budget (default: the endpoint's configured budget).
         """
         if cache_key:
+            lookup_started = time.perf_counter()
             cached = self._cache.get(cache_key)
             if cached and isinstance(cached, dict) and "content" in cached:
-                return str(cached["content"]), dict(cached.get("usage") or {}), True
-
+                metrics.AI_CACHE.inc(endpoint=endpoint_name, result="hit")
+                usage = dict(cached.get("usage") or {})
+                usage_ledger.record_usage(
+                    endpoint=endpoint_name,
+                    model=usage.get("model"),
+                    usage=usage,
+                    latency_seconds=time.perf_counter() - lookup_started,
+                    cached=True,
+                    context=self.usage_context,
+                )
+                return str(cached["content"]), usage, True
+            metrics.AI_CACHE.inc(endpoint=endpoint_name, result="miss")
+
+        estimated_prompt_tokens = check_prompt_budget(endpoint_name=endpoint_name, messages=messages, budget=prompt_budget)
+
+        route = get_model_route(endpoint_name)
+        model = model or route.primary
         kwargs: Dict[str, Any] = {
             "model": model,
             "messages": messages,
@@ -54,7 +100,43 @@ class AIClient:
         if response_format:
             kwargs["response_format"] = response_format
 
-        resp = self._client.chat.completions.create(**kwargs)
+        def _create(for_model: str, retries: int, deadline_seconds: float) -> Any:
+            def attempt(timeout_seconds: float) -> Any:
+                client = self._client.with_options(timeout=timeout_seconds, max_retries=0)
+                return client.chat.completions.create(**{**kwargs, "model": for_model})
+
+            with llm_slot(endpoint_name):
+                return call_with_resilience(
+                    attempt,
+                    breaker_name=f"chat:{for_model}",
+                    deadline_seconds=deadline_seconds,
+                    max_retries=retries,
+                    endpoint_name=endpoint_name,
+                )
+
+        started = time.perf_counter()
+        try:
+            resp = _create(model, route.max_retries, route.timeout_seconds)
+        except Exception as e:
+            provider_trouble = is_retryable(e) or isinstance(e, (CircuitOpenError, DeadlineExceeded))
+            # One deadline for the whole call: the fallback only gets what the primary left
+            remaining = route.timeout_seconds - (time.perf_counter() - started)
+            too_late = remaining < settings.AI_FALLBACK_MIN_SECONDS
+            if not provider_trouble or not route.fallback or route.fallback == model or too_late:
+                metrics.AI_ERRORS.inc(endpoint=endpoint_name, error=type(e).__name__)
+                raise
+            logger.warning(
+                "ai.model_fallback",
+                extra={"endpoint": endpoint_name, "model": model, "fallback_model": route.fallback, "error": type(e).__name__},
+            )
+            model = route.fallback
+            try:
+                resp = _create(model, 0, remaining)
+            except Exception as fallback_error:
+                metrics.AI_ERRORS.inc(endpoint=endpoint_name, error=type(fallback_error).__name__)
+                raise
+        elapsed = time.perf_counter() - started
+        metrics.AI_LATENCY.observe(elapsed, endpoint=endpoint_name, model=model)
         content = (resp.choices[0].message.content or "").strip()
 
         usage: Dict[str, Any] = {}
@@ -64,6 +146,15 @@ class AIClient:
                 "completion_tokens": getattr(resp.usage, "completion_tokens", None),
                 "total_tokens": getattr(resp.usage, "total_tokens", None),
             }
+        usage["model"] = model
+        usage["prompt_tokens_estimated"] = estimated_prompt_tokens
+        for kind in ("prompt", "completion"):
+            if usage.get(f"{kind}_tokens"):
+                metrics.AI_TOKENS.inc(usage[f"{kind}_tokens"], endpoint=endpoint_name, model=model, kind=kind)
+        usage_ledger.record_usage(
+            endpoint=endpoint_name, model=model, usage=usage, latency_seconds=elapsed, cached=False,
+            context=self.usage_context,
+        )
 
         # Logging / guardrails
         logger.info(
@@ -72,6 +163,7 @@ class AIClient:
                 "endpoint": endpoint_name,
                 "model": model,
                 "prompt_tokens": usage.get("prompt_tokens"),
+                "prompt_tokens_estimated": estimated_prompt_tokens,
                 "completion_tokens": usage.get("completion_tokens"),
                 "total_tokens": usage.get("total_tokens"),
             },
@@ -97,7 +189,25 @@ class AIClient:
         """
         Create embeddings for a list of texts.
         """
-        resp = self._client.embeddings.create(model=model, input=texts)
+        def attempt(timeout_seconds: float) -> Any:
+            client = self._client.with_options(timeout=timeout_seconds, max_retries=0)
+            return client.embeddings.create(model=model, input=texts)
+
+        started = time.perf_counter()
+        resp = call_with_resilience(
+            attempt,
+            breaker_name=f"embeddings:{model}",
+            deadline_seconds=float(getattr(settings, "AI_EMBEDDING_TIMEOUT_SECONDS", 20) or 20),
+            max_retries=2,
+            endpoint_name="embeddings",
+        )
+        elapsed = time.perf_counter() - started
+        metrics.EMBEDDING_LATENCY.observe(elapsed, model=model)
+        tokens = getattr(getattr(resp, "usage", None), "prompt_tokens", None)
+        usage_ledger.record_usage(
+            endpoint="embeddings", model=model, usage={"prompt_tokens": tokens}, latency_seconds=elapsed, cached=False,
+            context=self.usage_context,
+        )
         # resp.data is ordered to match input
         return [d.embedding for d in resp.data]
 
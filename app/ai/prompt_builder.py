@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# Per-endpoint prompt budgets (estimated prompt tokens, excluding max_tokens for the completion).
+# Sized so that budget + max_tokens stays inside an 8k context window.
+DEFAULT_PROMPT_BUDGETS: Dict[str, int] = {
+    "fourls_chat.message": 2500,
+    "discussion.topic_message": 2500,
+    "discussion.general_chat": 3500,
+    "grouping.generate": 6000,
+    "discussion.generate_summary": 5000,
+    "discussion.da_recommendations": 5500,
+    "onboarding.generate_summary": 4000,
+    "fourls_chat.history_summary": 3000,
+    "discussion.history_summary": 3000,
+}
+
+# Rough per-message overhead of the chat format (role + separators).
+_MESSAGE_OVERHEAD_TOKENS = 4
+# Below this per-item length we stop condensing and give up.
+_MIN_ITEM_CHARS = 80
+
+
+class PromptBudgetExceeded(ValueError):
+    """Raised when a prompt cannot be condensed to fit its endpoint budget."""
+
+    def __init__(self, endpoint_name: str, estimated_tokens: int, budget: int):
+        super().__init__(
+            f"Prompt for {endpoint_name} is ~{estimated_tokens} tokens, over the budget of {budget}"
+        )
+        self.endpoint_name = endpoint_name
+        self.estimated_tokens = estimated_tokens
+        self.budget = budget
+
+
+def compact_json(obj: Any) -> str:
+    """
+    Serialize a prompt payload without indentation or padding whitespace.
+    """
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def _load_encoder():
+    try:
+        import tiktoken  # type: ignore
+    except Exception:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+_ENCODER = _load_encoder()
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of a string locally.
+
+    Uses tiktoken when it is installed; otherwise ~4 characters per token, which is
+    close enough for English prompts to budget against.
+    """
+    if not text:
+        return 0
+    if _ENCODER is not None:
+        try:
+            return len(_ENCODER.encode(text))
+        except Exception:
+            pass
+    return (len(text) + 3) // 4
+
+
+def estimate_messages_tokens(messages: List[Dict[str, str]]) -> int:
+    return sum(estimate_tokens(m.get("content") or "") + _MESSAGE_OVERHEAD_TOKENS for m in messages)
+
+
+def get_prompt_budget(endpoint_name: str) -> int:
+    """
+    Resolve the prompt token budget for an endpoint.
+
+    AI_PROMPT_BUDGETS_JSON (e.g. {"grouping.generate": 7000}) overrides the defaults;
+    unknown endpoints use AI_PROMPT_TOKEN_BUDGET.
+    """
+    overrides_json = getattr(settings, "AI_PROMPT_BUDGETS_JSON", None)
+    if overrides_json:
+        try:
+            overrides = json.loads(overrides_json)
+            if isinstance(overrides, dict) and endpoint_name in overrides:
+                return int(overrides[endpoint_name])
+        except Exception:
+            logger.warning("ai.prompt_budget_config_invalid", extra={"endpoint": endpoint_name})
+    if endpoint_name in DEFAULT_PROMPT_BUDGETS:
+        return DEFAULT_PROMPT_BUDGETS[endpoint_name]
+    return int(getattr(settings, "AI_PROMPT_TOKEN_BUDGET", 6000) or 6000)
+
+
+def truncate_text(text: str, max_chars: int) -> str:
+    """
+    Cut text to at most max_chars, preferring a word boundary, and mark the cut.
+    """
+    s = (text or "").strip()
+    if len(s) <= max_chars:
+        return s
+    cut = s[: max(max_chars - 1, 0)]
+    space = cut.rfind(" ")
+    if space > max_chars // 2:
+        cut = cut[:space]
+    return cut.rstrip() + "…"
+
+
+def condense_items(
+    items: List[Dict[str, Any]],
+    *,
+    field: str,
+    budget_tokens: int,
+    max_item_chars: int = 600,
+    endpoint_name: str = "",
+) -> List[Dict[str, Any]]:
+    """
+    Truncate `field` of every item until the compact JSON of the list fits budget_tokens.
+
+    The per-item cap starts at max_item_chars and halves each pass; items are never dropped,
+    so ids referenced by the model stay valid. Raises PromptBudgetExceeded when even the
+    minimum cap does not fit.
+    """
+    cap = max_item_chars
+    while True:
+        out = [
+            {**it, field: truncate_text(str(it.get(field) or ""), cap)} if isinstance(it, dict) else it
+            for it in items
+        ]
+        estimated = estimate_tokens(compact_json(out))
+        if estimated <= budget_tokens:
+            return out
+        if cap <= _MIN_ITEM_CHARS:
+            raise PromptBudgetExceeded(endpoint_name, estimated, budget_tokens)
+        cap = max(cap // 2, _MIN_ITEM_CHARS)
+
+
+def condense_text_lists(
+    data: Dict[str, Any],
+    *,
+    keys: List[str],
+    budget_tokens: int,
+    max_item_chars: int = 400,
+    endpoint_name: str = "",
+) -> Dict[str, Any]:
+    """
+    Like condense_items, for a dict whose `keys` hold lists of strings.
+    """
+    cap = max_item_chars
+    while True:
+        out = dict(data)
+        for k in keys:
+            values = data.get(k)
+            if isinstance(values, list):
+                out[k] = [truncate_text(str(v or ""), cap) for v in values]
+        estimated = estimate_tokens(compact_json(out))
+        if estimated <= budget_tokens:
+            return out
+        if cap <= _MIN_ITEM_CHARS:
+            raise PromptBudgetExceeded(endpoint_name, estimated, budget_tokens)
+        cap = max(cap // 2, _MIN_ITEM_CHARS)
+
+
+def fit_history_to_budget(
+    *,
+    fixed_messages: List[Dict[str, str]],
+    history_messages: List[Dict[str, str]],
+    budget_tokens: int,
+    min_keep: int = 1,
+) -> List[Dict[str, str]]:
+    """
+    Drop the oldest history messages until fixed + history fits budget_tokens.
+
+    The newest `min_keep` messages are always kept (the current user turn must reach the model).
+    Returns the trimmed history.
+    """
+    remaining = budget_tokens - estimate_messages_tokens(fixed_messages)
+    kept: List[Dict[str, str]] = []
+    for msg in reversed(history_messages):
+        cost = estimate_tokens(msg.get("content") or "") + _MESSAGE_OVERHEAD_TOKENS
+        if len(kept) >= min_keep and cost > remaining:
+            break
+        kept.append(msg)
+        remaining -= cost
+    kept.reverse()
+    # A conversation that starts with an assistant turn is fine for the API, but a leading
+    # orphaned assistant message after trimming wastes tokens; drop it when we trimmed anything.
+    if len(kept) < len(history_messages) and len(kept) > min_keep and kept[0].get("role") == "assistant":
+        kept = kept[1:]
+    return kept
+
+
+def check_prompt_budget(
+    *,
+    endpoint_name: str,
+    messages: List[Dict[str, str]],
+    budget: Optional[int] = None,
+) -> int:
+    """
+    Estimate the prompt tokens of `messages`; raise PromptBudgetExceeded if over budget.
+    Returns the estimate.
+    """
+    limit = budget if budget is not None else get_prompt_budget(endpoint_name)
+    estimated = estimate_messages_tokens(messages)
+    if estimated > limit:
+        raise PromptBudgetExceeded(endpoint_name, estimated, limit)
+    return estimated
@@ -1,24 +1,99 @@
 from __future__ import annotations
 
+import hashlib
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
 
 
 PROMPTS_DIR = Path(__file__).resolve().parent / "prompts"
 
+# Variables each feature passes when rendering a template. Validated at startup so a typo'd or
+# missing placeholder fails the deploy instead of a request.
+PROMPT_VARIABLES: Dict[str, Set[str]] = {
+    "da_recommendations_prompt.md": {"themes_text", "rag_context"},
+    "discussion_facilitator_system.md": {"theme_title", "theme_description", "total_votes"},
+    "discussion_general_system.md": {"themes_context", "da_context"},
+    "fourls_system.md": {"current_category_upper"},
+    "grouping_prompt.md": {"responses_json"},
+    "history_summary_system.md": set(),
+    "history_summary_user.md": {"previous_summary", "new_messages"},
+    "onboarding_summary_system.md": set(),
+    "onboarding_summary_user.md": {"rag_context"},
+    "sprint_summary_prompt.md": {"data_summary_json"},
+}
+
+# Only {identifier} is a placeholder; any other brace (e.g. JSON examples in a prompt) is literal.
+# {{ and }} are accepted as escaped braces for templates written for str.format.
+_TOKEN_RE = re.compile(r"\{\{|\}\}|\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
 
 class PromptNotFoundError(FileNotFoundError):
     pass
 
 
-def load_prompt(prompt_name: str) -> str:
-    """
-    Load a prompt template from app/ai/prompts/.
+class PromptTemplateError(ValueError):
+    pass
 
-    prompt_name can be either:
-    - "fourls_system.md"
-    - "fourls_system" (we'll try common extensions)
-    """
+
+@dataclass(frozen=True)
+class CompiledPrompt:
+    name: str
+    text: str
+    version: str
+    # Alternating literal / placeholder parts: (literal, None) or ("", variable_name)
+    parts: Tuple[Tuple[str, Optional[str]], ...]
+    placeholders: frozenset
+    mtime: float = 0.0
+
+    def render(self, variables: Dict[str, Any]) -> str:
+        out: List[str] = []
+        for literal, var in self.parts:
+            if var is None:
+                out.append(literal)
+            else:
+                # KeyError on a missing variable, like str.format
+                out.append(str(variables[var]))
+        return "".join(out)
+
+
+@lru_cache(maxsize=128)
+def _compile_parts(text: str) -> Tuple[Tuple[Tuple[str, Optional[str]], ...], frozenset]:
+    parts: List[Tuple[str, Optional[str]]] = []
+    names: Set[str] = set()
+    pos = 0
+    for m in _TOKEN_RE.finditer(text):
+        if m.start() > pos:
+            parts.append((text[pos:m.start()], None))
+        tok = m.group(0)
+        if tok == "{{":
+            parts.append(("{", None))
+        elif tok == "}}":
+            parts.append(("}", None))
+        else:
+            parts.append(("", m.group(1)))
+            names.add(m.group(1))
+        pos = m.end()
+    if pos < len(text):
+        parts.append((text[pos:], None))
+    return tuple(parts), frozenset(names)
+
+
+def compile_prompt(name: str, text: str, mtime: float = 0.0) -> CompiledPrompt:
+    parts, names = _compile_parts(text)
+    version = hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+    return CompiledPrompt(name=name, text=text, version=version, parts=parts, placeholders=names, mtime=mtime)
+
+
+def _resolve_path(prompt_name: str) -> Path:
     candidates = []
     p = PROMPTS_DIR / prompt_name
     if p.suffix:
@@ -31,14 +106,119 @@ def load_prompt(prompt_name: str) -> str:
 
     for c in candidates:
         if c.exists():
-            return c.read_text(encoding="utf-8")
+            return c
 
     raise PromptNotFoundError(f"Prompt not found: {prompt_name} (looked in {PROMPTS_DIR})")
 
 
-def render_prompt(template: str, variables: Dict[str, Any]) -> str:
+class PromptRegistry:
+    """
+    In-process cache of compiled prompt templates from app/ai/prompts/.
+
+    - Templates are read and compiled once (load_all() at startup, or lazily on first use).
+    - With hot_reload (DEBUG), a template whose file mtime changed is recompiled on next use.
+    - version(name) is a short content hash, for cache keys that must change when a prompt is edited.
+    """
+
+    def __init__(self, *, hot_reload: Optional[bool] = None):
+        self._prompts: Dict[str, CompiledPrompt] = {}
+        self._lock = threading.Lock()
+        self._hot_reload = bool(getattr(settings, "DEBUG", False)) if hot_reload is None else hot_reload
+
+    def _load(self, path: Path) -> CompiledPrompt:
+        # utf-8-sig: some templates were saved with a BOM
+        text = path.read_text(encoding="utf-8-sig")
+        return compile_prompt(path.name, text, mtime=path.stat().st_mtime)
+
+    def get(self, prompt_name: str) -> CompiledPrompt:
+        cached = self._prompts.get(prompt_name)
+        if cached is not None and not self._hot_reload:
+            return cached
+
+        path = _resolve_path(prompt_name)
+        if cached is not None:
+            try:
+                if path.stat().st_mtime == cached.mtime:
+                    return cached
+            except OSError:
+                return cached
+            logger.info("ai.prompt_reloaded", extra={"prompt": path.name})
+
+        compiled = self._load(path)
+        with self._lock:
+            self._prompts[prompt_name] = compiled
+        return compiled
+
+    def version(self, prompt_name: str) -> str:
+        return self.get(prompt_name).version
+
+    def load_all(self) -> Dict[str, CompiledPrompt]:
+        """
+        Load and compile every template in PROMPTS_DIR.
+        """
+        loaded: Dict[str, CompiledPrompt] = {}
+        for path in sorted(PROMPTS_DIR.iterdir()):
+            if path.suffix not in (".md", ".txt") or not path.is_file():
+                continue
+            compiled = self._load(path)
+            loaded[path.name] = compiled
+        with self._lock:
+            self._prompts.update(loaded)
+        return loaded
+
+    def validate(self, expected: Optional[Dict[str, Set[str]]] = None) -> None:
+        """
+        Check every registered prompt's placeholders against the variables its feature passes.
+
+        Raises PromptTemplateError listing all problems (unknown placeholders would KeyError at
+        render time; unused variables usually mean a placeholder was deleted by mistake).
+        """
+        expected = PROMPT_VARIABLES if expected is None else expected
+        problems: List[str] = []
+        for name, variables in expected.items():
+            try:
+                compiled = self.get(name)
+            except PromptNotFoundError as e:
+                problems.append(str(e))
+                continue
+            missing = set(compiled.placeholders) - set(variables)
+            unused = set(variables) - set(compiled.placeholders)
+            if missing:
+                problems.append(f"{name}: placeholders not provided by feature: {sorted(missing)}")
+            if unused:
+                problems.append(f"{name}: feature variables with no placeholder: {sorted(unused)}")
+        if problems:
+            raise PromptTemplateError("Invalid prompt templates:\n" + "\n".join(problems))
+
+
+prompt_registry = PromptRegistry()
+
+
+def load_prompt(prompt_name: str) -> str:
     """
-    Render a prompt template using Python format() with a variables dict.
+    Load a prompt template from app/ai/prompts/ (cached; see PromptRegistry).
+
+    prompt_name can be either:
+    - "fourls_system.md"
+    - "fourls_system" (we'll try common extensions)
+    """
+    return prompt_registry.get(prompt_name).text
+
+
+def prompt_version(prompt_name: str) -> str:
+    """
+    Short content hash of a prompt template, for use in hash_cache_key.
+    """
+    return prompt_registry.version(prompt_name)
+
+
+def render_prompt(template: Union[str, CompiledPrompt], variables: Dict[str, Any]) -> str:
     """
-    return template.format(**variables)
+    Render a prompt template with a variables dict.
 
+    Only {identifier} placeholders are substituted; other braces are kept literally.
+    """
+    if isinstance(template, CompiledPrompt):
+        return template.render(variables)
+    parts, names = _compile_parts(template)
+    return CompiledPrompt(name="", text=template, version="", parts=parts, placeholders=names).render(variables)
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import logging
+import time
 from typing import Any, Dict, List, Optional, Tuple
 
+from app.core import metrics
 from app.core.config import settings
 from app.ai.openai_client import AIClient
 from app.ai.rag.chunking import chunk_text
@@ -228,7 +230,9 @@ class ChromaStore:
 
         # Upsert
         try:
+            started = time.perf_counter()
             self._collection.upsert(ids=ids, embeddings=embeddings, documents=documents, metadatas=metadatas)
+            metrics.CHROMA_LATENCY.observe(time.perf_counter() - started, operation="upsert")
             logger.info("rag.upsert", extra={"source": source, "doc_id": doc_id, "chunks": len(chunks)})
         except Exception as e:
             # Surface useful debugging info for Chroma Cloud validation errors (422).
@@ -272,12 +276,14 @@ class ChromaStore:
         where = self._build_where(flat)
 
         q_emb = ai.embed_texts(model=embedding_model, texts=[query_text])[0]
+        started = time.perf_counter()
         res = self._collection.query(
             query_embeddings=[q_emb],
             n_results=top_k,
             where=where,
             include=["documents", "metadatas", "distances"],
         )
+        metrics.CHROMA_LATENCY.observe(time.perf_counter() - started, operation="query")
 
         docs = (res.get("documents") or [[]])[0]
         mds = (res.get("metadatas") or [[]])[0]
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from collections import Counter, deque
+from typing import Any, Callable, Deque, Dict, Optional, TypeVar
+
+from openai import APIConnectionError, APIStatusError, APITimeoutError, RateLimitError
+
+from app.core import metrics
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# (breaker name, new state) -> number of transitions since process start
+TRANSITION_COUNTS: Counter = Counter()
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling OpenAI while a breaker is open; routes treat it like any AI failure."""
+
+    def __init__(self, name: str, retry_in_seconds: float):
+        super().__init__(f"Circuit '{name}' is open; retry in {retry_in_seconds:.0f}s")
+        self.name = name
+        self.retry_in_seconds = retry_in_seconds
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    429, 5xx, timeouts and connection errors are transient; other 4xx are caller errors.
+    """
+    if isinstance(error, (RateLimitError, APITimeoutError, APIConnectionError)):
+        return True
+    if isinstance(error, APIStatusError):
+        return error.status_code >= 500
+    return False
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker over a rolling window of recent calls.
+
+    - closed: calls pass; opens when at least min_calls of the last window_size calls
+      were recorded and the failure rate reaches failure_threshold.
+    - open: calls fail fast with CircuitOpenError for open_seconds.
+    - half_open: one probe call at a time; success closes, failure re-opens.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        window_size: int = 20,
+        min_calls: int = 5,
+        failure_threshold: float = 0.5,
+        open_seconds: float = 30.0,
+    ):
+        self.name = name
+        self.window_size = window_size
+        self.min_calls = min_calls
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self._outcomes: Deque[bool] = deque(maxlen=window_size)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def _transition(self, new_state: str) -> None:
+        old_state = self._state
+        if old_state == new_state:
+            return
+        self._state = new_state
+        TRANSITION_COUNTS[(self.name, new_state)] += 1
+        logger.warning("ai.circuit_transition", extra={"circuit": self.name, "from_state": old_state, "to_state": new_state})
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self._state == OPEN:
+                elapsed = time.monotonic() - self._opened_at
+                if elapsed < self.open_seconds:
+                    raise CircuitOpenError(self.name, self.open_seconds - elapsed)
+                self._transition(HALF_OPEN)
+            if self._state == HALF_OPEN:
+                if self._probe_in_flight:
+                    raise CircuitOpenError(self.name, 0)
+                self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._probe_in_flight = False
+            if self._state == HALF_OPEN:
+                self._outcomes.clear()
+                self._transition(CLOSED)
+            self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._probe_in_flight = False
+            if self._state == HALF_OPEN:
+                self._opened_at = time.monotonic()
+                self._transition(OPEN)
+                return
+            self._outcomes.append(False)
+            failures = self._outcomes.count(False)
+            if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._transition(OPEN)
+
+    def release(self) -> None:
+        """End a call that says nothing about provider health (e.g. a 400)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    breaker = _breakers.get(name)
+    if breaker is not None:
+        return breaker
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                name,
+                window_size=int(getattr(settings, "AI_CIRCUIT_WINDOW", 20) or 20),
+                min_calls=int(getattr(settings, "AI_CIRCUIT_MIN_CALLS", 5) or 5),
+                failure_threshold=float(getattr(settings, "AI_CIRCUIT_FAILURE_RATE", 0.5) or 0.5),
+                open_seconds=float(getattr(settings, "AI_CIRCUIT_OPEN_SECONDS", 30) or 30),
+            )
+            _breakers[name] = breaker
+        return breaker
+
+
+def backoff_delay(attempt: int, *, base: float = 0.5, cap: float = 8.0) -> float:
+    """Full-jitter exponential backoff: uniform(0, min(cap, base * 2**attempt))."""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def call_with_resilience(
+    fn: Callable[[float], T],
+    *,
+    breaker_name: str,
+    deadline_seconds: float,
+    max_retries: int,
+    endpoint_name: str = "",
+) -> T:
+    """
+    Run fn(timeout_seconds) under a circuit breaker, retrying transient errors with jittered backoff.
+
+    Every attempt gets the time left until the deadline as its timeout, and no retry is started
+    that could not finish before it. Raises CircuitOpenError, DeadlineExceeded, or the last error.
+    """
+    breaker = get_breaker(breaker_name)
+    deadline = time.monotonic() + deadline_seconds
+    attempt = 0
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"{endpoint_name or breaker_name}: deadline of {deadline_seconds}s exceeded")
+
+        breaker.before_call()
+        try:
+            result = fn(remaining)
+        except Exception as e:
+            if not is_retryable(e):
+                breaker.release()
+                raise
+            breaker.record_failure()
+            if attempt >= max_retries:
+                raise
+            delay = backoff_delay(attempt)
+            retry_after = _retry_after_seconds(e)
+            if retry_after is not None:
+                delay = max(delay, min(retry_after, 8.0))
+            if time.monotonic() + delay >= deadline:
+                raise
+            logger.info(
+                "ai.retry",
+                extra={"endpoint": endpoint_name, "circuit": breaker_name, "attempt": attempt + 1, "delay_seconds": round(delay, 2), "error": type(e).__name__},
+            )
+            time.sleep(delay)
+            attempt += 1
+            continue
+        breaker.record_success()
+        return result
+
+
+def circuit_states() -> Dict[str, Any]:
+    """Snapshot of breaker states and transition counts (for health/metrics endpoints)."""
+    return {
+        "circuits": {name: b.state for name, b in _breakers.items()},
+        "transitions": {f"{name}:{state}": n for (name, state), n in TRANSITION_COUNTS.items()},
+    }
+
+
+def _circuit_samples():
+    states = {name: b.state for name, b in list(_breakers.items())}
+    yield (
+        "ai_circuit_state", "gauge", "Circuit breaker state (0 closed, 1 half open, 2 open)",
+        [({"circuit": name}, {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}.get(state, 0)) for name, state in states.items()],
+    )
+    yield (
+        "ai_circuit_transitions_total", "counter", "Circuit breaker state transitions",
+        [({"circuit": name, "state": state}, n) for (name, state), n in list(TRANSITION_COUNTS.items())],
+    )
+
+
+metrics.register_collector(_circuit_samples)
@@ -0,0 +1,358 @@
+"""
+AI usage ledger: every chat completion / embeddings call, attributed and costed.
+
+AIClient records each call (endpoint, model, workspace/retrospective/user it was made for,
+prompt/completion tokens, latency, served from cache or not). Rows are buffered in memory
+and appended to ai_usage_events in batches by a background thread, so the request path
+never waits on the ledger; the buffer is bounded (AI_USAGE_MAX_PENDING) and rows beyond it
+are dropped and counted rather than growing memory when the DB is down.
+
+Serverless instances (Vercel, Lambda) can be frozen or recycled right after a response, so
+there UsageLedgerFlushMiddleware also flushes once the response has been sent (and so can
+any deployment with AI_USAGE_FLUSH_PER_REQUEST). Rows are still written AI_USAGE_BATCH_SIZE
+at a time.
+
+usage_report() rolls the ledger up with grouped SQL per workspace, endpoint and model:
+cost from AI_MODEL_PRICES (USD per million tokens; AI_MODEL_PRICES_JSON overrides), and
+cache savings = what the cached answers would have cost. Served at GET /api/v1/admin/ai-usage.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from collections import deque
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, case, func, insert
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core import metrics
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# USD per 1M tokens: (prompt, completion). Matched on the longest model-name prefix,
+# so dated snapshots ("gpt-4o-mini-2024-07-18") use their family's price.
+AI_MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4-turbo": (10.00, 30.00),
+    "gpt-4": (30.00, 60.00),
+    "gpt-3.5-turbo": (0.50, 1.50),
+    "text-embedding-3-small": (0.02, 0.0),
+    "text-embedding-3-large": (0.13, 0.0),
+}
+
+
+def model_prices() -> Dict[str, Tuple[float, float]]:
+    prices = dict(AI_MODEL_PRICES)
+    overrides_json = getattr(settings, "AI_MODEL_PRICES_JSON", None)
+    if overrides_json:
+        try:
+            for model, value in json.loads(overrides_json).items():
+                prices[model] = (float(value[0]), float(value[1]))
+        except Exception as e:
+            logger.warning(f"⚠️ Ignoring invalid AI_MODEL_PRICES_JSON: {e}")
+    return prices
+
+
+def price_for(model: Optional[str], prices: Dict[str, Tuple[float, float]]) -> Optional[Tuple[float, float]]:
+    if not model:
+        return None
+    matches = [name for name in prices if model == name or model.startswith(name + "-")]
+    return prices[max(matches, key=len)] if matches else None
+
+
+class UsageLedger:
+    """Bounded in-memory buffer of usage rows, flushed to ai_usage_events in batches."""
+
+    def __init__(
+        self,
+        session_factory=None,
+        batch_size: Optional[int] = None,
+        flush_seconds: Optional[float] = None,
+        max_pending: Optional[int] = None,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.AI_USAGE_BATCH_SIZE
+        self.flush_seconds = flush_seconds or settings.AI_USAGE_FLUSH_SECONDS
+        self.max_pending = max_pending or settings.AI_USAGE_MAX_PENDING
+        self._pending: Deque[Dict[str, Any]] = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # one writer at a time
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.dropped = 0
+        self.written = 0
+
+    def record(self, row: Dict[str, Any]) -> None:
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                return
+            self._pending.append(row)
+            full = len(self._pending) >= self.batch_size
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="ai-usage-ledger", daemon=True)
+                self._thread.start()
+        if full:
+            self._wake.set()
+
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:  # keep the writer alive whatever happens
+                logger.error(f"❌ AI usage ledger flush failed: {e}")
+
+    def flush(self) -> int:
+        """Write everything buffered so far; returns the number of rows written."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = [self._pending.popleft() for _ in range(min(self.batch_size, len(self._pending)))]
+                if not batch:
+                    return written
+                try:
+                    self._write(batch)
+                except Exception as e:
+                    # Put the batch back (oldest first) if there is room, then retry next round
+                    with self._lock:
+                        room = self.max_pending - len(self._pending)
+                        self.dropped += max(0, len(batch) - room)
+                        self._pending.extendleft(reversed(batch[:max(0, room)]))
+                    logger.warning(f"⚠️ AI usage ledger: could not write {len(batch)} rows: {e}")
+                    return written
+                written += len(batch)
+                self.written += len(batch)
+
+    def _write(self, rows: List[Dict[str, Any]]) -> None:
+        from app.models.ai_usage import AIUsageEvent
+
+        if self.session_factory is None:
+            from app.database.database import SessionLocal
+            self.session_factory = SessionLocal
+        db = self.session_factory()
+        try:
+            db.execute(insert(AIUsageEvent), rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+ledger = UsageLedger()
+
+
+def record_usage(
+    *,
+    endpoint: str,
+    model: Optional[str],
+    usage: Optional[Dict[str, Any]],
+    latency_seconds: Optional[float],
+    cached: bool,
+    context: Optional[Dict[str, Optional[int]]] = None,
+) -> None:
+    """Queue one ledger row; never raises (monitoring must not fail a request)."""
+    if not settings.AI_USAGE_LEDGER_ENABLED:
+        return
+    try:
+        usage = usage or {}
+        context = context or {}
+        ledger.record({
+            "created_at": datetime.now(timezone.utc),
+            "endpoint": endpoint[:100],
+            "model": (model or usage.get("model") or None),
+            "workspace_id": context.get("workspace_id"),
+            "retrospective_id": context.get("retrospective_id"),
+            "user_id": context.get("user_id"),
+            "prompt_tokens": int(usage.get("prompt_tokens") or 0),
+            "completion_tokens": int(usage.get("completion_tokens") or 0),
+            "latency_ms": round(latency_seconds * 1000, 2) if latency_seconds is not None else None,
+            "cached": cached,
+        })
+    except Exception as e:
+        logger.warning(f"⚠️ AI usage ledger: could not record {endpoint}: {e}")
+
+
+def flush_per_request() -> bool:
+    from app.database.database import IS_SERVERLESS
+
+    return settings.AI_USAGE_FLUSH_PER_REQUEST or IS_SERVERLESS
+
+
+class UsageLedgerFlushMiddleware:
+    """ASGI middleware writing the buffered usage rows after each response (see module docstring)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if scope["type"] == "http" and ledger.pending():
+                try:
+                    await run_in_threadpool(ledger.flush)
+                except Exception as e:
+                    logger.warning(f"⚠️ AI usage ledger: flush after request failed: {e}")
+
+
+def _ledger_samples() -> Iterable[metrics.Family]:
+    yield ("ai_usage_ledger_pending", "gauge", "Usage rows waiting to be written", [({}, ledger.pending())])
+    yield ("ai_usage_ledger_dropped_total", "counter", "Usage rows dropped (buffer full)", [({}, ledger.dropped)])
+
+
+metrics.register_collector(_ledger_samples)
+
+
+# ---------------------------------------------------------------------------
+# Rollups
+# ---------------------------------------------------------------------------
+
+def _empty_totals() -> Dict[str, Any]:
+    return {
+        "calls": 0,
+        "cached_calls": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "cached_prompt_tokens": 0,
+        "cached_completion_tokens": 0,
+        "cost_usd": 0.0,
+        "cache_savings_usd": 0.0,
+        "latency_ms_total": 0.0,
+    }
+
+
+def _finish(totals: Dict[str, Any]) -> Dict[str, Any]:
+    uncached = totals["calls"] - totals["cached_calls"]
+    latency_total = totals.pop("latency_ms_total")
+    totals["cost_usd"] = round(totals["cost_usd"], 4)
+    totals["cache_savings_usd"] = round(totals["cache_savings_usd"], 4)
+    totals["cache_hit_rate"] = round(totals["cached_calls"] / totals["calls"], 4) if totals["calls"] else 0.0
+    totals["mean_latency_ms"] = round(latency_total / uncached, 1) if uncached else None
+    return totals
+
+
+def usage_report(
+    db: Session,
+    since: datetime,
+    until: Optional[datetime] = None,
+    workspace_id: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Per-workspace / per-endpoint / per-model usage, cost and cache savings for [since, until).
+
+    Events recorded with only a retrospective are attributed to its workspace.
+    """
+    from app.models.ai_usage import AIUsageEvent as E
+    from app.models.retrospective_new import Retrospective
+    from app.models.workspace import Workspace
+
+    workspace_expr = func.coalesce(E.workspace_id, Retrospective.workspace_id)
+    filters = [E.created_at >= since]
+    if until is not None:
+        filters.append(E.created_at < until)
+    if workspace_id is not None:
+        filters.append(workspace_expr == workspace_id)
+
+    def base(*columns):
+        return db.query(*columns).select_from(E).outerjoin(
+            Retrospective, and_(E.workspace_id.is_(None), Retrospective.id == E.retrospective_id)
+        ).filter(*filters)
+
+    rows = base(
+        workspace_expr.label("workspace_id"),
+        E.endpoint,
+        E.model,
+        E.cached,
+        func.count(E.id),
+        func.coalesce(func.sum(E.prompt_tokens), 0),
+        func.coalesce(func.sum(E.completion_tokens), 0),
+        func.coalesce(func.sum(E.latency_ms), 0.0),
+    ).group_by(workspace_expr, E.endpoint, E.model, E.cached).all()
+
+    day = func.date(E.created_at)
+    daily_rows = base(
+        day.label("day"),
+        func.count(E.id),
+        func.sum(case((E.cached.is_(True), 1), else_=0)),
+        func.coalesce(func.sum(E.prompt_tokens + E.completion_tokens), 0),
+    ).group_by(day).order_by(day).all()
+
+    prices = model_prices()
+    unpriced = set()
+    totals = _empty_totals()
+    workspaces: Dict[Optional[int], Dict[str, Any]] = {}
+    endpoints: Dict[Tuple[str, Optional[str]], Dict[str, Any]] = {}
+
+    for ws_id, endpoint, model, cached, calls, prompt_tokens, completion_tokens, latency_ms in rows:
+        price = price_for(model, prices)
+        if price is None:
+            unpriced.add(model)
+            price = (0.0, 0.0)
+        cost = (prompt_tokens * price[0] + completion_tokens * price[1]) / 1_000_000
+
+        ws = workspaces.setdefault(ws_id, {"workspace_id": ws_id, **_empty_totals(), "endpoints": {}})
+        ep = endpoints.setdefault((endpoint, model), {"endpoint": endpoint, "model": model, **_empty_totals()})
+        ws_ep = ws["endpoints"].setdefault(endpoint, {"endpoint": endpoint, **_empty_totals()})
+        for bucket in (totals, ws, ep, ws_ep):
+            bucket["calls"] += calls
+            if cached:
+                bucket["cached_calls"] += calls
+                bucket["cached_prompt_tokens"] += prompt_tokens
+                bucket["cached_completion_tokens"] += completion_tokens
+                bucket["cache_savings_usd"] += cost
+            else:
+                bucket["prompt_tokens"] += prompt_tokens
+                bucket["completion_tokens"] += completion_tokens
+                bucket["cost_usd"] += cost
+                bucket["latency_ms_total"] += latency_ms or 0.0
+
+    names = dict(
+        db.query(Workspace.id, Workspace.name).filter(Workspace.id.in_([w for w in workspaces if w is not None])).all()
+    ) if workspaces else {}
+    workspace_list = []
+    for ws_id, ws in workspaces.items():
+        ws["workspace_name"] = names.get(ws_id)
+        ws["endpoints"] = sorted(
+            (_finish(e) for e in ws["endpoints"].values()), key=lambda e: e["cost_usd"], reverse=True
+        )
+        workspace_list.append(_finish(ws))
+
+    return {
+        "since": since.isoformat(),
+        "until": until.isoformat() if until else None,
+        "workspace_id": workspace_id,
+        "totals": _finish(totals),
+        "workspaces": sorted(workspace_list, key=lambda w: w["cost_usd"], reverse=True),
+        "endpoints": sorted((_finish(e) for e in endpoints.values()), key=lambda e: e["cost_usd"], reverse=True),
+        "daily": [
+            {
+                "day": d.isoformat() if isinstance(d, date) else str(d),
+                "calls": calls,
+                "cached_calls": int(cached_calls or 0),
+                "tokens": int(tokens or 0),
+            }
+            for d, calls, cached_calls, tokens in daily_rows
+        ],
+        "unpriced_models": sorted(m for m in unpriced if m),
+        "pending_writes": ledger.pending(),
+    }
+
+
+def report_for_last_days(db: Session, days: int, workspace_id: Optional[int] = None) -> Dict[str, Any]:
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    return usage_report(db, since=since, workspace_id=workspace_id)
@@ -9,8 +9,25 @@ def stable_json_dumps(obj: Any) -> str:
     return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
 
 
-def hash_cache_key(*, prompt: str, inputs: Dict[str, Any], model: str, extra: Optional[Dict[str, Any]] = None) -> str:
-    payload: Dict[str, Any] = {"prompt": prompt, "inputs": inputs, "model": model}
+def hash_cache_key(
+    *,
+    inputs: Dict[str, Any],
+    model: str,
+    prompt: Optional[str] = None,
+    prompt_version: Optional[str] = None,
+    extra: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Stable cache key for an AI call.
+
+    Pass prompt_version (see app.ai.prompt_loader.prompt_version) rather than the full prompt text;
+    either way, editing a template changes the key so stale cached responses are not reused.
+    """
+    payload: Dict[str, Any] = {"inputs": inputs, "model": model}
+    if prompt_version is not None:
+        payload["prompt_version"] = prompt_version
+    if prompt is not None:
+        payload["prompt"] = prompt
     if extra:
         payload["extra"] = extra
     raw = stable_json_dumps(payload).encode("utf-8")
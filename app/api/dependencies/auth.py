@@ -2,6 +2,7 @@
 Authentication dependency for FastAPI routes
 """
 
+import secrets
 from typing import Optional
 
 from fastapi import Depends, HTTPException, status
@@ -12,6 +13,7 @@ from sqlalchemy.orm import Session
 from app.core.config import settings
 from app.database.database import get_db
 from app.models.user import User
+from app.services.auth_cache import cached_user, remember_user
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/user-auth/login")
@@ -36,11 +38,17 @@ def get_current_user(
         if user_id is None:
             raise credentials_exception
         
-        # Get user from database
-        user = db.query(User).filter(User.id == int(user_id)).first()
+        # Tokens issued before "iat" was added are told apart by their expiry
+        token_key = payload.get("iat", payload.get("exp"))
         
+        # Get user from the short-lived cache, else from the database
+        user = cached_user(db, int(user_id), token_key)
         if user is None:
-            raise credentials_exception
+            user = db.query(User).filter(User.id == int(user_id)).first()
+            if user is None:
+                raise credentials_exception
+            if user.is_active:
+                remember_user(user, token_key)
         
         if not user.is_active:
             raise HTTPException(
@@ -59,3 +67,20 @@ def get_current_user(
         raise credentials_exception
 
 
+def require_bearer_secret(
+    authorization: Optional[str],
+    expected: Optional[str],
+    name: str,
+    required: bool = True
+) -> None:
+    """
+    Check "Authorization: Bearer <secret>" for operator endpoints (cron, admin, metrics).
+    401 on a wrong secret; with no secret configured, 503 if required, else allow.
+    """
+    if not expected:
+        if required:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=f"{name} is not configured")
+        return
+    provided = (authorization or "").removeprefix("Bearer ").strip()
+    if not secrets.compare_digest(provided.encode(), expected.encode()):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=f"Invalid {name}")
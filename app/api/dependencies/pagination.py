@@ -0,0 +1,73 @@
+"""
+Keyset (cursor) pagination and field selection helpers for list endpoints
+
+List endpoints keep returning a plain JSON array so existing clients work unchanged. When
+more rows exist, the response carries an opaque cursor in the X-Next-Cursor header; pass it
+back as ?cursor=... to get the next page. Pages are ordered newest first by id, so a page is
+an index range scan (WHERE id < :last_id ORDER BY id DESC LIMIT n) however deep it goes.
+
+?fields=id,title,status selects only those columns, both in the SQL and in the payload.
+"""
+
+import base64
+import json
+from typing import Iterable, List, Optional, Sequence
+
+from fastapi import HTTPException, Response
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(last_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([last_id]).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """Return the id to continue below, or None for the first page. 400 on a malformed cursor."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        (last_id,) = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return int(last_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str]) -> List[str]:
+    """Columns to select for ?fields=a,b (always including id); all allowed fields when not given."""
+    if not fields:
+        return list(allowed)
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown field(s): {', '.join(unknown)}. Allowed: {', '.join(allowed)}"
+        )
+    return ["id"] + [f for f in requested if f != "id"]
+
+
+def paginate_ids(query, id_column, limit: int, cursor: Optional[str]):
+    """Apply keyset filtering/ordering on id_column; fetches one extra row to detect a next page."""
+    last_id = decode_cursor(cursor)
+    if last_id is not None:
+        query = query.filter(id_column < last_id)
+    return query.order_by(id_column.desc()).limit(limit + 1)
+
+
+def page_rows(rows: list, limit: int, response: Optional[Response] = None) -> tuple:
+    """Trim the extra row; returns (rows, next_cursor) and sets X-Next-Cursor on response if given."""
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].id)
+    if response is not None and next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return rows, next_cursor
+
+
+def project(rows: Iterable, fields: Sequence[str]) -> List[dict]:
+    return [{field: getattr(row, field) for field in fields} for row in rows]
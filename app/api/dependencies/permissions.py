@@ -2,14 +2,16 @@
 Permission and access control dependencies for FastAPI routes
 """
 
-from typing import Optional
+from typing import NamedTuple, Optional
 from fastapi import Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.database.database import get_db
 from app.models.user import User
 from app.models.workspace import Workspace, WorkspaceMember
+from app.models.retrospective_new import Retrospective, RetrospectiveParticipant
 from app.api.dependencies.auth import get_current_user
+from app.services.auth_cache import cached_membership, remember_membership
 
 
 # Define role hierarchy for permission checking
@@ -40,27 +42,32 @@ def get_workspace_membership(
     Dependency to get user's membership in a workspace.
     Raises 403 if user is not a member, or 404 if workspace doesn't exist.
     """
-    # Check if workspace exists
-    workspace = db.query(Workspace).filter(Workspace.id == workspace_id).first()
-    if not workspace:
+    membership = cached_membership(db, workspace_id, current_user.id)
+    if membership is not None:
+        return membership
+    
+    # Workspace existence and membership in one round trip
+    row = db.query(Workspace.id, WorkspaceMember).outerjoin(
+        WorkspaceMember,
+        (WorkspaceMember.workspace_id == Workspace.id)
+        & (WorkspaceMember.user_id == current_user.id)
+        & (WorkspaceMember.is_active == True)
+    ).filter(Workspace.id == workspace_id).first()
+    
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Workspace not found"
         )
     
-    # Check membership
-    membership = db.query(WorkspaceMember).filter(
-        WorkspaceMember.workspace_id == workspace_id,
-        WorkspaceMember.user_id == current_user.id,
-        WorkspaceMember.is_active == True
-    ).first()
-    
+    membership = row[1]
     if not membership:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You are not a member of this workspace"
         )
     
+    remember_membership(membership)
     return membership
 
 
@@ -111,3 +118,42 @@ def require_workspace_member(
 ) -> WorkspaceMember:
     """Dependency to require member role or higher in a workspace."""
     return require_workspace_role(workspace_id, "member", current_user, db)
+
+
+class ParticipantContext(NamedTuple):
+    retrospective: Retrospective
+    participant: Optional[RetrospectiveParticipant]
+
+
+def load_participant_context(
+    db: Session,
+    retro_id: int,
+    current_user: User,
+    forbidden_detail: str = "You are not a participant in this retrospective",
+    allow_facilitator: bool = False
+) -> ParticipantContext:
+    """
+    Load a retrospective and the user's participant row in one query.
+    Raises 404 if the retrospective doesn't exist, 403 if the user is not a participant
+    (unless allow_facilitator and the user facilitates it; participant is then None).
+    """
+    row = db.query(Retrospective, RetrospectiveParticipant).outerjoin(
+        RetrospectiveParticipant,
+        (RetrospectiveParticipant.retrospective_id == Retrospective.id)
+        & (RetrospectiveParticipant.user_id == current_user.id)
+    ).filter(Retrospective.id == retro_id).first()
+    
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Retrospective not found"
+        )
+    
+    retro, participant = row
+    if participant is None and not (allow_facilitator and retro.facilitator_id == current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=forbidden_detail
+        )
+    
+    return ParticipantContext(retro, participant)
@@ -0,0 +1,154 @@
+"""
+Rate limits and concurrency quotas for the AI endpoints
+
+    @router.post("/{retro_id}/generate", dependencies=[Depends(ai_rate_limit("grouping.generate"))])
+    @router.post("/{topic_id}/message", dependencies=[Depends(ai_rate_limit("discussion.topic_message", retro_of=retro_from_topic))])
+
+Before the handler runs, the request must:
+  1. take a token from the user's bucket and from the workspace's bucket for that endpoint
+     (app/core/rate_limit.py; memory or database backed), so one user or one tenant cannot
+     use up everyone's OpenAI capacity; only participants of the retrospective count
+     against its workspace, and
+  2. get one of the process's LLM slots (app/ai/concurrency.py), queueing on the event loop
+     for up to AI_QUEUE_TIMEOUT_SECONDS while all are busy.
+Otherwise it is answered 429 with a Retry-After header, before any work is done.
+
+Routes that usually answer from stored results (e.g. DA recommendations) skip the dependency
+and call take_ai_quota() only on the path that calls the model; AIClient's own slot wait
+then applies.
+"""
+
+import json
+import logging
+import math
+from typing import Dict, Optional
+
+from fastapi import Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.ai.concurrency import AI_THROTTLED, AICapacityExceeded, reserve_request_slot
+from app.api.dependencies.auth import get_current_user
+from app.api.dependencies.permissions import load_participant_context
+from app.core import rate_limit
+from app.core.config import settings
+from app.database.database import get_db
+from app.models.retrospective_new import ChatSession, DiscussionTopic
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# (user rate, workspace rate) per endpoint_name; anything else uses "default"
+_DEFAULT_LIMITS: Dict[str, Dict[str, float]] = {
+    "default": {"user_per_minute": 20, "user_burst": 10, "workspace_per_minute": 120, "workspace_burst": 60},
+    # Whole-retro prompts; facilitator actions that are rarely repeated
+    "grouping.generate": {"user_per_minute": 6, "user_burst": 3, "workspace_per_minute": 30, "workspace_burst": 10},
+    "discussion.generate_summary": {"user_per_minute": 6, "user_burst": 3, "workspace_per_minute": 30, "workspace_burst": 10},
+}
+
+
+def limits_for(endpoint_name: str) -> Dict[str, Optional[rate_limit.Rate]]:
+    limits = dict(_DEFAULT_LIMITS["default"])
+    limits.update(_DEFAULT_LIMITS.get(endpoint_name, {}))
+    overrides_json = settings.AI_RATE_LIMITS_JSON
+    if overrides_json:
+        try:
+            limits.update(json.loads(overrides_json).get(endpoint_name) or {})
+        except Exception as e:
+            logger.warning(f"⚠️ Ignoring invalid AI_RATE_LIMITS_JSON: {e}")
+
+    def rate(kind: str) -> Optional[rate_limit.Rate]:
+        per_minute = float(limits.get(f"{kind}_per_minute") or 0)
+        if per_minute <= 0:
+            return None  # unlimited
+        return rate_limit.Rate(per_minute=per_minute, burst=max(1, int(limits.get(f"{kind}_burst") or 1)))
+
+    return {"user": rate("user"), "workspace": rate("workspace")}
+
+
+def too_many_requests(detail: str, retry_after_seconds: float) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=detail,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after_seconds)))},
+    )
+
+
+def take_ai_quota(endpoint_name: str, user_id: int, workspace_id: int) -> None:
+    """
+    Take one token from the user's and the workspace's bucket for endpoint_name; raises 429.
+    For handlers that only sometimes call the model: check the quota just before they do.
+    """
+    if not settings.AI_RATE_LIMIT_ENABLED:
+        return
+    limits = limits_for(endpoint_name)
+    user_key = f"{endpoint_name}:user:{user_id}"
+    wait = rate_limit.take(user_key, limits["user"])
+    if wait > 0:
+        AI_THROTTLED.inc(endpoint=endpoint_name, reason="user")
+        raise too_many_requests("Too many AI requests; please wait a moment and try again", wait)
+    wait = rate_limit.take(f"{endpoint_name}:workspace:{workspace_id}", limits["workspace"])
+    if wait > 0:
+        # The request is refused, so it should not count against the user either
+        rate_limit.refund(user_key, limits["user"])
+        AI_THROTTLED.inc(endpoint=endpoint_name, reason="workspace")
+        raise too_many_requests("Your workspace is making too many AI requests; please try again shortly", wait)
+
+
+def retro_from_path(retro_id: int) -> Optional[int]:
+    return retro_id
+
+
+def retro_from_topic(topic_id: int, db: Session = Depends(get_db)) -> Optional[int]:
+    row = db.query(DiscussionTopic.retrospective_id).filter(DiscussionTopic.id == topic_id).first()
+    return row[0] if row else None
+
+
+def retro_from_chat_session(
+    session_id: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> Optional[int]:
+    # Only the user's own sessions, like the chat routes themselves
+    row = db.query(ChatSession.retrospective_id).filter(
+        ChatSession.session_id == session_id,
+        ChatSession.user_id == current_user.id
+    ).first()
+    return row[0] if row else None
+
+
+def ai_rate_limit(endpoint_name: str, allow_facilitator: bool = False, retro_of=retro_from_path):
+    """
+    Dependency for an AI route; see the module docstring.
+
+    retro_of resolves the retrospective the request acts on from the path: retro_from_path
+    for /{retro_id}/..., retro_from_topic for /{topic_id}/..., retro_from_chat_session for
+    /{session_id}/.... Only participants of that retrospective (and its facilitator, with
+    allow_facilitator) take a token from its workspace's bucket, so outsiders cannot spend
+    a tenant's quota.
+    """
+
+    def check_buckets(
+        retro_id: Optional[int] = Depends(retro_of),
+        current_user: User = Depends(get_current_user),
+        db: Session = Depends(get_db)
+    ) -> None:
+        if not settings.AI_RATE_LIMIT_ENABLED or retro_id is None:
+            # Unknown topic / session: the handler answers 404 without calling the model
+            return
+        # 404 / 403 before any token is taken
+        retro, _participant = load_participant_context(
+            db, retro_id, current_user, allow_facilitator=allow_facilitator
+        )
+        take_ai_quota(endpoint_name, current_user.id, retro.workspace_id)
+
+    async def reserve_llm_slot(_: None = Depends(check_buckets)):
+        try:
+            release = await reserve_request_slot(endpoint_name)
+        except AICapacityExceeded as e:
+            raise too_many_requests("The AI assistant is busy; please try again shortly", e.retry_after_seconds)
+        try:
+            yield
+        finally:
+            release()
+
+    return reserve_llm_slot
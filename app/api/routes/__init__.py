@@ -15,7 +15,8 @@ from . import (
     google_auth,
     workspace_invitations,
     onboarding,
-    workspace_documents
+    workspace_documents,
+    admin
 )
 
 __all__ = [
@@ -32,6 +33,7 @@ __all__ = [
     "google_auth",
     "workspace_invitations",
     "onboarding",
-    "workspace_documents"
+    "workspace_documents",
+    "admin"
 ]
 
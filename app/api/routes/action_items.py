@@ -2,20 +2,25 @@
 Action items routes
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.database.database import get_db
 from app.models.action_item import ActionItem
 from app.schemas.action_item import ActionItemCreate, ActionItemResponse, ActionItemUpdate
 from app.services.action_item_service import ActionItemService
 from app.api.dependencies.auth import get_current_user
+from app.api.dependencies.pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, decode_cursor, page_rows, parse_fields, project
+)
 
 router = APIRouter()
 
 
 @router.post("/", response_model=ActionItemResponse)
-async def create_action_item(
+def create_action_item(
     action_item_data: ActionItemCreate,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -27,30 +32,40 @@ async def create_action_item(
 
 
 @router.get("/", response_model=List[ActionItemResponse])
-async def get_action_items(
+def get_action_items(
+    response: Response,
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,title,status"),
     retrospective_id: int = None,
     workspace_id: int = None,
     status: str = None,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    """Get action items with optional filters"""
+    """Get action items with optional filters, newest first (keyset paginated)"""
+    columns = parse_fields(fields, list(ActionItemResponse.model_fields))
     service = ActionItemService(db)
-    action_items = service.get_action_items(
+    rows = service.get_action_items(
         current_user.id, 
         skip=skip, 
-        limit=limit,
+        limit=limit + 1,
         retrospective_id=retrospective_id,
         workspace_id=workspace_id,
-        status=status
+        status=status,
+        before_id=decode_cursor(cursor),
+        columns=columns
     )
-    return [ActionItemResponse.from_orm(item) for item in action_items]
+    rows, next_cursor = page_rows(rows, limit, response)
+    if fields:
+        headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+        return JSONResponse(jsonable_encoder(project(rows, columns)), headers=headers)
+    return [ActionItemResponse.model_validate(row) for row in rows]
 
 
 @router.get("/{action_item_id}", response_model=ActionItemResponse)
-async def get_action_item(
+def get_action_item(
     action_item_id: int,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -67,7 +82,7 @@ async def get_action_item(
 
 
 @router.put("/{action_item_id}", response_model=ActionItemResponse)
-async def update_action_item(
+def update_action_item(
     action_item_id: int,
     action_item_data: ActionItemUpdate,
     db: Session = Depends(get_db),
@@ -85,7 +100,7 @@ async def update_action_item(
 
 
 @router.delete("/{action_item_id}")
-async def delete_action_item(
+def delete_action_item(
     action_item_id: int,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
@@ -102,7 +117,7 @@ async def delete_action_item(
 
 
 @router.post("/{action_item_id}/complete")
-async def complete_action_item(
+def complete_action_item(
     action_item_id: int,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
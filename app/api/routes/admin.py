@@ -0,0 +1,36 @@
+"""
+Operator-only API routes (not for workspace users)
+
+Every route requires "Authorization: Bearer <ADMIN_API_TOKEN>"; with no token configured
+they answer 503.
+"""
+
+from fastapi import APIRouter, Depends, Header, Query
+from sqlalchemy.orm import Session
+from typing import Optional, Dict
+
+from app.ai.usage_ledger import ledger, report_for_last_days
+from app.api.dependencies.auth import require_bearer_secret
+from app.core.config import settings
+from app.database.database import get_db
+
+router = APIRouter(prefix="/api/v1/admin", tags=["admin"])
+
+
+@router.get("/ai-usage", response_model=Dict)
+def get_ai_usage(
+    days: int = Query(30, ge=1, le=366),
+    workspace_id: Optional[int] = Query(None),
+    authorization: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """
+    AI spend and latency over the last `days` days from the usage ledger: totals, then per
+    workspace (with its endpoints) and per endpoint/model, most expensive first, plus a daily
+    series. cost_usd covers calls that reached OpenAI; cache_savings_usd is what the answers
+    served from the AI response cache would have cost.
+    """
+    require_bearer_secret(authorization, settings.ADMIN_API_TOKEN, "ADMIN_API_TOKEN")
+    # Include rows still buffered in this process so the report is current
+    ledger.flush()
+    return report_for_last_days(db, days=days, workspace_id=workspace_id)
@@ -2,9 +2,9 @@
 Discussion and Summary Generation
 AI-facilitated discussion on top-voted themes + Sprint summaries
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case
 from typing import List
 from pydantic import BaseModel
 from datetime import datetime
@@ -14,17 +14,20 @@ import json
 from app.database.database import get_db
 from app.models.retrospective_new import (
     Retrospective, DiscussionTopic, DiscussionMessage, ThemeGroup,
-    RetrospectiveParticipant, RetrospectiveResponse, DARecommendation,
-    VotingSession, VoteAllocation
+    RetrospectiveParticipant, RetrospectiveResponse, DARecommendation
 )
-from app.models.action_item import ActionItem
 from app.models.user import User
 from app.api.dependencies.auth import get_current_user
+from app.api.dependencies.permissions import load_participant_context
+from app.api.dependencies.rate_limit import ai_rate_limit, retro_from_topic, take_ai_quota
 from app.core.config import settings
 from app.ai.openai_client import AIClient
 from app.ai.features.discussion import facilitate_discussion_message, answer_general_discussion_question
 from app.ai.features.sprint_summary import generate_sprint_summary
 from app.ai.features.da_recommendations import generate_da_recommendations
+from app.ai.features.history_summary import roll_conversation_window
+from app.services.summary_pdf import get_summary_pdf, summary_content_version
+from app.services.summary_snapshot import latest_voting_session_id, voting_results as build_voting_results
 import logging
 
 logger = logging.getLogger(__name__)
@@ -75,7 +78,7 @@ class SprintSummary(BaseModel):
 # ============================================================================
 
 @router.get("/{retro_id}/topics", response_model=List[DiscussionTopicResponse])
-async def get_discussion_topics(
+def get_discussion_topics(
     retro_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -119,8 +122,11 @@ async def get_discussion_topics(
         raise HTTPException(status_code=500, detail=f"Failed to fetch topics: {str(e)}")
 
 
-@router.post("/{topic_id}/message")
-async def send_discussion_message(
+@router.post(
+    "/{topic_id}/message",
+    dependencies=[Depends(ai_rate_limit("discussion.topic_message", retro_of=retro_from_topic))]
+)
+def send_discussion_message(
     topic_id: int,
     message_req: MessageRequest,
     current_user: User = Depends(get_current_user),
@@ -162,33 +168,47 @@ async def send_discussion_message(
         # Get theme details for context
         theme = db.query(ThemeGroup).filter(ThemeGroup.id == topic.theme_group_id).first()
         
-        # Get conversation history
+        # Get conversation history newer than the rolling summary
         history = db.query(DiscussionMessage, User).outerjoin(
             User, DiscussionMessage.user_id == User.id
         ).filter(
-            DiscussionMessage.discussion_topic_id == topic_id
-        ).order_by(DiscussionMessage.created_at).all()
+            DiscussionMessage.discussion_topic_id == topic_id,
+            DiscussionMessage.id > (topic.history_summary_message_id or 0)
+        ).order_by(DiscussionMessage.created_at, DiscussionMessage.id).all()
         
         # Build AI history messages (system prompt is owned by app/ai/)
         history_messages = []
+        history_message_ids = []
         for msg, user in history:
             if msg.message_type == 'user' and user:
                 history_messages.append({"role": "user", "content": f"{user.full_name}: {msg.content}"})
+                history_message_ids.append(msg.id)
             elif msg.message_type == 'ai_facilitator':
                 history_messages.append({"role": "assistant", "content": msg.content})
+                history_message_ids.append(msg.id)
 
         # Get AI response (centralized AI layer)
-        ai_model_used = getattr(settings, "AI_MODEL", "gpt-4") or "gpt-4"
         try:
-            ai = AIClient()
-            ai_content, _usage = facilitate_discussion_message(
+            ai = AIClient(retrospective_id=topic.retrospective_id, user_id=current_user.id)
+            history_summary, folded, history_messages = roll_conversation_window(
+                ai=ai,
+                previous_summary=topic.history_summary,
+                history_messages=history_messages,
+                endpoint_name="discussion.history_summary",
+            )
+            if folded:
+                topic.history_summary = history_summary
+                topic.history_summary_message_id = history_message_ids[folded - 1]
+            ai_content, usage = facilitate_discussion_message(
                 ai=ai,
                 theme_title=theme.title or "",
                 theme_description=theme.description or "",
                 total_votes=topic.total_votes or 0,
                 history_messages=history_messages,
                 endpoint_name="discussion.topic_message",
+                history_summary=history_summary,
             )
+            ai_model_used = usage.get("model")
         except Exception as ai_error:
             print(f"AI discussion error: {ai_error}")
             ai_content = "Thank you for sharing. What do others think about this?"
@@ -219,7 +239,7 @@ async def send_discussion_message(
 
 
 @router.get("/{topic_id}/messages", response_model=List[DiscussionMessageResponse])
-async def get_discussion_messages(
+def get_discussion_messages(
     topic_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -267,8 +287,8 @@ async def get_discussion_messages(
         raise HTTPException(status_code=500, detail=f"Failed to fetch messages: {str(e)}")
 
 
-@router.post("/{retro_id}/chat")
-async def general_discussion_chat(
+@router.post("/{retro_id}/chat", dependencies=[Depends(ai_rate_limit("discussion.general_chat"))])
+def general_discussion_chat(
     retro_id: int,
     message_req: MessageRequest,
     current_user: User = Depends(get_current_user),
@@ -308,7 +328,7 @@ async def general_discussion_chat(
         da_context = da_rec.content if da_rec else "No DA recommendations generated yet."
         
         try:
-            ai = AIClient()
+            ai = AIClient(retrospective_id=retro_id, user_id=current_user.id)
             ai_content, _usage = answer_general_discussion_question(
                 ai=ai,
                 themes_context=themes_context,
@@ -336,8 +356,8 @@ async def general_discussion_chat(
 # SUMMARY GENERATION
 # ============================================================================
 
-@router.post("/{retro_id}/generate-summary")
-async def generate_summary(
+@router.post("/{retro_id}/generate-summary", dependencies=[Depends(ai_rate_limit("discussion.generate_summary", allow_facilitator=True))])
+def generate_summary(
     retro_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -380,7 +400,7 @@ async def generate_summary(
         
         # Generate summary using centralized AI layer (with caching)
         try:
-            ai = AIClient()
+            ai = AIClient(workspace_id=retro.workspace_id, retrospective_id=retro_id, user_id=current_user.id)
             result = generate_sprint_summary(
                 ai=ai,
                 data_summary=data_summary,
@@ -422,7 +442,7 @@ async def generate_summary(
 
 
 @router.get("/{retro_id}/summary")
-async def get_summary(
+def get_summary(
     retro_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -431,51 +451,20 @@ async def get_summary(
     Get retrospective summary
     """
     try:
-        retro = db.query(Retrospective).filter(Retrospective.id == retro_id).first()
-        
-        if not retro:
-            raise HTTPException(status_code=404, detail="Retrospective not found")
-        
-        # Verify participant
-        participant = db.query(RetrospectiveParticipant).filter(
-            RetrospectiveParticipant.retrospective_id == retro_id,
-            RetrospectiveParticipant.user_id == current_user.id
-        ).first()
-        
-        if not participant:
-            raise HTTPException(status_code=403, detail="Not a participant")
+        # Retrospective and the user's participant row in one query
+        retro, participant = load_participant_context(db, retro_id, current_user, "Not a participant")
         
         if not retro.ai_summary:
             raise HTTPException(status_code=404, detail="Summary not yet generated")
         
         insights = retro.ai_insights or {}
         
-        # Get voting tallies for all themes
-        voting_results = []
-        voting_session = db.query(VotingSession).filter(
-            VotingSession.retrospective_id == retro_id
-        ).order_by(VotingSession.created_at.desc()).first()
-        
-        if voting_session:
-            themes = db.query(ThemeGroup).filter(
-                ThemeGroup.retrospective_id == retro_id
-            ).all()
-            
-            for theme in themes:
-                total_votes = db.query(func.sum(VoteAllocation.votes_allocated)).filter(
-                    VoteAllocation.voting_session_id == voting_session.id,
-                    VoteAllocation.theme_group_id == theme.id
-                ).scalar() or 0
-                
-                voting_results.append({
-                    "theme_title": theme.title,
-                    "theme_description": theme.description,
-                    "total_votes": total_votes,
-                    "category": theme.primary_category
-                })
-            
-            # Sort by votes
-            voting_results.sort(key=lambda x: x['total_votes'], reverse=True)
+        # Voting tallies: materialized when voting was finalized, otherwise one grouped aggregate
+        snapshot = retro.summary_snapshot or {}
+        voting_results = snapshot.get("voting_results")
+        if voting_results is None:
+            voting_session_id = latest_voting_session_id(db, retro_id)
+            voting_results = build_voting_results(db, retro_id, voting_session_id) if voting_session_id else []
         
         return {
             "summary": retro.ai_summary,
@@ -499,7 +488,7 @@ async def get_summary(
 # ============================================================================
 
 @router.get("/{retro_id}/da-recommendations")
-async def get_da_recommendations(
+def get_da_recommendations(
     retro_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -508,19 +497,20 @@ async def get_da_recommendations(
     Generate DA Browser recommendations based on discussion topics
     """
     try:
-        retro = db.query(Retrospective).filter(Retrospective.id == retro_id).first()
-        
-        if not retro:
-            raise HTTPException(status_code=404, detail="Retrospective not found")
+        # Retrospective and the user's participant row in one query
+        retro, participant = load_participant_context(db, retro_id, current_user, "Not a participant")
         
-        # Verify participant
-        participant = db.query(RetrospectiveParticipant).filter(
-            RetrospectiveParticipant.retrospective_id == retro_id,
-            RetrospectiveParticipant.user_id == current_user.id
+        # Stored recommendations are returned as-is (no model call, so no AI quota)
+        existing_da_rec = db.query(DARecommendation).filter(
+            DARecommendation.retrospective_id == retro_id
         ).first()
         
-        if not participant:
-            raise HTTPException(status_code=403, detail="Not a participant")
+        if existing_da_rec:
+            return {
+                "content": existing_da_rec.content
+            }
+        
+        take_ai_quota("discussion.da_recommendations", current_user.id, retro.workspace_id)
         
         # Get top themes for discussion
         topics = db.query(DiscussionTopic, ThemeGroup).join(
@@ -535,18 +525,8 @@ async def get_da_recommendations(
             for topic, theme in topics
         ])
         
-        # Check if DA recommendations already exist in database
-        existing_da_rec = db.query(DARecommendation).filter(
-            DARecommendation.retrospective_id == retro_id
-        ).first()
-        
-        if existing_da_rec:
-            return {
-                "content": existing_da_rec.content
-            }
-        
         try:
-            ai = AIClient()
+            ai = AIClient(workspace_id=retro.workspace_id, retrospective_id=retro_id, user_id=current_user.id)
             result = generate_da_recommendations(
                 ai=ai,
                 themes_text=themes_text,
@@ -587,328 +567,33 @@ async def get_da_recommendations(
 @router.get("/{retro_id}/summary/pdf")
 async def download_summary_pdf(
     retro_id: int,
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Generate and download summary as PDF
+    
+    Rendered once per content version (see app/services/summary_pdf.py) and served with an
+    ETag, so repeat downloads return 304 or the cached file.
     """
     from fastapi.responses import Response
     
     try:
-        retro = db.query(Retrospective).filter(Retrospective.id == retro_id).first()
-        
-        if not retro:
-            raise HTTPException(status_code=404, detail="Retrospective not found")
-        
-        # Verify participant
-        participant = db.query(RetrospectiveParticipant).filter(
-            RetrospectiveParticipant.retrospective_id == retro_id,
-            RetrospectiveParticipant.user_id == current_user.id
-        ).first()
-        
-        if not participant:
-            raise HTTPException(status_code=403, detail="Not a participant")
-        
-        # Get participants for listing
-        participant_rows = db.query(RetrospectiveParticipant, User).join(
-            User, RetrospectiveParticipant.user_id == User.id
-        ).filter(
-            RetrospectiveParticipant.retrospective_id == retro_id
-        ).order_by(
-            func.lower(func.coalesce(User.full_name, User.email, ''))
-        ).all()
-        
-        # Get action items associated with this retrospective
-        priority_order = case(
-            (ActionItem.priority == 'critical', 4),
-            (ActionItem.priority == 'high', 3),
-            (ActionItem.priority == 'medium', 2),
-            (ActionItem.priority == 'low', 1),
-            else_=0
+        # Retrospective and the user's participant row in one query
+        # Sync queries go to the threadpool; this handler stays async to await the shared render
+        retro, participant = await run_in_threadpool(
+            load_participant_context, db, retro_id, current_user, "Not a participant"
         )
         
-        action_items = db.query(ActionItem).filter(
-            ActionItem.retrospective_id == retro_id
-        ).order_by(
-            ActionItem.status,
-            priority_order.desc(),
-            ActionItem.due_date.is_(None),
-            ActionItem.due_date.asc()
-        ).all()
-        
-        # Get DA recommendations and top themes
-        da_rec = db.query(DARecommendation).filter(
-            DARecommendation.retrospective_id == retro_id
-        ).first()
-        
-        # Get top discussion topics
-        topics = db.query(DiscussionTopic, ThemeGroup).join(
-            ThemeGroup, DiscussionTopic.theme_group_id == ThemeGroup.id
-        ).filter(
-            DiscussionTopic.retrospective_id == retro_id
-        ).order_by(DiscussionTopic.total_votes.desc()).limit(5).all()
-        
-        insights = retro.ai_insights or {}
+        version = await run_in_threadpool(summary_content_version, db, retro)
+        etag = f'"{version[:32]}"'
+        cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=cache_headers)
         
-        # Generate PDF using reportlab
         try:
-            from reportlab.lib.pagesizes import letter
-            from reportlab.lib import colors
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle
-            from reportlab.lib.units import inch
-            import io
-            from xml.sax.saxutils import escape as xml_escape
-            
-            buffer = io.BytesIO()
-            doc = SimpleDocTemplate(buffer, pagesize=letter,
-                                  rightMargin=72, leftMargin=72,
-                                  topMargin=72, bottomMargin=72)
-            
-            # Container for the 'Flowable' objects
-            elements = []
-            
-            # Define styles
-            styles = getSampleStyleSheet()
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=22,
-                textColor=colors.HexColor('#667eea'),
-                spaceAfter=18,
-                alignment=1,  # Center alignment
-            )
-            heading_style = ParagraphStyle(
-                'CustomHeading',
-                parent=styles['Heading2'],
-                fontSize=14,
-                textColor=colors.HexColor('#667eea'),
-                spaceAfter=10,
-                spaceBefore=10,
-            )
-            subheading_style = ParagraphStyle(
-                'SubHeading',
-                parent=styles['Heading3'],
-                fontSize=12,
-                textColor=colors.HexColor('#4a5568'),
-                spaceAfter=6,
-            )
-            normal_style = ParagraphStyle(
-                'Normal',
-                parent=styles['Normal'],
-                fontSize=9,
-                leading=12,
-            )
-            
-            # Title
-            elements.append(Paragraph(f"Retrospective Summary", title_style))
-            elements.append(Paragraph(f"{retro.title or 'Team Retrospective'}", styles['Title']))
-            if retro.sprint_name:
-                elements.append(Paragraph(f"Sprint: {retro.sprint_name}", styles['Normal']))
-            if retro.actual_start_time:
-                elements.append(Paragraph(
-                    f"Date: {retro.actual_start_time.strftime('%B %d, %Y')}", 
-                    styles['Normal']
-                ))
-            elements.append(Spacer(1, 0.3*inch))
-            
-            # Top Themes for Discussion
-            if topics:
-                elements.append(Paragraph("Top Themes Discussed", heading_style))
-                for i, (topic, theme) in enumerate(topics, 1):
-                    elements.append(Paragraph(
-                        f"{i}. {theme.title} ({topic.total_votes} votes)",
-                        subheading_style
-                    ))
-                    if theme.description:
-                        elements.append(Paragraph(theme.description, normal_style))
-                    elements.append(Spacer(1, 0.1*inch))
-                elements.append(Spacer(1, 0.2*inch))
-            
-            # Overall Assessment
-            if retro.ai_summary:
-                elements.append(Paragraph("Overall Assessment", heading_style))
-                elements.append(Paragraph(retro.ai_summary, normal_style))
-                elements.append(Spacer(1, 0.3*inch))
-            
-            # Achievements
-            achievements = insights.get('achievements', [])
-            if achievements:
-                elements.append(Paragraph("Key Achievements", heading_style))
-                for achievement in achievements:
-                    elements.append(Paragraph(f"✓ {achievement}", normal_style))
-                elements.append(Spacer(1, 0.3*inch))
-            
-            # Challenges
-            challenges = insights.get('challenges', [])
-            if challenges:
-                elements.append(Paragraph("Main Challenges", heading_style))
-                for challenge in challenges:
-                    elements.append(Paragraph(f"⚠ {challenge}", normal_style))
-                elements.append(Spacer(1, 0.3*inch))
-            
-            # Page break before Participants and Action Items (Page 2)
-            elements.append(PageBreak())
-            
-            # Participants and Action Items on their own page
-            if participant_rows:
-                elements.append(Paragraph("Participants", heading_style))
-                participant_table_data = [["Name", "Email", "Voting Complete"]]
-                for rp, user in participant_rows:
-                    name = xml_escape(user.full_name or user.email or f"User {user.id}")
-                    email = xml_escape(user.email or "—")
-                    voting_complete = "Yes" if rp.completed_voting else "No"
-                    participant_table_data.append([
-                        Paragraph(name, normal_style),
-                        Paragraph(email, normal_style),
-                        Paragraph(voting_complete, normal_style)
-                    ])
-                participant_table = Table(participant_table_data)
-                participant_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#667eea')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-                    ('ALIGN', (0, 1), (-1, -1), 'LEFT'),
-                    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.whitesmoke, colors.lightgrey]),
-                    ('GRID', (0, 0), (-1, -1), 0.25, colors.HexColor('#cbd5f5')),
-                    ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ]))
-                elements.append(participant_table)
-                elements.append(Spacer(1, 0.3*inch))
-            
-            elements.append(Paragraph("Action Items", heading_style))
-            if action_items:
-                action_table_data = [["Title", "Owner", "Status", "Due Date", "Progress"]]
-                for item in action_items:
-                    title_text = xml_escape(item.title or "Untitled action item")
-                    assignee = "Unassigned"
-                    if item.assignee:
-                        assignee = item.assignee.full_name or item.assignee.email or f"User {item.assignee.id}"
-                    assignee = xml_escape(assignee)
-                    status_text = xml_escape((item.status or "pending").replace('_', ' ').title())
-                    due_text = item.due_date.strftime('%b %d, %Y') if item.due_date else "—"
-                    progress_text = f"{item.progress_percentage or 0}%"
-                    action_table_data.append([
-                        Paragraph(f"<b>{title_text}</b>", normal_style),
-                        Paragraph(assignee, normal_style),
-                        Paragraph(status_text, normal_style),
-                        Paragraph(xml_escape(due_text), normal_style),
-                        Paragraph(progress_text, normal_style)
-                    ])
-                action_table = Table(action_table_data)
-                action_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4c51bf')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-                    ('ALIGN', (0, 1), (-1, -1), 'LEFT'),
-                    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.whitesmoke, colors.HexColor('#edf2ff')]),
-                    ('GRID', (0, 0), (-1, -1), 0.25, colors.HexColor('#d0d7f9')),
-                    ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ]))
-                elements.append(action_table)
-            else:
-                elements.append(Paragraph("No action items were captured for this retrospective.", normal_style))
-            elements.append(Spacer(1, 0.3*inch))
-            
-            # Disciplined Agile Recommendations (format: number titles only, bullets for recommendations)
-            if da_rec and da_rec.content:
-                elements.append(PageBreak())
-                elements.append(Paragraph("Disciplined Agile Recommendations", heading_style))
-                try:
-                    import re
-                    raw = da_rec.content or ""
-                    # Convert **bold** to <b> for reportlab Paragraph
-                    raw = re.sub(r"\*\*(.*?)\*\*", r"<b>\1</b>", raw)
-                    # Split into lines
-                    lines = [l.strip() for l in raw.splitlines() if l.strip()]
-                    
-                    number_idx = 1
-                    i = 0
-                    while i < len(lines):
-                        line = lines[i]
-                        
-                        # Remove leading bullets/dashes/numbers if present
-                        clean_line = re.sub(r"^[-•]\s*", "", line)
-                        clean_line = re.sub(r"^\d+\.\s*", "", clean_line)
-                        
-                        # Check if this line is a title (contains bold tags or is short)
-                        is_title = '<b>' in clean_line and '</b>' in clean_line
-                        
-                        # Also check if it's a standalone title (next line is a recommendation)
-                        if not is_title and i + 1 < len(lines):
-                            next_line = lines[i + 1].strip()
-                            # If next line starts with action verb or "Use/Apply/Implement", current is title
-                            if re.match(r"^(Use|Apply|Implement|Practice|Leverage|Optimize)", next_line, re.IGNORECASE):
-                                is_title = True
-                        
-                        if is_title:
-                            # Extract title text (remove bold tags for numbering, but keep content)
-                            title_text = re.sub(r"</?b>", "", clean_line)
-                            elements.append(Paragraph(f"{number_idx}. <b>{title_text}</b>", normal_style))
-                            number_idx += 1
-                            i += 1
-                            
-                            # Add following recommendations as bullets until next title
-                            while i < len(lines):
-                                next_line = lines[i].strip()
-                                next_clean = re.sub(r"^[-•]\s*", "", next_line)
-                                next_clean = re.sub(r"^\d+\.\s*", "", next_clean)
-                                
-                                # Check if next line is a title
-                                is_next_title = '<b>' in next_clean and '</b>' in next_clean
-                                if not is_next_title and i + 1 < len(lines):
-                                    check_line = lines[i + 1].strip()
-                                    if re.match(r"^(Use|Apply|Implement|Practice|Leverage|Optimize)", check_line, re.IGNORECASE):
-                                        is_next_title = True
-                                
-                                if is_next_title:
-                                    break
-                                
-                                # This is a recommendation - use bullet
-                                rec_text = re.sub(r"</?b>", "", next_clean)
-                                elements.append(Paragraph(f"• {rec_text}", normal_style))
-                                i += 1
-                        else:
-                            # Regular line - treat as recommendation
-                            rec_text = re.sub(r"</?b>", "", clean_line)
-                            elements.append(Paragraph(f"• {rec_text}", normal_style))
-                            i += 1
-                            
-                except Exception as e:
-                    print(f"DA recommendations formatting error: {e}")
-                    # Fallback to raw paragraph
-                    elements.append(Paragraph(da_rec.content, normal_style))
-                elements.append(Spacer(1, 0.3*inch))
-            
-            # Recommendations (if in insights)
-            recommendations = insights.get('recommendations', [])
-            if recommendations:
-                elements.append(Paragraph("AI Suggested Action Ideas", heading_style))
-                for recommendation in recommendations:
-                    elements.append(Paragraph(f"→ {recommendation}", normal_style))
-                elements.append(Spacer(1, 0.3*inch))
-            
-            # Build PDF
-            doc.build(elements)
-            
-            # Get the value of the BytesIO buffer
-            pdf = buffer.getvalue()
-            buffer.close()
-            
-            # Return PDF
-            return Response(
-                content=pdf,
-                media_type="application/pdf",
-                headers={
-                    "Content-Disposition": f"attachment; filename=retrospective_summary_{retro.code or retro_id}.pdf"
-                }
-            )
-            
+            pdf, _ = await get_summary_pdf(db, retro, version=version)
         except ImportError:
             raise HTTPException(
                 status_code=500, 
@@ -918,6 +603,16 @@ async def download_summary_pdf(
             print(f"PDF generation error: {pdf_error}")
             raise HTTPException(status_code=500, detail=f"Failed to generate PDF: {str(pdf_error)}")
         
+        # Return PDF
+        return Response(
+            content=pdf,
+            media_type="application/pdf",
+            headers={
+                "Content-Disposition": f"attachment; filename=retrospective_summary_{retro.code or retro_id}.pdf",
+                **cache_headers
+            }
+        )
+        
     except HTTPException:
         raise
     except Exception as e:
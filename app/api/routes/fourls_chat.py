@@ -17,9 +17,12 @@ from app.models.retrospective_new import (
 )
 from app.models.user import User
 from app.api.dependencies.auth import get_current_user
+from app.api.dependencies.permissions import load_participant_context
+from app.api.dependencies.rate_limit import ai_rate_limit, retro_from_chat_session
 from app.core.config import settings
 from app.ai.openai_client import AIClient
 from app.ai.features.fourls_chat import generate_fourls_reply
+from app.ai.features.history_summary import roll_conversation_window
 
 router = APIRouter(prefix="/api/v1/fourls-chat", tags=["4ls-chat"])
 
@@ -69,7 +72,7 @@ class StartChatRequest(BaseModel):
 
 
 @router.post("/start")
-async def start_4ls_chat(
+def start_4ls_chat(
     retrospective_id: Optional[int] = None,
     start_data: Optional[StartChatRequest] = Body(None),
     current_user: User = Depends(get_current_user),
@@ -85,18 +88,8 @@ async def start_4ls_chat(
             raise HTTPException(status_code=422, detail="retrospective_id is required")
 
         # Verify retrospective exists and is at/after scheduled start
-        retro = db.query(Retrospective).filter(Retrospective.id == retro_id).first()
-        if not retro:
-            raise HTTPException(status_code=404, detail="Retrospective not found")
-
-        # Verify user is participant
-        participant = db.query(RetrospectiveParticipant).filter(
-            RetrospectiveParticipant.retrospective_id == retro_id,
-            RetrospectiveParticipant.user_id == current_user.id
-        ).first()
-        
-        if not participant:
-            raise HTTPException(status_code=403, detail="You are not a participant in this retrospective")
+        # Retrospective and the user's participant row in one query
+        retro, participant = load_participant_context(db, retro_id, current_user)
         
         # Check if session already exists
         existing_session = db.query(ChatSession).filter(
@@ -144,7 +137,7 @@ async def start_4ls_chat(
             content=f"Welcome {current_user.full_name}! Let's start our retrospective. We'll go through 4 categories: What you Liked, Learned, Lacked, and Longed For. Let's begin with what you LIKED about this sprint. What went well?",
             message_type='assistant',
             current_category='liked',
-            ai_model='gpt-4'
+            ai_model=None  # canned text, not model output
         )
         db.add(welcome_msg)
         db.commit()
@@ -163,24 +156,15 @@ async def start_4ls_chat(
 
 
 @router.get("/link/by-retro/{retrospective_id}")
-async def get_or_create_session_link(
+def get_or_create_session_link(
     retrospective_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Return a session link for the given retrospective, creating a session if needed."""
     # Verify retrospective exists and is at/after scheduled start
-    retro = db.query(Retrospective).filter(Retrospective.id == retrospective_id).first()
-    if not retro:
-        raise HTTPException(status_code=404, detail="Retrospective not found")
-
-    # Verify user is participant
-    participant = db.query(RetrospectiveParticipant).filter(
-        RetrospectiveParticipant.retrospective_id == retrospective_id,
-        RetrospectiveParticipant.user_id == current_user.id
-    ).first()
-    if not participant:
-        raise HTTPException(status_code=403, detail="You are not a participant in this retrospective")
+    # Retrospective and the user's participant row in one query
+    retro, participant = load_participant_context(db, retrospective_id, current_user)
 
     # Find existing active session
     session = db.query(ChatSession).filter(
@@ -209,7 +193,7 @@ async def get_or_create_session_link(
             content=f"Welcome {current_user.full_name}! Let's start our retrospective with what you LIKED.",
             message_type='assistant',
             current_category='liked',
-            ai_model='gpt-4'
+            ai_model=None  # canned text, not model output
         )
         db.add(welcome_msg)
         db.commit()
@@ -220,7 +204,7 @@ async def get_or_create_session_link(
 
 
 @router.get("/email-link/{retrospective_id}/{user_id}")
-async def get_email_session_link(
+def get_email_session_link(
     retrospective_id: int,
     user_id: int,
     db: Session = Depends(get_db)
@@ -270,7 +254,7 @@ async def get_email_session_link(
             content=f"Welcome {user.full_name}! Let's start our retrospective with what you LIKED.",
             message_type='assistant',
             current_category='liked',
-            ai_model='gpt-4'
+            ai_model=None  # canned text, not model output
         )
         db.add(welcome_msg)
         db.commit()
@@ -281,7 +265,7 @@ async def get_email_session_link(
 
 
 @router.get("/{session_id}")
-async def get_chat_session(
+def get_chat_session(
     session_id: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -356,8 +340,11 @@ class MessageRequest(BaseModel):
     message: str
 
 
-@router.post("/{session_id}/message")
-async def send_message(
+@router.post(
+    "/{session_id}/message",
+    dependencies=[Depends(ai_rate_limit("fourls_chat.message", retro_of=retro_from_chat_session))]
+)
+def send_message(
     session_id: str,
     message_data: MessageRequest,
     current_user: User = Depends(get_current_user),
@@ -402,10 +389,11 @@ async def send_message(
         )
         db.add(retro_response)
         
-        # Get AI response using OpenAI
+        # Get AI response using OpenAI. Only messages newer than the rolling summary are loaded.
         conversation_history = db.query(ChatMessage).filter(
-            ChatMessage.session_id == session.id
-        ).order_by(ChatMessage.created_at).all()
+            ChatMessage.session_id == session.id,
+            ChatMessage.id > (session.history_summary_message_id or 0)
+        ).order_by(ChatMessage.created_at, ChatMessage.id).all()
         
         conversation_messages = []
         for msg in conversation_history:
@@ -414,18 +402,30 @@ async def send_message(
         
         # Call AI layer (OpenAI wrapped + token logging)
         try:
-            ai = AIClient()
+            ai = AIClient(retrospective_id=session.retrospective_id, user_id=current_user.id)
+            history_summary, folded, conversation_messages = roll_conversation_window(
+                ai=ai,
+                previous_summary=session.history_summary,
+                history_messages=conversation_messages,
+                endpoint_name="fourls_chat.history_summary",
+            )
+            if folded:
+                session.history_summary = history_summary
+                session.history_summary_message_id = conversation_history[folded - 1].id
             ai_content, usage = generate_fourls_reply(
                 ai=ai,
                 current_category=session.current_category,
                 conversation_messages=conversation_messages,
                 endpoint_name="fourls_chat.message",
+                history_summary=history_summary,
             )
             tokens_used = usage.get("total_tokens") or 0
+            ai_model_used = usage.get("model")
         except Exception as ai_error:
             print(f"AI API error: {ai_error}")
             ai_content = "Thank you for sharing! Tell me more about that."
             tokens_used = 0
+            ai_model_used = "fallback"
         
         # Post-process to enforce at most one question per reply
         if ai_content and ai_content.count('?') > 1:
@@ -484,7 +484,7 @@ async def send_message(
             content=ai_content,
             message_type='assistant',
             current_category=new_category,
-            ai_model='gpt-4',
+            ai_model=ai_model_used,
             ai_tokens_used=tokens_used
         )
         db.add(ai_msg)
@@ -521,7 +521,7 @@ async def send_message(
 
 
 @router.post("/{session_id}/complete")
-async def complete_session(
+def complete_session(
     session_id: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
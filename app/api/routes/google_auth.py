@@ -19,13 +19,14 @@ def create_jwt_token(user_id: int, email: str):
     payload = {
         "sub": str(user_id),
         "email": email,
+        "iat": datetime.utcnow().timestamp(),
         "exp": datetime.utcnow().timestamp() + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
     }
     return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
 @router.post("/google")
-async def google_signin(request: GoogleTokenRequest):
+def google_signin(request: GoogleTokenRequest):
     """
     Sign in with Google Firebase ID token.
     Creates user in database if doesn't exist.
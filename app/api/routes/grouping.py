@@ -14,11 +14,13 @@ import logging
 
 from app.database.database import get_db
 from app.models.retrospective_new import (
-    Retrospective, RetrospectiveResponse, ThemeGroup, RetrospectiveParticipant
+    Retrospective, RetrospectiveResponse, ThemeGroup
 )
 from app.models.user import User
 from app.models.workspace import WorkspaceMember
 from app.api.dependencies.auth import get_current_user
+from app.api.dependencies.permissions import load_participant_context
+from app.api.dependencies.rate_limit import ai_rate_limit
 from app.core.config import settings
 from app.ai.openai_client import AIClient
 from app.ai.features.grouping import generate_theme_grouping
@@ -130,8 +132,12 @@ def create_fallback_grouping(responses):
 # GROUPING ENDPOINTS
 # ============================================================================
 
-@router.post("/{retro_id}/generate", response_model=GroupingResult)
-async def generate_ai_grouping(
+@router.post(
+    "/{retro_id}/generate",
+    response_model=GroupingResult,
+    dependencies=[Depends(ai_rate_limit("grouping.generate", allow_facilitator=True))]
+)
+def generate_ai_grouping(
     retro_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -142,18 +148,9 @@ async def generate_ai_grouping(
     """
     try:
         # Verify user is facilitator or participant
-        retro = db.query(Retrospective).filter(Retrospective.id == retro_id).first()
-        
-        if not retro:
-            raise HTTPException(status_code=404, detail="Retrospective not found")
-        
-        participant = db.query(RetrospectiveParticipant).filter(
-            RetrospectiveParticipant.retrospective_id == retro_id,
-            RetrospectiveParticipant.user_id == current_user.id
-        ).first()
-        
-        if not participant and retro.facilitator_id != current_user.id:
-            raise HTTPException(status_code=403, detail="Access denied")
+        retro, participant = load_participant_context(
+            db, retro_id, current_user, "Access denied", allow_facilitator=True
+        )
         
         # Get all responses
         responses = db.query(RetrospectiveResponse, User).join(
@@ -181,7 +178,7 @@ async def generate_ai_grouping(
         
 
         try:
-            ai = AIClient()
+            ai = AIClient(workspace_id=retro.workspace_id, retrospective_id=retro_id, user_id=current_user.id)
             themes, _usage, _cached = generate_theme_grouping(
                 ai=ai,
                 responses_text=responses_text,
@@ -352,7 +349,7 @@ async def generate_ai_grouping(
 
 
 @router.get("/{retro_id}")
-async def get_grouping_results(
+def get_grouping_results(
     retro_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -363,20 +360,10 @@ async def get_grouping_results(
     try:
         logger.info(f"📥 Getting grouping results for retro {retro_id}, user {current_user.id}")
         
-        # Verify retrospective exists
-        retro = db.query(Retrospective).filter(Retrospective.id == retro_id).first()
-        
-        if not retro:
-            raise HTTPException(status_code=404, detail="Retrospective not found")
-        
-        # Verify access
-        participant = db.query(RetrospectiveParticipant).filter(
-            RetrospectiveParticipant.retrospective_id == retro_id,
-            RetrospectiveParticipant.user_id == current_user.id
-        ).first()
-        
-        if not participant and retro.facilitator_id != current_user.id:
-            raise HTTPException(status_code=403, detail="Access denied")
+        # Verify retrospective exists and access (participant or facilitator)
+        retro, participant = load_participant_context(
+            db, retro_id, current_user, "Access denied", allow_facilitator=True
+        )
         
         # Get all theme groups - ensure we're querying fresh from database
         from sqlalchemy import asc
@@ -465,7 +452,7 @@ async def get_grouping_results(
 
 
 @router.delete("/theme/{theme_id}")
-async def delete_theme_group(
+def delete_theme_group(
     theme_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -509,7 +496,7 @@ async def delete_theme_group(
 
 
 @router.post("/response/{response_id}/move/{theme_id}")
-async def move_response_to_theme(
+def move_response_to_theme(
     response_id: int,
     theme_id: int,
     current_user: User = Depends(get_current_user),
@@ -552,7 +539,7 @@ async def move_response_to_theme(
 
 
 @router.post("/{retro_id}/themes")
-async def create_theme(
+def create_theme(
     retro_id: int,
     theme_data: dict,  # {category, title, description}
     current_user: User = Depends(get_current_user),
@@ -610,7 +597,7 @@ async def create_theme(
 
 
 @router.put("/theme/{theme_id}")
-async def update_theme(
+def update_theme(
     theme_id: int,
     theme_data: dict,  # {title, description}
     current_user: User = Depends(get_current_user),
@@ -653,7 +640,7 @@ async def update_theme(
 
 
 @router.post("/{retro_id}/themes/reorder")
-async def reorder_themes(
+def reorder_themes(
     retro_id: int,
     order_data: dict,  # {category, theme_ids: [1,2,3]}
     current_user: User = Depends(get_current_user),
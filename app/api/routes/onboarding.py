@@ -317,7 +317,7 @@ def upsert_my_onboarding(
 # ====================== Upload and Generate Summary ======================
 
 @router.post("/workspaces/{workspace_id}/onboarding/upload")
-async def upload_onboarding_source(
+def upload_onboarding_source(
     workspace_id: int,
     background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
@@ -337,7 +337,8 @@ async def upload_onboarding_source(
     
     The extracted text will be stored and can be summarized using the generate endpoint.
     """
-    content_bytes = await file.read()
+    # Plain def: text extraction and the DB work run in the threadpool, not on the event loop
+    content_bytes = file.file.read()
     text = ""
     filename_lower = (file.filename or "").lower()
     ctype = (file.content_type or "").lower()
@@ -443,7 +444,7 @@ async def upload_onboarding_source(
     # RAG: chunk + embed + store in Chroma in the background (so upload is fast).
     def _index_onboarding_text(wid: int, did: str, dhash: str, fname: str, uploaded_at_iso: str, txt: str) -> None:
         try:
-            ai = AIClient()
+            ai = AIClient(workspace_id=wid)
             store = ChromaStore()
             store.upsert_text_document(
                 ai=ai,
@@ -559,7 +560,7 @@ def generate_workspace_summary(
     # Summarize using the centralized AI layer + (RAG if available) + caching.
     # IMPORTANT: Do not save raw document text as "ai_summary" on failure.
     try:
-        ai = AIClient()
+        ai = AIClient(workspace_id=workspace_id, user_id=membership.user_id)
         result = generate_onboarding_summary(
             ai=ai,
             workspace_id=workspace_id,
@@ -667,7 +668,7 @@ def get_onboarding_rag_status(
     retrieved_count = 0
     retrieval_error = None
     try:
-        ai = AIClient()
+        ai = AIClient(workspace_id=workspace_id, user_id=membership.user_id)
         retrieved = store.query(
             ai=ai,
             source="onboarding",
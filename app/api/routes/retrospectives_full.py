@@ -2,11 +2,16 @@
 Complete Retrospective Management Routes
 Handles all 6 phases of retrospective
 """
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Response
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import func, insert
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel
 from datetime import datetime, timedelta, timezone
+import hashlib
+import json
 import secrets
 import string
 from pydantic import Field
@@ -21,8 +26,14 @@ from app.models.workspace import Workspace, WorkspaceMember
 from app.models.user import User
 from app.models.action_item import ActionItem
 from app.api.dependencies.auth import get_current_user
+from app.api.dependencies.permissions import load_participant_context
+from app.api.dependencies.pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, encode_cursor, page_rows, paginate_ids, parse_fields, project
+)
+from app.services import dashboard_projection
 from app.services.calendar_service import CalendarService
 from app.services.email_service import EmailService
+from app.services.email_outbox_worker import deliver_pending_emails
 from app.core.config import settings
 
 router = APIRouter(prefix="/api/v1/retrospectives", tags=["retrospectives"])
@@ -58,6 +69,10 @@ class RetrospectiveResponse(BaseModel):
         from_attributes = True
 
 
+# Columns of the list endpoints (also the fields ?fields= may select)
+RETRO_LIST_FIELDS = list(RetrospectiveResponse.model_fields)
+
+
 class ParticipantResponse(BaseModel):
     id: int
     user_id: int
@@ -76,8 +91,9 @@ class ParticipantResponse(BaseModel):
 # ============================================================================
 
 @router.post("/", response_model=RetrospectiveResponse)
-async def create_retrospective(
+def create_retrospective(
     retro_data: RetrospectiveCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -147,70 +163,96 @@ async def create_retrospective(
         db.add(new_retro)
         db.flush()
         
-        # Add all workspace members as participants
-        members = db.query(WorkspaceMember).filter(
+        # Add all workspace members as participants; members and their users come from one query
+        members = db.query(WorkspaceMember.user_id, User.email, User.full_name).outerjoin(
+            User, User.id == WorkspaceMember.user_id
+        ).filter(
             WorkspaceMember.workspace_id == retro_data.workspace_id,
             WorkspaceMember.is_active == True
         ).all()
-        
-        for member in members:
-            participant = RetrospectiveParticipant(
-                retrospective_id=new_retro.id,
-                user_id=member.user_id
-            )
-            db.add(participant)
+        # workspace_members does not enforce one row per user, but participants do
+        # (uq_retrospective_participants_retro_user): one entry, and one invite, per user
+        members = list({member.user_id: member for member in members}.values())
+        
+        if members:
+            db.execute(insert(RetrospectiveParticipant), [
+                {"retrospective_id": new_retro.id, "user_id": member.user_id}
+                for member in members
+            ])
+            # Bulk inserts bypass ORM events; refresh these members' dashboards on commit
+            dashboard_projection.participants_changed(db, [member.user_id for member in members])
+        
+        # Queue calendar invites in the outbox within the same transaction; the outbox
+        # worker delivers them, so creation never waits on SMTP.
+        queued_invites = 0
+        try:
+            with db.begin_nested():
+                # Get workspace details
+                workspace = db.query(Workspace).filter(Workspace.id == retro_data.workspace_id).first()
+                workspace_name = workspace.name if workspace else "Workspace"
+                
+                # Generate .ics calendar file
+                calendar_service = CalendarService()
+                print(f"🔧 Generating calendar for retrospective: {new_retro.title}")
+                print(f"   Start time: {new_retro.scheduled_start_time}")
+                print(f"   End time: {new_retro.scheduled_end_time}")
+                
+                ics_content = calendar_service.generate_retrospective_calendar(
+                    retrospective_id=new_retro.id,
+                    title=new_retro.title,
+                    sprint_name=new_retro.sprint_name or "Sprint",
+                    start_time=new_retro.scheduled_start_time,
+                    end_time=new_retro.scheduled_end_time,
+                    workspace_name=workspace_name,
+                    facilitator_name=current_user.full_name
+                )
+                
+                print(f"✅ Generated iCal content: {len(ics_content)} bytes")
+                if b'\x00' in ics_content:
+                    print("⚠️ iCal content contains null bytes!")
+                
+                email_service = EmailService()
+                # Include retrospective code in link so members can access the specific retrospective
+                retro_link = f"{settings.APP_URL}/retrospective/{new_retro.code}"
+                
+                # Shared body and attachment are rendered/encoded once; only the name varies per member
+                invite_template = email_service.calendar_invite_template(
+                    retrospective_title=new_retro.title,
+                    sprint_name=new_retro.sprint_name or "Sprint",
+                    start_time=new_retro.scheduled_start_time,
+                    end_time=new_retro.scheduled_end_time,
+                    workspace_name=workspace_name,
+                    facilitator_name=current_user.full_name,
+                    retro_link=retro_link
+                )
+                invite_attachments = email_service.encode_attachments(
+                    [('retrospective.ics', ics_content, 'text/calendar')]
+                )
+                
+                outbox_rows = []
+                for member in members:
+                    if member.email:
+                        subject, html_content = invite_template.render(full_name=member.full_name)
+                        outbox_rows.append(email_service.outbox_row(
+                            to_email=member.email,
+                            subject=subject,
+                            html_content=html_content,
+                            encoded_attachments=invite_attachments,
+                            kind="calendar_invite",
+                            retrospective_id=new_retro.id
+                        ))
+                queued_invites = email_service.enqueue_emails(db, outbox_rows)
+        except Exception as email_error:
+            # Don't fail retrospective creation if invites can't be prepared
+            queued_invites = 0
+            print(f"Failed to queue calendar invites: {email_error}")
         
         db.commit()
         db.refresh(new_retro)
         
-        # Generate calendar invites for all participants
-        try:
-            # Get workspace details
-            workspace = db.query(Workspace).filter(Workspace.id == retro_data.workspace_id).first()
-            
-            # Generate .ics calendar file
-            calendar_service = CalendarService()
-            print(f"🔧 Generating calendar for retrospective: {new_retro.title}")
-            print(f"   Start time: {new_retro.scheduled_start_time}")
-            print(f"   End time: {new_retro.scheduled_end_time}")
-            
-            ics_content = calendar_service.generate_retrospective_calendar(
-                retrospective_id=new_retro.id,
-                title=new_retro.title,
-                sprint_name=new_retro.sprint_name or "Sprint",
-                start_time=new_retro.scheduled_start_time,
-                end_time=new_retro.scheduled_end_time,
-                workspace_name=workspace.name if workspace else "Workspace",
-                facilitator_name=current_user.full_name
-            )
-            
-            print(f"✅ Generated iCal content: {len(ics_content)} bytes")
-            if b'\x00' in ics_content:
-                print("⚠️ iCal content contains null bytes!")
-            
-            # Send calendar invites to all participants
-            email_service = EmailService()
-            # Include retrospective code in link so members can access the specific retrospective
-            retro_link = f"{settings.APP_URL}/retrospective/{new_retro.code}"
-            
-            for member in members:
-                user = db.query(User).filter(User.id == member.user_id).first()
-                if user and user.email:
-                    email_service.send_calendar_invite_email(
-                        to_email=user.email,
-                        full_name=user.full_name,
-                        retrospective_title=new_retro.title,
-                        sprint_name=new_retro.sprint_name or "Sprint",
-                        start_time=new_retro.scheduled_start_time,
-                        end_time=new_retro.scheduled_end_time,
-                        workspace_name=workspace.name if workspace else "Workspace",
-                        facilitator_name=current_user.full_name,
-                        ics_content=ics_content,
-                        retro_link=retro_link
-                    )
-        except Exception as email_error:
-            # Don't fail retrospective creation if email fails
-            print(f"Failed to send calendar invites: {email_error}")
+        if queued_invites:
+            print(f"📧 Queued {queued_invites} calendar invites")
+            background_tasks.add_task(deliver_pending_emails)
         
         return RetrospectiveResponse(
             id=new_retro.id,
@@ -236,68 +278,57 @@ async def create_retrospective(
 
 
 @router.get("/", response_model=List[RetrospectiveResponse])
-async def get_retrospectives(
+def get_retrospectives(
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
-    workspace_id: Optional[int] = None
+    workspace_id: Optional[int] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,title,status")
 ):
     """
-    Get all retrospectives for the current user
-    If workspace_id is provided, filter to that workspace
+    Get retrospectives the current user participates in, newest first (keyset paginated)
+    Only workspaces the user is still an active member of; if workspace_id is provided, filter to that workspace
     """
     try:
-        # Get workspaces the user is a member of
-        user_workspaces = db.query(WorkspaceMember).filter(
+        columns = parse_fields(fields, RETRO_LIST_FIELDS)
+        
+        active_workspaces = db.query(WorkspaceMember.workspace_id).filter(
             WorkspaceMember.user_id == current_user.id,
             WorkspaceMember.is_active == True
-        ).all()
-        
-        workspace_ids = [w.workspace_id for w in user_workspaces]
-        
-        if not workspace_ids:
-            return []
+        )
         
-        # Build query
-        query = db.query(Retrospective).filter(
-            Retrospective.workspace_id.in_(workspace_ids)
+        # Projection of the listed columns only (no JSON settings/summary blobs)
+        query = db.query(*[getattr(Retrospective, c) for c in columns]).join(
+            RetrospectiveParticipant,
+            RetrospectiveParticipant.retrospective_id == Retrospective.id
+        ).filter(
+            RetrospectiveParticipant.user_id == current_user.id,
+            Retrospective.workspace_id.in_(active_workspaces)
         )
         
         # Filter by workspace if specified
         if workspace_id:
             query = query.filter(Retrospective.workspace_id == workspace_id)
         
-        # Get retrospectives where user is participant
-        retrospectives = db.query(Retrospective).join(
-            RetrospectiveParticipant,
-            RetrospectiveParticipant.retrospective_id == Retrospective.id
-        ).filter(
-            RetrospectiveParticipant.user_id == current_user.id
-        ).order_by(Retrospective.created_at.desc()).all()
+        rows = paginate_ids(query, Retrospective.id, limit, cursor).all()
+        rows, next_cursor = page_rows(rows, limit, response)
         
-        return [RetrospectiveResponse(
-            id=r.id,
-            workspace_id=r.workspace_id,
-            code=r.code,
-            title=r.title,
-            description=r.description,
-            sprint_name=r.sprint_name,
-            facilitator_id=r.facilitator_id,
-            scheduled_start_time=r.scheduled_start_time,
-            scheduled_end_time=r.scheduled_end_time,
-            actual_start_time=r.actual_start_time,
-            actual_end_time=r.actual_end_time,
-            status=r.status,
-            current_phase=r.current_phase,
-            created_at=r.created_at
-        ) for r in retrospectives]
+        if fields:
+            headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+            return JSONResponse(jsonable_encoder(project(rows, columns)), headers=headers)
+        return [RetrospectiveResponse.model_validate(r) for r in rows]
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Get retrospectives error: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch retrospectives: {str(e)}")
 
 
 @router.get("/workspace/{workspace_id}", response_model=List[RetrospectiveResponse])
-async def get_workspace_retrospectives(
+def get_workspace_retrospectives(
     workspace_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -346,7 +377,7 @@ async def get_workspace_retrospectives(
 
 
 @router.get("/code/{code}", response_model=RetrospectiveResponse)
-async def get_retrospective_by_code(
+def get_retrospective_by_code(
     code: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -394,7 +425,7 @@ async def get_retrospective_by_code(
 
 
 @router.get("/{retro_id}", response_model=RetrospectiveResponse)
-async def get_retrospective(
+def get_retrospective(
     retro_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -403,19 +434,8 @@ async def get_retrospective(
     Get specific retrospective details
     """
     try:
-        retro = db.query(Retrospective).filter(Retrospective.id == retro_id).first()
-        
-        if not retro:
-            raise HTTPException(status_code=404, detail="Retrospective not found")
-        
-        # Verify user is participant
-        participant = db.query(RetrospectiveParticipant).filter(
-            RetrospectiveParticipant.retrospective_id == retro_id,
-            RetrospectiveParticipant.user_id == current_user.id
-        ).first()
-        
-        if not participant:
-            raise HTTPException(status_code=403, detail="You are not a participant in this retrospective")
+        # Retrospective and the user's participant row in one query
+        retro, participant = load_participant_context(db, retro_id, current_user)
         
         return RetrospectiveResponse(
             id=retro.id,
@@ -442,8 +462,9 @@ async def get_retrospective(
 
 
 @router.get("/{retro_id}/calendar")
-async def download_calendar(
+def download_calendar(
     retro_id: int,
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -451,35 +472,27 @@ async def download_calendar(
     Download .ics calendar file for retrospective
     """
     try:
-        retro = db.query(Retrospective).filter(Retrospective.id == retro_id).first()
+        # Retrospective and the user's participant row in one query
+        retro, participant = load_participant_context(db, retro_id, current_user)
         
-        if not retro:
-            raise HTTPException(status_code=404, detail="Retrospective not found")
-        
-        # Verify user is participant
-        participant = db.query(RetrospectiveParticipant).filter(
-            RetrospectiveParticipant.retrospective_id == retro_id,
-            RetrospectiveParticipant.user_id == current_user.id
-        ).first()
-        
-        if not participant:
-            raise HTTPException(status_code=403, detail="You are not a participant in this retrospective")
-        
-        # Get workspace and facilitator details
-        workspace = db.query(Workspace).filter(Workspace.id == retro.workspace_id).first()
-        facilitator = db.query(User).filter(User.id == retro.facilitator_id).first()
-        
-        # Generate calendar file
         calendar_service = CalendarService()
-        ics_content = calendar_service.generate_retrospective_calendar(
-            retrospective_id=retro.id,
-            title=retro.title,
-            sprint_name=retro.sprint_name or "Sprint",
-            start_time=retro.scheduled_start_time,
-            end_time=retro.scheduled_end_time,
-            workspace_name=workspace.name if workspace else "Workspace",
-            facilitator_name=facilitator.full_name if facilitator else "Facilitator"
-        )
+        ics_content = calendar_service.cached_retrospective_calendar(retro)
+        if ics_content is None:
+            # Get workspace and facilitator details
+            workspace = db.query(Workspace).filter(Workspace.id == retro.workspace_id).first()
+            facilitator = db.query(User).filter(User.id == retro.facilitator_id).first()
+            
+            # Generate calendar file (cached until the retrospective is updated)
+            ics_content = calendar_service.get_retrospective_calendar(
+                retro,
+                workspace_name=workspace.name if workspace else "Workspace",
+                facilitator_name=facilitator.full_name if facilitator else "Facilitator"
+            )
+        
+        etag = calendar_service.calendar_etag(ics_content)
+        cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=cache_headers)
         
         # Return as downloadable file
         filename = f"retrospective_{retro.id}.ics"
@@ -487,7 +500,8 @@ async def download_calendar(
             content=ics_content,
             media_type="text/calendar",
             headers={
-                "Content-Disposition": f"attachment; filename={filename}"
+                "Content-Disposition": f"attachment; filename={filename}",
+                **cache_headers
             }
         )
         
@@ -499,7 +513,7 @@ async def download_calendar(
 
 
 @router.get("/{retro_id}/participants", response_model=List[ParticipantResponse])
-async def get_participants(
+def get_participants(
     retro_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -546,7 +560,7 @@ async def get_participants(
 
 
 @router.get("/{retro_id}/status")
-async def get_retrospective_status(
+def get_retrospective_status(
     retro_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -555,19 +569,8 @@ async def get_retrospective_status(
     Get retrospective status with current phase and participants
     """
     try:
-        retro = db.query(Retrospective).filter(Retrospective.id == retro_id).first()
-        
-        if not retro:
-            raise HTTPException(status_code=404, detail="Retrospective not found")
-        
-        # Verify user is participant
-        participant = db.query(RetrospectiveParticipant).filter(
-            RetrospectiveParticipant.retrospective_id == retro_id,
-            RetrospectiveParticipant.user_id == current_user.id
-        ).first()
-        
-        if not participant:
-            raise HTTPException(status_code=403, detail="You are not a participant in this retrospective")
+        # Retrospective and the user's participant row in one query
+        retro, participant = load_participant_context(db, retro_id, current_user)
         
         # Get all participants
         participants = db.query(RetrospectiveParticipant, User).join(
@@ -604,7 +607,7 @@ async def get_retrospective_status(
 
 
 @router.post("/{retro_id}/start")
-async def start_retrospective(
+def start_retrospective(
     retro_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -643,73 +646,113 @@ async def start_retrospective(
         raise HTTPException(status_code=500, detail=f"Failed to start retrospective: {str(e)}")
 
 
+def _split_active(rows, now_utc: datetime):
+    """(upcoming, in_progress); scheduled retros whose start time has passed count as in progress."""
+    upcoming, in_progress = [], []
+    for retro in rows:
+        status = retro["status"] if isinstance(retro, dict) else retro.status
+        start = retro["scheduled_start_time"] if isinstance(retro, dict) else retro.scheduled_start_time
+        if status == 'in_progress':
+            in_progress.append(retro)
+        elif status == 'scheduled':
+            if start and start <= now_utc:
+                in_progress.append(retro)
+            else:
+                upcoming.append(retro)
+    return upcoming, in_progress
+
+
 @router.get("/user/dashboard")
-async def get_user_dashboard_retrospectives(
+def get_user_dashboard_retrospectives(
+    request: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    completed_limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    completed_cursor: Optional[str] = Query(None, description="completed_next_cursor from the previous response")
 ):
     """
     Get user's retrospectives grouped by status for dashboard
-    Returns: upcoming (scheduled), in_progress, completed
+    Returns: upcoming (scheduled), in_progress, completed (newest first, paged via completed_next_cursor)
+    and counts. The first page is served from the per-user projection with an ETag, so polls
+    sending If-None-Match get a 304 without touching the database.
     """
     try:
-        # Get all retrospectives where user is participant
-        retrospectives = db.query(Retrospective).join(
-            RetrospectiveParticipant,
-            RetrospectiveParticipant.retrospective_id == Retrospective.id
-        ).filter(
-            RetrospectiveParticipant.user_id == current_user.id
-        ).order_by(Retrospective.scheduled_start_time.desc()).all()
-        
-        now_utc = datetime.now(timezone.utc)
-        
-        # Group by status
-        upcoming = []
-        in_progress = []
-        completed = []
-        
-        for retro in retrospectives:
-            retro_data = RetrospectiveResponse(
-                id=retro.id,
-                workspace_id=retro.workspace_id,
-                code=retro.code,
-                title=retro.title,
-                description=retro.description,
-                sprint_name=retro.sprint_name,
-                facilitator_id=retro.facilitator_id,
-                scheduled_start_time=retro.scheduled_start_time,
-                scheduled_end_time=retro.scheduled_end_time,
-                actual_start_time=retro.actual_start_time,
-                actual_end_time=retro.actual_end_time,
-                status=retro.status,
-                current_phase=retro.current_phase,
-                created_at=retro.created_at
-            )
-            
-            if retro.status == 'completed':
-                completed.append(retro_data)
-            elif retro.status == 'in_progress':
-                in_progress.append(retro_data)
-            elif retro.status == 'scheduled':
-                # Check if scheduled time has passed
-                if retro.scheduled_start_time and retro.scheduled_start_time <= now_utc:
-                    in_progress.append(retro_data)
-                else:
-                    upcoming.append(retro_data)
-        
-        return {
-            "upcoming": upcoming,
-            "in_progress": in_progress,
-            "completed": completed
-        }
+        if completed_cursor or completed_limit > settings.DASHBOARD_COMPLETED_LIMIT:
+            return _query_dashboard(db, current_user.id, completed_limit, completed_cursor)
+        
+        view = dashboard_projection.get_dashboard(db, current_user.id, RETRO_LIST_FIELDS)
+        upcoming, in_progress = _split_active(view.active, datetime.now(timezone.utc))
+        
+        # Bucketing only changes with the version or as scheduled retros come due
+        key = (view.version, completed_limit, len(in_progress))
+        rendered = view.rendered.get(key)
+        if rendered is None:
+            completed = view.completed[:completed_limit]
+            body = json.dumps(jsonable_encoder({
+                "upcoming": [RetrospectiveResponse.model_validate(r) for r in upcoming],
+                "in_progress": [RetrospectiveResponse.model_validate(r) for r in in_progress],
+                "completed": [RetrospectiveResponse.model_validate(r) for r in completed],
+                "completed_next_cursor": (
+                    encode_cursor(completed[-1]["id"]) if view.completed_total > len(completed) else None
+                ),
+                "counts": {
+                    "upcoming": len(upcoming),
+                    "in_progress": len(in_progress),
+                    "completed": view.completed_total
+                }
+            })).encode()
+            rendered = view.rendered[key] = ('"%s"' % hashlib.sha1(body).hexdigest(), body)
+        
+        etag, body = rendered
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
         
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Get dashboard retrospectives error: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch dashboard data: {str(e)}")
 
 
+def _query_dashboard(db: Session, user_id: int, completed_limit: int, completed_cursor: Optional[str]):
+    """Dashboard straight from the database, for completed pages beyond the projection."""
+    # Projection of the listed columns only, for retrospectives where user is participant
+    base = db.query(*[getattr(Retrospective, c) for c in RETRO_LIST_FIELDS]).join(
+        RetrospectiveParticipant,
+        RetrospectiveParticipant.retrospective_id == Retrospective.id
+    ).filter(
+        RetrospectiveParticipant.user_id == user_id
+    )
+    
+    # Open retrospectives are few; the completed history grows forever, so only it is paged
+    active = base.filter(
+        Retrospective.status.in_(dashboard_projection.ACTIVE_STATUSES)
+    ).order_by(Retrospective.scheduled_start_time.desc()).all()
+    completed_rows = paginate_ids(
+        base.filter(Retrospective.status == "completed"), Retrospective.id, completed_limit, completed_cursor
+    ).all()
+    completed_rows, completed_next_cursor = page_rows(completed_rows, completed_limit)
+    completed_total = db.query(func.count(RetrospectiveParticipant.id)).join(
+        Retrospective, Retrospective.id == RetrospectiveParticipant.retrospective_id
+    ).filter(
+        RetrospectiveParticipant.user_id == user_id,
+        Retrospective.status == "completed"
+    ).scalar() or 0
+    
+    upcoming, in_progress = _split_active(active, datetime.now(timezone.utc))
+    return {
+        "upcoming": [RetrospectiveResponse.model_validate(r) for r in upcoming],
+        "in_progress": [RetrospectiveResponse.model_validate(r) for r in in_progress],
+        "completed": [RetrospectiveResponse.model_validate(r) for r in completed_rows],
+        "completed_next_cursor": completed_next_cursor,
+        "counts": {"upcoming": len(upcoming), "in_progress": len(in_progress), "completed": completed_total}
+    }
+
+
 @router.post("/{retro_id}/complete-chat-sessions")
-async def complete_chat_sessions(
+def complete_chat_sessions(
     retro_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -754,7 +797,7 @@ async def complete_chat_sessions(
 
 
 @router.post("/{retro_id}/advance-phase")
-async def advance_phase(
+def advance_phase(
     retro_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -2,11 +2,14 @@
 Retrospective scheduling and automation API routes
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Header, Query
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.database.database import get_db
 from app.services.automation_service import AutomationService
-from app.api.dependencies.auth import get_current_user
+from app.services.reminder_dispatcher import run_tick
+from app.services.report_rollup import run_nightly_rollup
+from app.api.dependencies.auth import get_current_user, require_bearer_secret
 from app.models.user import User
 from app.models.onboarding import ScheduledRetrospective
 from pydantic import BaseModel
@@ -36,7 +39,7 @@ class PreparationQuestionResponse(BaseModel):
 
 
 @router.post("/schedule", response_model=Dict)
-async def schedule_retrospective(
+def schedule_retrospective(
     request: ScheduleRetrospectiveRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -77,7 +80,7 @@ async def schedule_retrospective(
 
 
 @router.post("/{scheduled_retro_id}/send-preparation", response_model=Dict)
-async def send_preparation_prompts(
+def send_preparation_prompts(
     scheduled_retro_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -101,7 +104,7 @@ async def send_preparation_prompts(
 
 
 @router.post("/{scheduled_retro_id}/start", response_model=Dict)
-async def start_scheduled_retrospective(
+def start_scheduled_retrospective(
     scheduled_retro_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -127,7 +130,7 @@ async def start_scheduled_retrospective(
 
 
 @router.post("/retrospectives/{retrospective_id}/complete", response_model=Dict)
-async def complete_retrospective(
+def complete_retrospective(
     retrospective_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -153,7 +156,7 @@ async def complete_retrospective(
 
 
 @router.get("/scheduled", response_model=List[Dict])
-async def get_scheduled_retrospectives(
+def get_scheduled_retrospectives(
     team_id: Optional[int] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -183,8 +186,9 @@ async def get_scheduled_retrospectives(
 
 
 @router.get("/team/{team_id}/monthly-report", response_model=Dict)
-async def get_monthly_report(
+def get_monthly_report(
     team_id: int,
+    weeks: int = Query(4, ge=1, le=104, description="Trend window in ISO weeks, current week included"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -196,10 +200,41 @@ async def get_monthly_report(
         report = AutomationService.generate_monthly_report(
             db, 
             team_id, 
-            current_user.id
+            current_user.id,
+            weeks=weeks
         )
         
         return report
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+
+
+@router.api_route("/tick", methods=["GET", "POST"], response_model=Dict)
+def scheduler_tick(authorization: Optional[str] = Header(None)):
+    """
+    Cron entry point for serverless deployments (the Vercel cron in vercel.json, every 5 minutes).
+    Dispatches due reminders and delivers queued email within REMINDER_TICK_MAX_SECONDS.
+    Requires "Authorization: Bearer <CRON_SECRET>".
+    Plain def: FastAPI runs it in the threadpool, so SMTP I/O doesn't block the event loop.
+    """
+    require_bearer_secret(authorization, settings.CRON_SECRET, "CRON_SECRET")
+    
+    try:
+        return run_tick()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Scheduler tick failed: {str(e)}")
+
+
+@router.api_route("/rollup", methods=["GET", "POST"], response_model=Dict)
+def report_rollup(authorization: Optional[str] = Header(None)):
+    """
+    Nightly cron entry point: refresh the weekly report rollup for every workspace.
+    Requires "Authorization: Bearer <CRON_SECRET>".
+    """
+    require_bearer_secret(authorization, settings.CRON_SECRET, "CRON_SECRET")
+    
+    try:
+        return run_nightly_rollup()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Report rollup failed: {str(e)}")
@@ -2,15 +2,17 @@
 User authentication routes - Email/Password authentication with database storage
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import func
 from app.database.database import get_db
 from app.models.user import User
 from app.models.email_verification import EmailVerificationToken
 from app.services.email_service import email_service
+from app.services.email_outbox_worker import deliver_pending_emails
+from app.services import password_hashing
+from app.services.password_hashing import PasswordHashingBusy
 from pydantic import BaseModel, EmailStr
-import bcrypt
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
 from datetime import timezone
@@ -59,28 +61,27 @@ class RegistrationResponse(BaseModel):
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify password using bcrypt"""
-    try:
-        password_bytes = plain_password.encode('utf-8')
-        hashed_bytes = hashed_password.encode('utf-8')
-        return bcrypt.checkpw(password_bytes, hashed_bytes)
-    except Exception as e:
-        print(f"Password verification error: {e}")
-        return False
+    """Verify password using bcrypt (blocking, in the caller's thread)"""
+    return password_hashing.verify_password(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    """Hash password using bcrypt"""
+    """Hash password using bcrypt (blocking, in the caller's thread)"""
     try:
-        password_bytes = password.encode('utf-8')
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(password_bytes, salt)
-        return hashed.decode('utf-8')
+        return password_hashing.hash_password(password)
     except Exception as e:
         print(f"Password hashing error: {e}")
         raise
 
 
+def _hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Too many sign-in requests right now, please retry in a moment",
+        headers={"Retry-After": "1"}
+    )
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create JWT access token"""
     to_encode = data.copy()
@@ -89,14 +90,15 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": datetime.utcnow()})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
 @router.post("/register", response_model=RegistrationResponse)
-async def register(
+def register(
     user_data: UserRegister,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
@@ -120,8 +122,11 @@ async def register(
             username = f"{base_username}{counter}"
             counter += 1
         
-        # Hash password
-        hashed_password = get_password_hash(user_data.password)
+        # Hash password (in the bounded hashing pool)
+        try:
+            hashed_password = password_hashing.hash_password_pooled(user_data.password)
+        except PasswordHashingBusy:
+            raise _hashing_busy()
         
         # Create user (not verified yet)
         new_user = User(
@@ -134,8 +139,7 @@ async def register(
         )
         
         db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        db.flush()
         
         # Generate verification token
         from app.services.email_service import EmailService
@@ -151,24 +155,29 @@ async def register(
             expires_at=datetime.now(timezone.utc) + timedelta(days=1)  # 24 hours
         )
         db.add(token_record)
-        db.commit()
         
         # Generate verification link
         base_url = settings.APP_URL
         verification_link = f"{base_url}/api/v1/user-auth/verify-email?token={verification_token}"
         
-        # Send verification email
-        email_sent = email_service.send_verification_email(
-            to_email=new_user.email,
+        # Queue the verification email with the user (one transaction); the outbox worker
+        # delivers it, so registration never waits on SMTP
+        subject, html_content, text_content = email_service.render_verification_email(
             verification_link=verification_link,
             full_name=new_user.full_name
         )
+        email_service.enqueue_email(
+            db,
+            to_email=new_user.email,
+            subject=subject,
+            html_content=html_content,
+            text_content=text_content,
+            kind="email_verification"
+        )
+        db.commit()
         
-        if email_sent:
-            print(f"✅ Verification email sent to: {new_user.email}")
-        else:
-            print(f"⚠️ Failed to send verification email. Token: {verification_link}")
-            print(f"Verification link (check console): {verification_link}")
+        print(f"📧 Queued verification email for: {new_user.email}")
+        background_tasks.add_task(deliver_pending_emails)
         
         # Return success response indicating email verification required
         return RegistrationResponse(
@@ -185,7 +194,7 @@ async def register(
 
 
 @router.post("/login", response_model=TokenResponse)
-async def login(
+def login(
     credentials: UserLogin,
     db: Session = Depends(get_db)
 ):
@@ -203,8 +212,12 @@ async def login(
                 detail="Invalid email or password"
             )
         
-        # Verify password
-        if not verify_password(credentials.password, user.hashed_password):
+        # Verify password (in the bounded hashing pool)
+        try:
+            password_ok = password_hashing.verify_password_pooled(credentials.password, user.hashed_password)
+        except PasswordHashingBusy:
+            raise _hashing_busy()
+        if not password_ok:
             raise HTTPException(
                 status_code=401,
                 detail="Invalid email or password"
@@ -223,6 +236,13 @@ async def login(
                 detail="Please verify your email address before logging in. Check your inbox for the verification email."
             )
         
+        # Upgrade hashes made with a different BCRYPT_ROUNDS while we have the plain password
+        if password_hashing.needs_rehash(user.hashed_password):
+            try:
+                user.hashed_password = password_hashing.hash_password_pooled(credentials.password)
+            except PasswordHashingBusy:
+                pass  # try again on a later login
+        
         # Update last login
         user.last_login_at = datetime.now(timezone.utc)
         db.commit()
@@ -254,7 +274,7 @@ async def login(
 
 
 @router.post("/demo-login", response_model=TokenResponse)
-async def demo_login(db: Session = Depends(get_db)):
+def demo_login(db: Session = Depends(get_db)):
     """
     Create or login as demo user
     """
@@ -267,7 +287,7 @@ async def demo_login(db: Session = Depends(get_db)):
             email="demo@yodaai.com",
             username="demo_user",
             full_name="Demo User",
-            hashed_password=get_password_hash("demo123"),
+            hashed_password=password_hashing.hash_password_pooled("demo123"),
             email_verified=True,  # Auto-verify demo user
             is_active=True,
             default_role="facilitator",
@@ -299,7 +319,7 @@ async def demo_login(db: Session = Depends(get_db)):
 
 
 @router.get("/verify-email")
-async def verify_email(
+def verify_email(
     token: str,
     db: Session = Depends(get_db)
 ):
@@ -374,7 +394,7 @@ async def verify_email(
 
 
 @router.get("/verify-token")
-async def verify_token(
+def verify_token(
     token: str,
     db: Session = Depends(get_db)
 ):
@@ -22,7 +22,7 @@ class UserProfileUpdate(BaseModel):
 
 
 @router.get("/lookup")
-async def lookup_user(
+def lookup_user(
     email: str = Query(..., description="Email address to lookup"),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user),
@@ -53,7 +53,7 @@ async def lookup_user(
 
 
 @router.get("/me")
-async def get_current_user_profile(
+def get_current_user_profile(
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user),
 ):
@@ -72,7 +72,7 @@ async def get_current_user_profile(
 
 
 @router.put("/me/profile")
-async def update_user_profile(
+def update_user_profile(
     profile_data: UserProfileUpdate,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user),
@@ -16,6 +16,8 @@ from app.models.retrospective_new import (
 )
 from app.models.user import User
 from app.api.dependencies.auth import get_current_user
+from app.api.dependencies.permissions import load_participant_context
+from app.services.summary_snapshot import write_summary_snapshot
 
 router = APIRouter(prefix="/api/v1/voting", tags=["voting"])
 
@@ -59,7 +61,7 @@ class VotingStatus(BaseModel):
 # ============================================================================
 
 @router.post("/{retro_id}/start")
-async def start_voting(
+def start_voting(
     retro_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -111,7 +113,7 @@ async def start_voting(
 
 
 @router.get("/{retro_id}/status")
-async def get_voting_status(
+def get_voting_status(
     retro_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -120,18 +122,8 @@ async def get_voting_status(
     Get current voting status
     """
     try:
-        # Verify participant
-        participant = db.query(RetrospectiveParticipant).filter(
-            RetrospectiveParticipant.retrospective_id == retro_id,
-            RetrospectiveParticipant.user_id == current_user.id
-        ).first()
-        
-        if not participant:
-            raise HTTPException(status_code=403, detail="Not a participant")
-        
-        retro = db.query(Retrospective).filter(Retrospective.id == retro_id).first()
-        if not retro:
-            raise HTTPException(status_code=404, detail="Retrospective not found")
+        # Verify participant (retrospective and participant row in one query)
+        retro, participant = load_participant_context(db, retro_id, current_user, "Not a participant")
         
         # Get voting session
         session = db.query(VotingSession).filter(
@@ -227,7 +219,7 @@ async def get_voting_status(
 
 
 @router.post("/{retro_id}/vote")
-async def cast_vote(
+def cast_vote(
     retro_id: int,
     vote_req: VoteRequest,
     current_user: User = Depends(get_current_user),
@@ -321,7 +313,7 @@ async def cast_vote(
 
 
 @router.post("/{retro_id}/submit-votes")
-async def submit_votes_batch(
+def submit_votes_batch(
     retro_id: int,
     batch_req: BatchVoteRequest,
     current_user: User = Depends(get_current_user),
@@ -379,13 +371,17 @@ async def submit_votes_batch(
             VoteAllocation.user_id == current_user.id
         ).delete()
         
-        # Create new vote allocations
+        # Create new vote allocations (one row per theme; repeated themes are summed)
+        votes_by_theme = {}
         for alloc in batch_req.allocations:
+            votes_by_theme[alloc.theme_group_id] = votes_by_theme.get(alloc.theme_group_id, 0) + alloc.votes
+        
+        for theme_group_id, votes in votes_by_theme.items():
             new_vote = VoteAllocation(
                 voting_session_id=session.id,
-                theme_group_id=alloc.theme_group_id,
+                theme_group_id=theme_group_id,
                 user_id=current_user.id,
-                votes_allocated=alloc.votes
+                votes_allocated=votes
             )
             db.add(new_vote)
         
@@ -410,7 +406,7 @@ async def submit_votes_batch(
 
 
 @router.post("/{retro_id}/finalize")
-async def finalize_voting(
+def finalize_voting(
     retro_id: int,
     payload: Optional[dict] = Body(None),
     current_user: User = Depends(get_current_user),
@@ -506,6 +502,9 @@ async def finalize_voting(
         for p in participants:
             p.completed_voting = True
         
+        # Freeze the tallies so the summary endpoint doesn't re-aggregate votes
+        write_summary_snapshot(db, retro, session)
+        
         db.commit()
         
         return {
@@ -27,7 +27,7 @@ router = APIRouter(prefix="/api/v1", tags=["workspace-documents"])
 
 
 @router.post("/workspaces/{workspace_id}/documents/upload")
-async def upload_workspace_document(
+def upload_workspace_document(
     workspace_id: int,
     background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
@@ -43,7 +43,8 @@ async def upload_workspace_document(
     if not workspace:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Workspace not found")
 
-    content_bytes = await file.read()
+    # Plain def: text extraction and the DB work run in the threadpool, not on the event loop
+    content_bytes = file.file.read()
     filename_lower = (file.filename or "").lower()
     ctype = (file.content_type or "").lower()
 
@@ -104,7 +105,7 @@ async def upload_workspace_document(
     # Background index into Chroma (workspace-scoped)
     def _index_doc(wid: int, did: str, dhash: str, fname: str, uploaded_at_iso: str, txt: str) -> None:
         try:
-            ai = AIClient()
+            ai = AIClient(workspace_id=wid)
             store = ChromaStore()
             store.upsert_text_document(
                 ai=ai,
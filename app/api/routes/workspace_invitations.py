@@ -5,12 +5,13 @@ Workspace invitations API
 from datetime import datetime, timedelta, timezone
 import secrets
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel, EmailStr
 from sqlalchemy.orm import Session
 
 from app.database.database import get_db
 from app.api.dependencies.auth import get_current_user
+from app.api.dependencies.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, page_rows, paginate_ids
 from app.models.workspace import Workspace, WorkspaceMember
 from app.models.workspace import WorkspaceInvitation
 from app.models.user import User
@@ -33,7 +34,7 @@ def generate_invite_token() -> str:
 
 
 @router.post("/{workspace_id}/invitations")
-async def create_workspace_invitation(
+def create_workspace_invitation(
     workspace_id: int,
     payload: InvitationCreate,
     db: Session = Depends(get_db),
@@ -170,8 +171,48 @@ def _get_invitation_by_token(db: Session, token: str) -> WorkspaceInvitation | N
     return db.query(WorkspaceInvitation).filter(WorkspaceInvitation.token == token).first()
 
 
+# Declared before /{token} so "mine" is not captured as a token
+@token_router.get("/mine")
+def get_my_invitations(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None, description="X-Next-Cursor from the previous page"),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user),
+):
+    now = datetime.now(timezone.utc)
+    query = db.query(
+        WorkspaceInvitation.id,
+        WorkspaceInvitation.workspace_id,
+        WorkspaceInvitation.email,
+        WorkspaceInvitation.message,
+        WorkspaceInvitation.status,
+        WorkspaceInvitation.expires_at,
+        WorkspaceInvitation.token,
+    ).filter(
+        WorkspaceInvitation.email == current_user.email,
+        WorkspaceInvitation.accepted_at.is_(None),
+        WorkspaceInvitation.declined_at.is_(None),
+    )
+    invitations, _ = page_rows(paginate_ids(query, WorkspaceInvitation.id, limit, cursor).all(), limit, response)
+    result = []
+    for inv in invitations:
+        status = inv.status
+        if inv.expires_at <= now and status != "expired":
+            status = "expired"
+        result.append({
+            "workspace_id": inv.workspace_id,
+            "email": inv.email,
+            "message": inv.message,
+            "status": status,
+            "expires_at": inv.expires_at,
+            "token": inv.token,
+        })
+    return result
+
+
 @token_router.get("/{token}")
-async def get_invitation_status(token: str, db: Session = Depends(get_db)):
+def get_invitation_status(token: str, db: Session = Depends(get_db)):
     inv = _get_invitation_by_token(db, token)
     if not inv:
         raise HTTPException(status_code=404, detail="Invitation not found")
@@ -191,36 +232,8 @@ async def get_invitation_status(token: str, db: Session = Depends(get_db)):
     }
 
 
-@token_router.get("/mine")
-async def get_my_invitations(db: Session = Depends(get_db), current_user = Depends(get_current_user)):
-    now = datetime.now(timezone.utc)
-    invitations = (
-        db.query(WorkspaceInvitation)
-        .filter(
-            WorkspaceInvitation.email == current_user.email,
-            WorkspaceInvitation.accepted_at.is_(None),
-            WorkspaceInvitation.declined_at.is_(None),
-        )
-        .all()
-    )
-    result = []
-    for inv in invitations:
-        status = inv.status
-        if inv.expires_at <= now and status != "expired":
-            status = "expired"
-        result.append({
-            "workspace_id": inv.workspace_id,
-            "email": inv.email,
-            "message": inv.message,
-            "status": status,
-            "expires_at": inv.expires_at,
-            "token": inv.token,
-        })
-    return result
-
-
 @token_router.post("/accept")
-async def accept_invitation(body: InvitationToken, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+def accept_invitation(body: InvitationToken, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
     inv = _get_invitation_by_token(db, body.token)
     if not inv:
         raise HTTPException(status_code=404, detail="Invitation not found")
@@ -263,7 +276,7 @@ async def accept_invitation(body: InvitationToken, db: Session = Depends(get_db)
 
 
 @token_router.post("/decline")
-async def decline_invitation(body: InvitationToken, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
+def decline_invitation(body: InvitationToken, db: Session = Depends(get_db), current_user = Depends(get_current_user)):
     inv = _get_invitation_by_token(db, body.token)
     if not inv:
         raise HTTPException(status_code=404, detail="Invitation not found")
@@ -282,7 +295,7 @@ async def decline_invitation(body: InvitationToken, db: Session = Depends(get_db
 
 
 @router.get("/{workspace_id}/invitations/validate-email")
-async def validate_email_for_invitation(
+def validate_email_for_invitation(
     workspace_id: int,
     email: str,
     db: Session = Depends(get_db),
@@ -65,7 +65,7 @@ class MemberResponse(BaseModel):
 # ============================================================================
 
 @router.post("/", response_model=WorkspaceResponse)
-async def create_workspace(
+def create_workspace(
     workspace_data: WorkspaceCreate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -125,13 +125,16 @@ async def create_workspace(
 
 
 @router.post("/{workspace_id}/upload-pdf")
-async def upload_workspace_pdf(
+def upload_workspace_pdf(
     workspace_id: int,
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Upload a reference PDF for the workspace and store path in settings.reference_pdf."""
+    """
+    Upload a reference PDF for the workspace and store path in settings.reference_pdf.
+    Plain def: the file copy and the DB work run in the threadpool, not on the event loop.
+    """
     try:
         # Check membership
         membership = db.query(WorkspaceMember).filter(
@@ -148,16 +151,15 @@ async def upload_workspace_pdf(
             raise HTTPException(status_code=400, detail="Only PDF files are allowed")
 
         # Save file to disk under app/docs/uploads/workspaces/<id>/
-        import os
+        import shutil
         from pathlib import Path
 
         base_dir = Path("app/docs/uploads/workspaces") / str(workspace_id)
         base_dir.mkdir(parents=True, exist_ok=True)
         dest = base_dir / "reference.pdf"
 
-        contents = await file.read()
         with open(dest, 'wb') as f:
-            f.write(contents)
+            shutil.copyfileobj(file.file, f)
 
         # Update workspace settings JSON with reference_pdf path
         workspace = db.query(Workspace).filter(Workspace.id == workspace_id).first()
@@ -179,7 +181,7 @@ async def upload_workspace_pdf(
 
 
 @router.get("/", response_model=List[WorkspaceResponse])
-async def get_my_workspaces(
+def get_my_workspaces(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -231,7 +233,7 @@ async def get_my_workspaces(
 
 
 @router.get("/{workspace_id}", response_model=WorkspaceResponse)
-async def get_workspace(
+def get_workspace(
     workspace_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -283,7 +285,7 @@ async def get_workspace(
 # ============================================================================
 
 @router.get("/{workspace_id}/members", response_model=List[MemberResponse])
-async def get_workspace_members(
+def get_workspace_members(
     workspace_id: int,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -333,7 +335,7 @@ async def get_workspace_members(
 
 
 @router.post("/{workspace_id}/invite")
-async def invite_member(
+def invite_member(
     workspace_id: int,
     invite_data: InviteMember,
     background_tasks: BackgroundTasks,
@@ -416,7 +418,7 @@ async def invite_member(
 
 
 @router.post("/join/{token}")
-async def join_workspace_via_invite(
+def join_workspace_via_invite(
     token: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
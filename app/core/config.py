@@ -3,7 +3,7 @@ Application configuration settings
 """
 
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Dict, Optional
 import os
 from dotenv import load_dotenv
 
@@ -29,6 +29,10 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "test-secret-key-for-development"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 480  # 8 hours - enough for retrospective sessions
+    # Password hashing (app/services/password_hashing.py); hashes with another cost are upgraded on login
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: Optional[int] = None  # threads; default = CPU count
+    PASSWORD_HASH_MAX_PENDING: int = 64  # queued hash/verify calls before login/register answer 503
     
     # Firebase (optional)
     FIREBASE_PROJECT_ID: Optional[str] = os.getenv("FIREBASE_PROJECT_ID")
@@ -44,9 +48,58 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: Optional[str] = None
     SMTP_FROM_EMAIL: Optional[str] = "noreply@taistatInfo"
     SMTP_FROM_NAME: Optional[str] = "YodaAI"
+    SMTP_USE_TLS: bool = True  # STARTTLS when the server offers it; False for local test servers
+    SMTP_TIMEOUT_SECONDS: float = 30.0
+    
+    # Email outbox delivery worker (app/services/email_outbox_worker.py)
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 5
+    EMAIL_WORKER_POOL_SIZE: int = 4  # parallel SMTP connections, each reused for many messages
+    EMAIL_WORKER_BATCH_SIZE: int = 100
+    EMAIL_WORKER_POLL_SECONDS: float = 5.0
+    
+    # Reminder dispatcher (app/services/reminder_dispatcher.py)
+    REMINDER_DISPATCH_BATCH_SIZE: int = 500
+    REMINDER_DISPATCH_POLL_SECONDS: float = 30.0
+    REMINDER_TICK_MAX_SECONDS: float = 20.0  # time budget of one /scheduling/tick call (serverless)
+    # Required as "Authorization: Bearer <secret>" on /scheduling/tick and /rollup. Vercel sends
+    # it on the cron calls in vercel.json when set as an env var; other hosts need a scheduler
+    # calling /tick every few minutes (due reminders, outbox retries)
+    CRON_SECRET: Optional[str] = None
+    
+    # Team report rollup (app/services/report_rollup.py), refreshed nightly via /scheduling/rollup
+    REPORT_ROLLUP_RECOMPUTE_WEEKS: int = 8
+    
+    # Summary PDF export (app/services/summary_pdf.py)
+    PDF_RENDER_WORKERS: int = 2
+    PDF_RENDER_USE_PROCESSES: bool = False  # process pool instead of threads (not on serverless)
+    
+    # Auth/membership cache (app/services/auth_cache.py); 0 disables it
+    AUTH_CACHE_TTL_SECONDS: float = 30.0
+    AUTH_CACHE_MAX_ENTRIES: int = 4096
+    
+    # Per-user dashboard projection (app/services/dashboard_projection.py); 0 disables it
+    DASHBOARD_CACHE_TTL_SECONDS: float = 30.0
+    DASHBOARD_CACHE_MAX_USERS: int = 4096
+    DASHBOARD_COMPLETED_LIMIT: int = 50  # completed retros kept per user; deeper pages query the DB
+    
+    # Prometheus metrics at GET /metrics (app/core/metrics.py)
+    METRICS_ENABLED: bool = True
+    METRICS_TOKEN: Optional[str] = None  # required as "Authorization: Bearer <token>" when set, and always in production/serverless
+    
+    # SQL profiling (app/core/query_profiler.py)
+    SLOW_QUERY_LOG_MS: float = 500.0  # log statements at least this slow; 0 disables
+    QUERY_PROFILING_ENABLED: bool = False  # Server-Timing header + per-request query report
+    QUERY_PROFILE_TOP_N: int = 5  # slowest statements kept per request
+    QUERY_BUDGET_DEFAULT: Optional[int] = None  # max statements per request (profiling only)
+    QUERY_BUDGETS: Dict[str, int] = {}  # per route, e.g. {"GET /api/v1/voting/{retro_id}/status": 6}
+    QUERY_BUDGET_ENFORCE: bool = False  # answer 500 when over budget (tests/CI), instead of logging
     
     # Application
     DEBUG: bool = True
+    # Worker threads for sync route handlers (they hold a DB session each); Postgres pool is 10 + 20 overflow
+    API_THREADPOOL_SIZE: int = 30
+    # Cache-Control for the UI documents (/, /yodaai-app, /retrospective); see app/core/ui_assets.py
+    UI_HTML_CACHE_CONTROL: str = "no-cache"
     ENVIRONMENT: str = "development"
     APP_URL: str = "https://yoda-ai.vercel.app/"
     
@@ -62,10 +115,53 @@ class Settings(BaseSettings):
     AI_MODEL: str = "gpt-4"
     AI_EMBEDDING_MODEL: str = "text-embedding-3-small"
     AI_RAG_TOP_K: int = 8
+    # Model routing per endpoint_name (defaults in app/ai/model_routing.py); optional JSON overrides,
+    # e.g. {"fourls_chat.message": {"primary": "gpt-4o", "fallback": "gpt-4", "timeout_seconds": 10}}
+    AI_MODEL_ROUTES_JSON: Optional[str] = None
+    AI_REQUEST_TIMEOUT_SECONDS: float = 30.0
+    AI_FALLBACK_MIN_SECONDS: float = 3.0  # fallback model only tried with at least this much of the route deadline left
+    AI_EMBEDDING_TIMEOUT_SECONDS: float = 20.0
+    # Circuit breaker per model: opens when >= AI_CIRCUIT_FAILURE_RATE of the last AI_CIRCUIT_WINDOW
+    # calls (at least AI_CIRCUIT_MIN_CALLS) failed, and fails fast for AI_CIRCUIT_OPEN_SECONDS.
+    AI_CIRCUIT_WINDOW: int = 20
+    AI_CIRCUIT_MIN_CALLS: int = 5
+    AI_CIRCUIT_FAILURE_RATE: float = 0.5
+    AI_CIRCUIT_OPEN_SECONDS: float = 30.0
 
     # AI Monitoring / Guardrails
     AI_TOKEN_SPIKE_THRESHOLD: int = 8000
     AI_MAX_OUTPUT_TOKENS: int = 2000
+    # Prompt budgets (estimated prompt tokens). Endpoint defaults live in app/ai/prompt_builder.py;
+    # optional JSON overrides, e.g. {"grouping.generate": 7000}.
+    AI_PROMPT_TOKEN_BUDGET: int = 6000
+    AI_PROMPT_BUDGETS_JSON: Optional[str] = None
+    # Rolling chat context: messages kept verbatim, and how many extra accumulate before folding into the summary
+    AI_CHAT_WINDOW_MESSAGES: int = 8
+    AI_CHAT_SUMMARY_BATCH: int = 6
+
+    # AI usage ledger (app/ai/usage_ledger.py): rows buffered in memory, written in batches
+    AI_USAGE_LEDGER_ENABLED: bool = True
+    AI_USAGE_BATCH_SIZE: int = 200
+    AI_USAGE_FLUSH_SECONDS: float = 5.0
+    AI_USAGE_MAX_PENDING: int = 10000  # rows beyond this are dropped (and counted) while the DB is unreachable
+    # Also flush at the end of each request that left rows buffered; always on in serverless
+    # deployments, where the process may be frozen before the background thread runs
+    AI_USAGE_FLUSH_PER_REQUEST: bool = False
+    # USD per 1M tokens, overriding the defaults in usage_ledger.py, e.g. {"gpt-4o": [2.5, 10]}
+    AI_MODEL_PRICES_JSON: Optional[str] = None
+
+    # AI rate limits (app/api/dependencies/rate_limit.py): token buckets per user and per workspace.
+    # Endpoint defaults live there; optional JSON overrides, e.g.
+    # {"grouping.generate": {"user_per_minute": 4, "user_burst": 2, "workspace_per_minute": 20, "workspace_burst": 5}}
+    AI_RATE_LIMIT_ENABLED: bool = True
+    AI_RATE_LIMIT_BACKEND: str = "memory"  # "memory" (per process) or "database" (shared by all workers)
+    AI_RATE_LIMITS_JSON: Optional[str] = None
+    # Outstanding LLM calls per process (app/ai/concurrency.py); callers queue, then get 429 / a fallback
+    AI_MAX_CONCURRENT_CALLS: int = 16
+    AI_MAX_QUEUED_CALLS: int = 64
+    AI_QUEUE_TIMEOUT_SECONDS: float = 10.0
+
+    ADMIN_API_TOKEN: Optional[str] = None  # required as "Authorization: Bearer <token>" on /api/v1/admin/*
 
     # Chroma (optional retrieval settings)
     # If true, require Chroma Cloud credentials and do not fall back to local persistence.
@@ -0,0 +1,295 @@
+"""
+In-process metrics in the Prometheus text format, served at GET /metrics.
+
+- MetricsMiddleware: request count/latency per route template, requests in flight, and
+  the number and total time of SQL statements each request issued.
+- instrument_engine(): SQLAlchemy cursor events feeding the per-request DB figures and
+  process-wide statement counts.
+- Counter / Histogram: module-level metrics that other modules update (AI calls,
+  embeddings, Chroma queries); register_collector() adds values computed at scrape time
+  (email outbox depth, circuit breakers, auth cache).
+
+Values are per process; Prometheus aggregates across workers by instance.
+"""
+
+import bisect
+import heapq
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# (name, type, help, [(labels, value)]) produced at scrape time
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+_metrics: List["_Metric"] = []
+_collectors: List[Callable[[], Iterable[Family]]] = []
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(label, "")) for label in self.labels)
+
+    def _render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _render(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return [f"{self.name}{_format_labels(dict(zip(self.labels, key)))} {_format_value(v)}" for key, v in values]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def _render(self) -> List[str]:
+        with self._lock:
+            values = [(key, list(series)) for key, series in self._values.items()]
+        lines = []
+        for key, series in values:
+            labels = dict(zip(self.labels, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels({**labels, 'le': _format_value(bound)})} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+def register_collector(collector: Callable[[], Iterable[Family]]) -> None:
+    """Add a callable returning metric families computed at scrape time (gauges, external counters)."""
+    _collectors.append(collector)
+
+
+def render() -> str:
+    lines: List[str] = []
+    for metric in _metrics:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric._render())
+    for collector in _collectors:
+        try:
+            families = list(collector())
+        except Exception as e:
+            # A failing collector (e.g. DB down) must not take the whole scrape with it
+            logger.warning(f"⚠️ Metrics collector {getattr(collector, '__name__', collector)} failed: {e}")
+            continue
+        for name, kind, help, samples in families:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}" for labels, value in samples)
+    return "\n".join(lines) + "\n"
+
+
+# HTTP
+HTTP_REQUESTS = Counter("http_requests_total", "HTTP requests by route template and status", ("method", "route", "status"))
+HTTP_LATENCY = Histogram("http_request_duration_seconds", "HTTP request latency", ("method", "route"))
+HTTP_DB_QUERIES = Histogram(
+    "http_request_db_queries", "SQL statements issued per request", ("method", "route"), buckets=COUNT_BUCKETS
+)
+HTTP_DB_SECONDS = Histogram("http_request_db_seconds", "Time spent in SQL per request", ("method", "route"))
+_in_flight = 0
+_in_flight_lock = threading.Lock()
+
+# Database (all statements, including background work)
+DB_QUERIES = Counter("db_queries_total", "SQL statements executed")
+DB_QUERY_SECONDS = Histogram("db_query_duration_seconds", "SQL statement latency")
+
+# AI
+AI_LATENCY = Histogram("ai_request_duration_seconds", "OpenAI chat completion latency", ("endpoint", "model"))
+AI_TOKENS = Counter("ai_tokens_total", "OpenAI tokens used", ("endpoint", "model", "kind"))
+AI_CACHE = Counter("ai_cache_requests_total", "AI response cache lookups", ("endpoint", "result"))
+AI_ERRORS = Counter("ai_request_errors_total", "OpenAI chat completions that failed", ("endpoint", "error"))
+EMBEDDING_LATENCY = Histogram("ai_embedding_duration_seconds", "OpenAI embeddings latency", ("model",))
+CHROMA_LATENCY = Histogram("chroma_operation_duration_seconds", "Chroma query/upsert latency", ("operation",))
+
+
+class RequestStats:
+    """SQL statements issued while handling one request (or inside query_budget())."""
+
+    __slots__ = ("queries", "db_seconds", "keep_slowest", "_slowest", "_seq")
+
+    def __init__(self, keep_slowest: int = 0):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.keep_slowest = keep_slowest
+        self._slowest: List[Tuple[float, int, str]] = []  # min-heap of the slowest statements
+        self._seq = 0
+
+    def record(self, elapsed: float, statement: str) -> None:
+        self.queries += 1
+        self.db_seconds += elapsed
+        if self.keep_slowest > 0:
+            self._seq += 1
+            entry = (elapsed, self._seq, statement)
+            if len(self._slowest) < self.keep_slowest:
+                heapq.heappush(self._slowest, entry)
+            elif elapsed > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def slowest(self) -> List[Tuple[float, str]]:
+        return [(elapsed, statement) for elapsed, _, statement in sorted(self._slowest, reverse=True)]
+
+
+# Copied into the threadpool with the request context, so sync handlers record into it too
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _request_stats.get()
+
+
+def set_request_stats(stats: Optional[RequestStats]):
+    """Make stats the current collector; returns a token for reset_request_stats()."""
+    return _request_stats.set(stats)
+
+
+def reset_request_stats(token) -> None:
+    _request_stats.reset(token)
+
+
+def route_label(scope) -> str:
+    route = scope.get("route")
+    if route is not None and getattr(route, "path", None):
+        return route.path
+    # Static mounts have an endpoint but no route; anything else is a 404
+    return "mount" if scope.get("endpoint") is not None else "unmatched"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route latency, status and SQL usage."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        global _in_flight
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        with _in_flight_lock:
+            _in_flight += 1
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            with _in_flight_lock:
+                _in_flight -= 1
+            _request_stats.reset(token)
+            method, route = scope["method"], route_label(scope)
+            HTTP_REQUESTS.inc(method=method, route=route, status=str(status["code"]))
+            HTTP_LATENCY.observe(elapsed, method=method, route=route)
+            HTTP_DB_QUERIES.observe(stats.queries, method=method, route=route)
+            HTTP_DB_SECONDS.observe(stats.db_seconds, method=method, route=route)
+
+
+def _in_flight_samples() -> Iterable[Family]:
+    yield ("http_requests_in_progress", "gauge", "HTTP requests being handled", [({}, _in_flight)])
+
+
+register_collector(_in_flight_samples)
+
+
+def instrument_engine(engine) -> None:
+    """Time every statement on engine; attributes it to the current request, if any."""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+    def _finish(conn, statement: str):
+        starts = conn.info.get("metrics_query_start")
+        if not starts:
+            return
+        elapsed = time.perf_counter() - starts.pop()
+        DB_QUERIES.inc()
+        DB_QUERY_SECONDS.observe(elapsed)
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.record(elapsed, statement)
+        if settings.SLOW_QUERY_LOG_MS and elapsed * 1000 >= settings.SLOW_QUERY_LOG_MS:
+            logger.warning(f"🐢 Slow query ({elapsed * 1000:.0f} ms): {' '.join(statement.split())[:1000]}")
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        _finish(conn, statement)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        if exception_context.connection is not None:
+            _finish(exception_context.connection, exception_context.statement or "")
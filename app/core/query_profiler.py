@@ -0,0 +1,121 @@
+"""
+Per-request SQL profiling and query budgets.
+
+With QUERY_PROFILING_ENABLED, QueryProfilerMiddleware keeps the slowest statements of
+every request (from the cursor events in app/core/metrics.py) and:
+  - adds a Server-Timing header: db;dur=<ms>;desc="<n> queries", app;dur=<ms>
+  - logs the request with its slowest statements when it goes over its query budget
+    (QUERY_BUDGETS["<METHOD> <route template>"], else QUERY_BUDGET_DEFAULT)
+  - with QUERY_BUDGET_ENFORCE, answers 500 instead, so tests and CI runs fail loudly
+
+Statements slower than SLOW_QUERY_LOG_MS are logged whether or not profiling is on.
+
+In tests or benchmarks, without HTTP:
+    with query_budget(5):
+        get_voting_status(retro_id, current_user=user, db=db)
+"""
+
+import json
+import logging
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from app.core import metrics
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """More SQL statements than the budget allows (an AssertionError so test runners report it)."""
+
+    def __init__(self, label: str, queries: int, budget: int):
+        super().__init__(f"{label} issued {queries} SQL statements (budget {budget})")
+        self.queries = queries
+        self.budget = budget
+
+
+def budget_for(method: str, route: str) -> Optional[int]:
+    return settings.QUERY_BUDGETS.get(f"{method} {route}", settings.QUERY_BUDGET_DEFAULT)
+
+
+def _describe(stats: metrics.RequestStats) -> str:
+    return "\n".join(
+        f"    {elapsed * 1000:7.1f} ms  {' '.join(statement.split())[:300]}" for elapsed, statement in stats.slowest()
+    )
+
+
+@contextmanager
+def query_budget(max_queries: int, label: str = "block") -> Iterator[metrics.RequestStats]:
+    """Count the statements issued inside the block; raises QueryBudgetExceeded when over max_queries."""
+    stats = metrics.RequestStats(keep_slowest=settings.QUERY_PROFILE_TOP_N)
+    token = metrics.set_request_stats(stats)
+    try:
+        yield stats
+    finally:
+        metrics.reset_request_stats(token)
+    if stats.queries > max_queries:
+        logger.warning(f"🐢 {label}: {stats.queries} queries (budget {max_queries})\n{_describe(stats)}")
+        raise QueryBudgetExceeded(label, stats.queries, max_queries)
+
+
+class QueryProfilerMiddleware:
+    """ASGI middleware adding Server-Timing and enforcing query budgets (see module docstring)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.QUERY_PROFILING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        # Reuse the stats MetricsMiddleware started, so both see the same statements
+        stats = metrics.current_request_stats()
+        token = None
+        if stats is None:
+            stats = metrics.RequestStats()
+            token = metrics.set_request_stats(stats)
+        stats.keep_slowest = settings.QUERY_PROFILE_TOP_N
+        start = time.perf_counter()
+        over_budget = {"replaced": False}
+
+        async def send_wrapper(message):
+            if over_budget["replaced"]:
+                return  # body of the response we replaced
+            if message["type"] == "http.response.start":
+                method, route = scope["method"], metrics.route_label(scope)
+                budget = budget_for(method, route)
+                if budget is not None and stats.queries > budget:
+                    logger.warning(
+                        f"🐢 {method} {route}: {stats.queries} queries, {stats.db_seconds * 1000:.0f} ms DB "
+                        f"(budget {budget})\n{_describe(stats)}"
+                    )
+                    if settings.QUERY_BUDGET_ENFORCE:
+                        over_budget["replaced"] = True
+                        body = json.dumps({
+                            "detail": str(QueryBudgetExceeded(f"{method} {route}", stats.queries, budget))
+                        }).encode()
+                        await send({
+                            "type": "http.response.start",
+                            "status": 500,
+                            "headers": [
+                                (b"content-type", b"application/json"),
+                                (b"content-length", str(len(body)).encode()),
+                            ],
+                        })
+                        await send({"type": "http.response.body", "body": body})
+                        return
+                timing = (
+                    f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries", '
+                    f"app;dur={(time.perf_counter() - start) * 1000:.1f}"
+                )
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if token is not None:
+                metrics.reset_request_stats(token)
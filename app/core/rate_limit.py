@@ -0,0 +1,174 @@
+"""
+Token-bucket rate limiting.
+
+A bucket holds up to `burst` tokens and refills at `per_minute / 60` tokens a second;
+each request takes one. take() returns 0 when a token was taken, else the seconds until
+one will be available (the Retry-After).
+
+Backends (AI_RATE_LIMIT_BACKEND):
+  - "memory": buckets in this process (single worker, or per-worker limits)
+  - "database": rows in ai_rate_limit_buckets, updated under a row lock, so every
+    worker and instance shares the same buckets (one small transaction per check)
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Rate:
+    per_minute: float
+    burst: int
+
+    @property
+    def per_second(self) -> float:
+        return self.per_minute / 60.0
+
+
+def _refill(tokens: float, updated_at: float, now: float, rate: Rate) -> float:
+    return min(float(rate.burst), tokens + max(0.0, now - updated_at) * rate.per_second)
+
+
+def _wait_for_token(tokens: float, rate: Rate) -> float:
+    return (1.0 - tokens) / rate.per_second if rate.per_second > 0 else float("inf")
+
+
+class MemoryBuckets:
+    """Buckets in a bounded LRU dict (idle buckets are full again, so evicting them is harmless)."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rate: Rate) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (float(rate.burst), now))
+            tokens = _refill(tokens, updated_at, now, rate)
+            wait = 0.0
+            if tokens >= 1.0:
+                tokens -= 1.0
+            else:
+                wait = _wait_for_token(tokens, rate)
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return wait
+
+    def refund(self, key: str, rate: Rate) -> None:
+        with self._lock:
+            if key in self._buckets:
+                tokens, updated_at = self._buckets[key]
+                self._buckets[key] = (min(float(rate.burst), tokens + 1.0), updated_at)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class DatabaseBuckets:
+    """Buckets shared by all workers through the ai_rate_limit_buckets table."""
+
+    def __init__(self, session_factory=None):
+        self.session_factory = session_factory
+
+    def _session(self):
+        if self.session_factory is None:
+            from app.database.database import SessionLocal
+            self.session_factory = SessionLocal
+        return self.session_factory()
+
+    def _apply(self, key: str, rate: Rate, delta: float) -> float:
+        from app.models.rate_limit import RateLimitBucket
+
+        for _ in range(2):  # second round if another worker created the row first
+            db = self._session()
+            try:
+                now = time.time()
+                bucket = db.query(RateLimitBucket).filter(RateLimitBucket.key == key).with_for_update().first()
+                if bucket is None:
+                    bucket = RateLimitBucket(key=key, tokens=float(rate.burst), updated_at=now)
+                    db.add(bucket)
+                tokens = _refill(bucket.tokens, bucket.updated_at, now, rate)
+                wait = 0.0
+                if delta > 0:
+                    tokens = min(float(rate.burst), tokens + delta)
+                elif tokens >= 1.0:
+                    tokens -= 1.0
+                else:
+                    wait = _wait_for_token(tokens, rate)
+                bucket.tokens = tokens
+                bucket.updated_at = now
+                db.commit()
+                return wait
+            except IntegrityError:
+                db.rollback()
+            finally:
+                db.close()
+        return 0.0
+
+    def take(self, key: str, rate: Rate) -> float:
+        return self._apply(key, rate, 0.0)
+
+    def refund(self, key: str, rate: Rate) -> None:
+        self._apply(key, rate, 1.0)
+
+    def clear(self) -> None:
+        from app.models.rate_limit import RateLimitBucket
+
+        db = self._session()
+        try:
+            db.query(RateLimitBucket).delete()
+            db.commit()
+        finally:
+            db.close()
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_buckets():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                kind = (settings.AI_RATE_LIMIT_BACKEND or "memory").lower()
+                if kind not in ("memory", "database"):
+                    logger.warning(f"⚠️ Unknown AI_RATE_LIMIT_BACKEND {kind!r}; using memory")
+                _backend = DatabaseBuckets() if kind == "database" else MemoryBuckets()
+    return _backend
+
+
+def take(key: str, rate: Optional[Rate]) -> float:
+    """0 if allowed (a token was taken), else seconds until the next token. rate None = unlimited."""
+    if rate is None or rate.per_minute <= 0:
+        return 0.0
+    try:
+        return get_buckets().take(key, rate)
+    except Exception as e:
+        # A limiter outage (e.g. DB down) must not take the AI features with it
+        logger.warning(f"⚠️ Rate limiter unavailable, allowing {key}: {e}")
+        return 0.0
+
+
+def refund(key: str, rate: Optional[Rate]) -> None:
+    if rate is None or rate.per_minute <= 0:
+        return
+    try:
+        get_buckets().refund(key, rate)
+    except Exception as e:
+        logger.warning(f"⚠️ Rate limiter refund failed for {key}: {e}")
@@ -0,0 +1,167 @@
+"""
+Compressed, cached delivery of the single-page UI documents (app/ui/*.html)
+
+The HTML documents are a few hundred KB each. They are read once per process, with
+their gzip and brotli variants, and served from memory:
+  - Content-Encoding picked from Accept-Encoding (br, then gzip, then identity), with
+    Vary: Accept-Encoding
+  - ETag from a hash of the content (suffixed per encoding, e.g. "<hash>-br"); a matching
+    If-None-Match answers 304 with no body
+  - Cache-Control: UI_HTML_CACHE_CONTROL (default "no-cache": browsers keep the copy
+    but revalidate it on every load, which costs a 304 until the next deploy)
+
+The variants are built ahead of time by scripts/precompress_ui.py (<file>.gz / <file>.br
+next to the source). Any variant missing or older than its source is compressed at load
+time instead (brotli only if the optional `brotli` package is installed). A changed file
+(mtime or size) is reloaded on the next request.
+"""
+
+import gzip
+import hashlib
+import logging
+import os
+import threading
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from fastapi import HTTPException, Request, Response
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli  # optional
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+UI_DIR = os.path.join("app", "ui")
+# Compressed at load time when no prebuilt variant exists; the build script uses the maximum
+RUNTIME_GZIP_LEVEL = 9
+RUNTIME_BROTLI_QUALITY = 9
+BUILD_BROTLI_QUALITY = 11
+
+
+class UIAsset(NamedTuple):
+    stamp: Tuple[int, int]  # (mtime_ns, size) of the source
+    etag: str  # content hash, without quotes or encoding suffix
+    variants: Dict[str, bytes]  # "identity" / "gzip" / "br" -> body
+
+
+_assets: Dict[str, UIAsset] = {}
+_lock = threading.Lock()
+
+
+def gzip_bytes(data: bytes) -> bytes:
+    # mtime=0 so the output (and anything hashed from it) is reproducible
+    return gzip.compress(data, compresslevel=RUNTIME_GZIP_LEVEL, mtime=0)
+
+
+def brotli_bytes(data: bytes, quality: int = RUNTIME_BROTLI_QUALITY) -> Optional[bytes]:
+    if brotli is None:
+        return None
+    return brotli.compress(data, mode=brotli.MODE_TEXT, quality=quality)
+
+
+def _prebuilt(path: str, suffix: str, source_mtime_ns: int) -> Optional[bytes]:
+    variant = path + suffix
+    try:
+        if os.stat(variant).st_mtime_ns >= source_mtime_ns:
+            with open(variant, "rb") as f:
+                return f.read()
+    except OSError:
+        pass
+    return None
+
+
+def _load(path: str, stamp: Tuple[int, int]) -> UIAsset:
+    with open(path, "rb") as f:
+        data = f.read()
+    variants = {"identity": data}
+    gz = _prebuilt(path, ".gz", stamp[0]) or gzip_bytes(data)
+    if len(gz) < len(data):
+        variants["gzip"] = gz
+    br = _prebuilt(path, ".br", stamp[0]) or brotli_bytes(data)
+    if br is not None and len(br) < len(data):
+        variants["br"] = br
+    etag = hashlib.sha256(data).hexdigest()[:20]
+    logger.info(
+        f"✅ UI asset {os.path.basename(path)} cached: "
+        + ", ".join(f"{name} {len(body) // 1024} KB" for name, body in variants.items())
+    )
+    return UIAsset(stamp=stamp, etag=etag, variants=variants)
+
+
+def get_asset(name: str) -> UIAsset:
+    """The cached asset for app/ui/<name>, (re)loaded when the file changed; 404 if missing."""
+    path = os.path.join(UI_DIR, name)
+    try:
+        st = os.stat(path)
+    except OSError:
+        raise HTTPException(status_code=404, detail="Application file not found")
+    stamp = (st.st_mtime_ns, st.st_size)
+    asset = _assets.get(name)
+    if asset is not None and asset.stamp == stamp:
+        return asset
+    with _lock:
+        asset = _assets.get(name)
+        if asset is None or asset.stamp != stamp:
+            asset = _assets[name] = _load(path, stamp)
+    return asset
+
+
+def _accepted_encodings(header: Optional[str]) -> Dict[str, float]:
+    accepted: Dict[str, float] = {}
+    for part in (header or "").split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[token] = q
+    return accepted
+
+
+def choose_encoding(accept_encoding: Optional[str], available) -> str:
+    accepted = _accepted_encodings(accept_encoding)
+    for encoding in ("br", "gzip"):
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if encoding in available and q > 0:
+            return encoding
+    return "identity"
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        # Weak comparison, ignoring the per-encoding suffix: the content is what matters
+        candidate = candidate.removeprefix("W/").strip('"')
+        if candidate.split("-", 1)[0] == etag:
+            return True
+    return False
+
+
+def serve_ui_file(request: Request, name: str) -> Response:
+    """Response for app/ui/<name> honouring Accept-Encoding and If-None-Match."""
+    asset = get_asset(name)
+    encoding = choose_encoding(request.headers.get("accept-encoding"), asset.variants)
+    etag = f'"{asset.etag}"' if encoding == "identity" else f'"{asset.etag}-{"gz" if encoding == "gzip" else encoding}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": settings.UI_HTML_CACHE_CONTROL,
+        "Vary": "Accept-Encoding",
+    }
+    if _etag_matches(request.headers.get("if-none-match"), asset.etag):
+        return Response(status_code=304, headers=headers)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=asset.variants[encoding], media_type="text/html; charset=utf-8", headers=headers)
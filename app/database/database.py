@@ -8,6 +8,7 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import NullPool
 from app.core.config import settings
+from app.core.metrics import instrument_engine
 import logging
 import os
 
@@ -82,6 +83,9 @@ engine = create_engine(
     **engine_kwargs
 )
 
+# Statement counts/latency for /metrics (and per-request DB time)
+instrument_engine(engine)
+
 # Enable foreign key constraints for SQLite
 if not is_postgres:
     @event.listens_for(engine, "connect")
@@ -123,7 +127,12 @@ async def init_db():
             UserOnboarding,
             ScheduledRetrospective,
             TeamPreparation,
-            AutomatedReminder
+            AutomatedReminder,
+            EmailOutbox,
+            SummaryExport,
+            WorkspaceWeeklyRollup,
+            AIUsageEvent,
+            RateLimitBucket
         )
         
         # Only try to create tables if not using Neon (which may not have permissions)
@@ -20,6 +20,11 @@ from .retrospective_new import (
 )
 from .action_item import ActionItem
 from .onboarding import UserOnboarding, ScheduledRetrospective, TeamPreparation, AutomatedReminder
+from .email_outbox import EmailOutbox
+from .summary_export import SummaryExport
+from .report_rollup import WorkspaceWeeklyRollup
+from .ai_usage import AIUsageEvent
+from .rate_limit import RateLimitBucket
 
 __all__ = [
     "User",
@@ -41,5 +46,10 @@ __all__ = [
     "UserOnboarding",
     "ScheduledRetrospective",
     "TeamPreparation",
-    "AutomatedReminder"
+    "AutomatedReminder",
+    "EmailOutbox",
+    "SummaryExport",
+    "WorkspaceWeeklyRollup",
+    "AIUsageEvent",
+    "RateLimitBucket"
 ]
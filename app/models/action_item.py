@@ -2,7 +2,7 @@
 Action item models for tracking retrospective outcomes
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Numeric
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Numeric, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database.database import Base
@@ -51,5 +51,9 @@ class ActionItem(Base):
     assignee = relationship("User", foreign_keys=[assigned_to], back_populates="assigned_action_items")
     creator = relationship("User", foreign_keys=[created_by], back_populates="created_action_items")
     
+    __table_args__ = (
+        Index("ix_action_items_workspace_created", "workspace_id", "created_at"),
+    )
+    
     def __repr__(self):
         return f"<ActionItem(id={self.id}, title='{self.title}', status='{self.status}')>"
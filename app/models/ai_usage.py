@@ -0,0 +1,42 @@
+"""
+Append-only ledger of AI calls, written in batches by app/ai/usage_ledger.py
+
+One row per chat completion or embeddings call, including answers served from the AI
+response cache (cached = true, with the token counts of the original call), so spend and
+cache savings can be attributed to features (endpoint) and tenants (workspace).
+"""
+
+from sqlalchemy import Column, Integer, BigInteger, String, Float, Boolean, DateTime, Index
+from sqlalchemy.sql import func
+from app.database.database import Base
+
+
+class AIUsageEvent(Base):
+    """One AI call and its token usage"""
+    __tablename__ = "ai_usage_events"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    endpoint = Column(String(100), nullable=False)  # e.g. "grouping.generate", "embeddings"
+    model = Column(String(100), nullable=True)
+
+    # Who it was for; no foreign keys so the ledger outlives deleted workspaces/retros.
+    # workspace_id may be empty when only the retrospective was known at call time.
+    workspace_id = Column(Integer, nullable=True)
+    retrospective_id = Column(Integer, nullable=True)
+    user_id = Column(Integer, nullable=True)
+
+    prompt_tokens = Column(Integer, nullable=False, default=0)
+    completion_tokens = Column(Integer, nullable=False, default=0)
+    latency_ms = Column(Float, nullable=True)
+    cached = Column(Boolean, nullable=False, default=False)
+
+    __table_args__ = (
+        Index("ix_ai_usage_events_created_at", "created_at"),
+        Index("ix_ai_usage_events_workspace_created", "workspace_id", "created_at"),
+        Index("ix_ai_usage_events_retrospective_id", "retrospective_id"),
+    )
+
+    def __repr__(self):
+        return f"<AIUsageEvent(endpoint={self.endpoint}, model={self.model}, cached={self.cached})>"
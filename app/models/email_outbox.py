@@ -0,0 +1,48 @@
+"""
+Transactional email outbox
+
+Rows are written in the same transaction as the change that triggers the email and are
+delivered later by app/services/email_outbox_worker.py.
+"""
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.database.database import Base
+
+
+class EmailOutbox(Base):
+    """Queued outgoing email"""
+    __tablename__ = "email_outbox"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # What triggered it (for reporting / dedupe), e.g. "calendar_invite"
+    kind = Column(String(50), nullable=False, default="generic")
+    retrospective_id = Column(Integer, ForeignKey("retrospectives.id"), nullable=True)
+    
+    # Message
+    to_email = Column(String(255), nullable=False)
+    subject = Column(String(500), nullable=False)
+    html_content = Column(Text, nullable=False)
+    text_content = Column(Text, nullable=True)
+    # [{"filename": ..., "mime_type": ..., "content_b64": ...}]
+    attachments = Column(JSON, nullable=True)
+    
+    # Delivery state
+    status = Column(String(20), nullable=False, default="pending")  # pending, sending, sent, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_error = Column(Text, nullable=True)
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    # The worker claims due rows with: WHERE status = 'pending' AND next_attempt_at <= now
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt", "status", "next_attempt_at"),
+    )
+    
+    def __repr__(self):
+        return f"<EmailOutbox(id={self.id}, to='{self.to_email}', status='{self.status}')>"
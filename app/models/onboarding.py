@@ -2,7 +2,7 @@
 Onboarding and user journey models
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, JSON, Text, UniqueConstraint
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, JSON, Text, UniqueConstraint, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database.database import Base
@@ -147,6 +147,11 @@ class AutomatedReminder(Base):
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
+    # The dispatcher claims due rows with WHERE status = 'pending' AND scheduled_for <= now
+    __table_args__ = (
+        Index("ix_automated_reminders_status_scheduled_for", "status", "scheduled_for"),
+    )
+    
     # Relationships
     user = relationship("User")
     
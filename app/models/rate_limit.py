@@ -0,0 +1,18 @@
+"""
+Shared token buckets for AI rate limiting (AI_RATE_LIMIT_BACKEND=database), see app/core/rate_limit.py
+"""
+
+from sqlalchemy import Column, String, Float
+from app.database.database import Base
+
+
+class RateLimitBucket(Base):
+    """One token bucket, e.g. key "grouping.generate:workspace:12" """
+    __tablename__ = "ai_rate_limit_buckets"
+
+    key = Column(String(200), primary_key=True)
+    tokens = Column(Float, nullable=False)
+    updated_at = Column(Float, nullable=False)  # unix time of the last refill
+
+    def __repr__(self):
+        return f"<RateLimitBucket(key={self.key}, tokens={self.tokens:.2f})>"
@@ -0,0 +1,37 @@
+"""
+Pre-aggregated workspace activity per ISO week, written nightly by app/services/report_rollup.py
+
+There is one row per (workspace, week) for every workspace and every closed week the rollup
+covered, including weeks with no activity, so a missing row means "not rolled up yet".
+"""
+
+from sqlalchemy import Column, Integer, Float, Date, DateTime, ForeignKey, JSON, UniqueConstraint
+from sqlalchemy.sql import func
+from app.database.database import Base
+
+
+class WorkspaceWeeklyRollup(Base):
+    """Weekly retrospective / action item counts for one workspace"""
+    __tablename__ = "workspace_weekly_rollups"
+
+    id = Column(Integer, primary_key=True, index=True)
+    workspace_id = Column(Integer, ForeignKey("workspaces.id"), nullable=False, index=True)
+    week_start = Column(Date, nullable=False)  # Monday
+
+    retrospectives_completed = Column(Integer, nullable=False, default=0)
+    action_items_created = Column(Integer, nullable=False, default=0)
+    action_items_completed = Column(Integer, nullable=False, default=0)
+    # Sum/count of (completed_at - created_at) so means can be combined across weeks
+    completion_seconds_total = Column(Float, nullable=False, default=0.0)
+    completed_with_duration = Column(Integer, nullable=False, default=0)
+    status_counts = Column(JSON, nullable=True)  # {"pending": 3, "completed": 5}
+    assignee_counts = Column(JSON, nullable=True)  # {"<user_id>|unassigned": {"created": n, "completed": n}}
+
+    computed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint('workspace_id', 'week_start', name='uq_workspace_weekly_rollup'),
+    )
+
+    def __repr__(self):
+        return f"<WorkspaceWeeklyRollup(workspace_id={self.workspace_id}, week_start={self.week_start})>"
@@ -2,7 +2,7 @@
 Retrospective models for the complete workflow
 """
 
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, JSON, ForeignKey, Numeric
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, JSON, ForeignKey, Numeric, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database.database import Base
@@ -58,6 +58,9 @@ class Retrospective(Base):
     ai_summary = Column(Text, nullable=True)
     ai_insights = Column(JSON, nullable=True)
     
+    # Final voting results, written when voting is finalized (app/services/summary_snapshot.py)
+    summary_snapshot = Column(JSON, nullable=True)
+    
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -74,6 +77,10 @@ class Retrospective(Base):
     action_items = relationship("ActionItem", back_populates="retrospective")
     da_recommendations = relationship("DARecommendation", back_populates="retrospective", cascade="all, delete-orphan")
     
+    __table_args__ = (
+        Index("ix_retrospectives_workspace_created", "workspace_id", "created_at"),
+    )
+    
     def __repr__(self):
         return f"<Retrospective(id={self.id}, title='{self.title}', phase='{self.current_phase}')>"
 
@@ -96,6 +103,11 @@ class RetrospectiveParticipant(Base):
     email_notification_sent = Column(Boolean, default=False)
     reminder_sent = Column(Boolean, default=False)
     
+    # Participant checks filter on (retrospective_id, user_id); one row per user per retro
+    __table_args__ = (
+        Index("uq_retrospective_participants_retro_user", "retrospective_id", "user_id", unique=True),
+    )
+    
     # Relationships
     retrospective = relationship("Retrospective", back_populates="participants")
     user = relationship("User", back_populates="retrospective_participations")
@@ -129,6 +141,10 @@ class ChatSession(Base):
     is_active = Column(Boolean, default=True)
     is_completed = Column(Boolean, default=False)
     
+    # Rolling AI context: summary of messages up to and including history_summary_message_id
+    history_summary = Column(Text, nullable=True)
+    history_summary_message_id = Column(Integer, nullable=True)
+    
     # Timestamps
     started_at = Column(DateTime(timezone=True), server_default=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True)
@@ -165,6 +181,10 @@ class ChatMessage(Base):
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
+    __table_args__ = (
+        Index("ix_chat_messages_session_created", "session_id", "created_at"),
+    )
+    
     # Relationships
     session = relationship("ChatSession", back_populates="messages")
     
@@ -194,6 +214,10 @@ class RetrospectiveResponse(Base):
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
+    __table_args__ = (
+        Index("ix_retrospective_responses_retro_theme", "retrospective_id", "theme_group_id"),
+    )
+    
     # Relationships
     retrospective = relationship("Retrospective", back_populates="responses")
     user = relationship("User", back_populates="retrospective_responses")
@@ -277,6 +301,13 @@ class VoteAllocation(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    # One allocation row per (session, theme, user); the unique index also serves
+    # (session, theme) tallies, the second index per-user vote totals
+    __table_args__ = (
+        Index("uq_vote_allocations_session_theme_user", "voting_session_id", "theme_group_id", "user_id", unique=True),
+        Index("ix_vote_allocations_session_user", "voting_session_id", "user_id"),
+    )
+    
     # Relationships
     voting_session = relationship("VotingSession", back_populates="vote_allocations")
     theme_group = relationship("ThemeGroup", back_populates="vote_allocations")
@@ -308,8 +339,17 @@ class DiscussionTopic(Base):
     ai_summary = Column(Text, nullable=True)
     key_points = Column(JSON, nullable=True)
     
+    # Rolling AI context: summary of messages up to and including history_summary_message_id
+    history_summary = Column(Text, nullable=True)
+    history_summary_message_id = Column(Integer, nullable=True)
+    
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
+    # finalize_voting creates at most one topic per theme
+    __table_args__ = (
+        Index("uq_discussion_topics_retro_theme", "retrospective_id", "theme_group_id", unique=True),
+    )
+    
     # Relationships
     retrospective = relationship("Retrospective", back_populates="discussion_topics")
     theme_group = relationship("ThemeGroup", back_populates="discussion_topics")
@@ -337,6 +377,10 @@ class DiscussionMessage(Base):
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
+    __table_args__ = (
+        Index("ix_discussion_messages_topic_created", "discussion_topic_id", "created_at"),
+    )
+    
     # Relationships
     discussion_topic = relationship("DiscussionTopic", back_populates="messages")
     
@@ -0,0 +1,33 @@
+"""
+Rendered retrospective exports (e.g. the summary PDF)
+
+One row per (retrospective, kind, content_version). content_version is a hash of everything
+the export shows, so an unchanged retrospective is served from here instead of re-rendered.
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, LargeBinary, UniqueConstraint
+from sqlalchemy.sql import func
+from app.database.database import Base
+
+
+class SummaryExport(Base):
+    """Cached export blob"""
+    __tablename__ = "summary_exports"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    retrospective_id = Column(Integer, ForeignKey("retrospectives.id"), nullable=False, index=True)
+    kind = Column(String(20), nullable=False, default="summary_pdf")
+    content_version = Column(String(64), nullable=False)
+    
+    media_type = Column(String(100), nullable=False, default="application/pdf")
+    content = Column(LargeBinary, nullable=False)
+    size_bytes = Column(Integer, nullable=False, default=0)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        UniqueConstraint('retrospective_id', 'kind', 'content_version', name='uq_summary_export_version'),
+    )
+    
+    def __repr__(self):
+        return f"<SummaryExport(retrospective_id={self.retrospective_id}, kind='{self.kind}', version='{self.content_version[:8]}')>"
@@ -2,7 +2,7 @@
 Workspace model for team organization
 """
 
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, JSON, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database.database import Base
@@ -59,6 +59,11 @@ class WorkspaceMember(Base):
     joined_at = Column(DateTime(timezone=True), server_default=func.now())
     left_at = Column(DateTime(timezone=True), nullable=True)
     
+    # Not unique: a member who left keeps an inactive row and may rejoin with a new one
+    __table_args__ = (
+        Index("ix_workspace_members_ws_user_active", "workspace_id", "user_id", "is_active"),
+    )
+    
     # Relationships
     workspace = relationship("Workspace", back_populates="members")
     user = relationship("User", back_populates="workspace_memberships")
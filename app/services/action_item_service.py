@@ -4,7 +4,7 @@ Action item service for managing action items
 
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from datetime import datetime
 from app.models.action_item import ActionItem
 from app.schemas.action_item import ActionItemCreate, ActionItemUpdate
@@ -42,10 +42,17 @@ class ActionItemService:
         limit: int = 100,
         retrospective_id: Optional[int] = None,
         workspace_id: Optional[int] = None,
-        status: Optional[str] = None
-    ) -> List[ActionItem]:
-        """Get action items with optional filters"""
-        query = self.db.query(ActionItem).filter(
+        status: Optional[str] = None,
+        before_id: Optional[int] = None,
+        columns: Optional[Sequence[str]] = None
+    ) -> List:
+        """
+        Get action items with optional filters, newest first.
+        before_id continues a keyset page; columns selects only those ActionItem columns
+        (rows instead of entities).
+        """
+        entities = [getattr(ActionItem, column) for column in columns] if columns else [ActionItem]
+        query = self.db.query(*entities).filter(
             or_(
                 ActionItem.assigned_to == user_id,
                 ActionItem.created_by == user_id
@@ -62,7 +69,13 @@ class ActionItemService:
             # Filter by status string directly
             query = query.filter(ActionItem.status == status)
         
-        return query.offset(skip).limit(limit).all()
+        if before_id is not None:
+            query = query.filter(ActionItem.id < before_id)
+        
+        query = query.order_by(ActionItem.id.desc())
+        if skip:
+            query = query.offset(skip)
+        return query.limit(limit).all()
     
     def get_action_item(self, action_item_id: int, user_id: int) -> Optional[ActionItem]:
         """Get a specific action item if user has access"""
@@ -0,0 +1,145 @@
+"""
+Short-lived in-process cache of authenticated users and workspace memberships.
+
+get_current_user and get_workspace_membership run on almost every request. This keeps
+the row columns for a few seconds (AUTH_CACHE_TTL_SECONDS), keyed by (user_id, token iat)
+and (workspace_id, user_id). On a hit the row is rebuilt as a clean, persistent instance
+in the request's session without a SELECT, so handlers can still modify and commit it.
+
+Only positive results are cached. Any ORM update or delete of a User or WorkspaceMember
+in this process drops its entries; other processes (and bulk query.update() calls) see the
+change once the TTL expires.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple, Type
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core import metrics
+from app.core.config import settings
+from app.models.user import User
+from app.models.workspace import WorkspaceMember
+
+
+class TTLCache:
+    """Bounded LRU of column snapshots that expire after ttl seconds."""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Dict[str, Any]) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard_where(self, predicate) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if predicate(k)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_users = TTLCache(settings.AUTH_CACHE_TTL_SECONDS, settings.AUTH_CACHE_MAX_ENTRIES)
+_memberships = TTLCache(settings.AUTH_CACHE_TTL_SECONDS, settings.AUTH_CACHE_MAX_ENTRIES)
+
+
+def _snapshot(instance) -> Dict[str, Any]:
+    return {attr.key: getattr(instance, attr.key) for attr in inspect(type(instance)).column_attrs}
+
+
+def _attach(db: Session, model: Type, columns: Dict[str, Any]):
+    """Rebuild a cached row as a persistent, unmodified instance of this session (no SQL)."""
+    instance = model(**columns)
+    make_transient_to_detached(instance)
+    return db.merge(instance, load=False)
+
+
+def cached_user(db: Session, user_id: int, token_key: Any) -> Optional[User]:
+    columns = _users.get((user_id, token_key))
+    return _attach(db, User, columns) if columns is not None else None
+
+
+def remember_user(user: User, token_key: Any) -> None:
+    _users.set((user.id, token_key), _snapshot(user))
+
+
+def invalidate_user(user_id: int) -> None:
+    _users.discard_where(lambda key: key[0] == user_id)
+
+
+def cached_membership(db: Session, workspace_id: int, user_id: int) -> Optional[WorkspaceMember]:
+    columns = _memberships.get((workspace_id, user_id))
+    return _attach(db, WorkspaceMember, columns) if columns is not None else None
+
+
+def remember_membership(membership: WorkspaceMember) -> None:
+    _memberships.set((membership.workspace_id, membership.user_id), _snapshot(membership))
+
+
+def invalidate_membership(workspace_id: Optional[int] = None, user_id: Optional[int] = None) -> None:
+    """Drop cached memberships matching workspace_id and/or user_id (both None clears all)."""
+    _memberships.discard_where(
+        lambda key: (workspace_id is None or key[0] == workspace_id) and (user_id is None or key[1] == user_id)
+    )
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target) -> None:
+    invalidate_user(target.id)
+
+
+@event.listens_for(WorkspaceMember, "after_update")
+@event.listens_for(WorkspaceMember, "after_delete")
+def _membership_changed(mapper, connection, target) -> None:
+    invalidate_membership(target.workspace_id, target.user_id)
+
+
+def cache_stats() -> Dict[str, Dict[str, int]]:
+    return {
+        "users": {"hits": _users.hits, "misses": _users.misses},
+        "memberships": {"hits": _memberships.hits, "misses": _memberships.misses},
+    }
+
+
+def _cache_samples():
+    yield (
+        "auth_cache_requests_total", "counter", "Auth cache lookups",
+        [
+            ({"cache": name, "result": result}, count)
+            for name, stats in cache_stats().items()
+            for result, count in (("hit", stats["hits"]), ("miss", stats["misses"]))
+        ],
+    )
+
+
+metrics.register_collector(_cache_samples)
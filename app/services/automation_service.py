@@ -3,12 +3,14 @@ Automation service for retrospective workflows
 Handles pre-retrospective preparation, reminders, and post-retrospective follow-ups
 """
 
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from app.models.onboarding import ScheduledRetrospective, TeamPreparation, AutomatedReminder
 from app.models.retrospective_new import Retrospective
-from app.models.workspace import Workspace as Team, WorkspaceMember as TeamMember
+from app.models.workspace import WorkspaceMember as TeamMember
 from app.models.action_item import ActionItem
 from app.models.user import User
+from app.services.report_rollup import build_workspace_report
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import logging
@@ -46,19 +48,31 @@ class AutomationService:
         )
         
         db.add(scheduled_retro)
-        db.commit()
-        db.refresh(scheduled_retro)
+        db.flush()
         
-        # Create automated reminders
+        # Create automated reminders (same transaction as the scheduled retrospective)
         AutomationService._create_reminders(
             db, scheduled_retro,
             reminder_subject=reminder_subject,
             reminder_message=reminder_message,
         )
         
+        db.commit()
+        db.refresh(scheduled_retro)
+        
         logger.info(f"Scheduled retrospective {scheduled_retro.id} for {scheduled_date}")
         return scheduled_retro
     
+    @staticmethod
+    def _member_user_ids(db: Session, workspace_id: int) -> List[int]:
+        """User ids of a workspace's members, in one query (members joined with their users)"""
+        rows = db.query(TeamMember.user_id).join(
+            User, User.id == TeamMember.user_id
+        ).filter(
+            TeamMember.workspace_id == workspace_id
+        ).all()
+        return [user_id for (user_id,) in rows]
+    
     @staticmethod
     def _create_reminders(
         db: Session,
@@ -66,41 +80,41 @@ class AutomationService:
         reminder_subject: Optional[str] = None,
         reminder_message: Optional[str] = None,
     ):
-        """Create automated reminders for scheduled retrospective"""
-        # Get team members
-        team = db.query(Team).filter(Team.id == scheduled_retro.workspace_id).first()
-        if not team:
+        """Create automated reminders for scheduled retrospective (caller commits)"""
+        user_ids = AutomationService._member_user_ids(db, scheduled_retro.workspace_id)
+        if not user_ids:
             return
         
-        members = db.query(TeamMember).filter(TeamMember.workspace_id == team.id).all()
-        
-        for member in members:
-            # 1 week before reminder
-            if scheduled_retro.send_1_week_reminder:
-                week_reminder = AutomatedReminder(
-                    reminder_type="pre_retro",
-                    user_id=member.user_id,
-                    scheduled_retro_id=scheduled_retro.id,
-                    scheduled_for=scheduled_retro.scheduled_date - timedelta(days=7),
-                    subject=(reminder_subject or f"Retrospective in 1 week: {scheduled_retro.title}"),
-                    message=(reminder_message or AutomationService._generate_week_before_message(scheduled_retro))
-                )
-                db.add(week_reminder)
-            
-            # 24 hours before reminder
-            if scheduled_retro.send_24_hour_reminder:
-                day_reminder = AutomatedReminder(
-                    reminder_type="pre_retro",
-                    user_id=member.user_id,
-                    scheduled_retro_id=scheduled_retro.id,
-                    scheduled_for=scheduled_retro.scheduled_date - timedelta(hours=24),
-                    subject=(reminder_subject or f"Retrospective tomorrow: {scheduled_retro.title}"),
-                    message=(reminder_message or AutomationService._generate_day_before_message(scheduled_retro))
-                )
-                db.add(day_reminder)
+        # Reminder content is the same for every member; build it once
+        templates = []
+        # 1 week before reminder
+        if scheduled_retro.send_1_week_reminder:
+            templates.append({
+                "scheduled_for": scheduled_retro.scheduled_date - timedelta(days=7),
+                "subject": (reminder_subject or f"Retrospective in 1 week: {scheduled_retro.title}"),
+                "message": (reminder_message or AutomationService._generate_week_before_message(scheduled_retro)),
+            })
+        # 24 hours before reminder
+        if scheduled_retro.send_24_hour_reminder:
+            templates.append({
+                "scheduled_for": scheduled_retro.scheduled_date - timedelta(hours=24),
+                "subject": (reminder_subject or f"Retrospective tomorrow: {scheduled_retro.title}"),
+                "message": (reminder_message or AutomationService._generate_day_before_message(scheduled_retro)),
+            })
         
-        db.commit()
-        logger.info(f"Created reminders for retrospective {scheduled_retro.id}")
+        rows = [
+            {
+                "reminder_type": "pre_retro",
+                "user_id": user_id,
+                "scheduled_retro_id": scheduled_retro.id,
+                **template,
+            }
+            for user_id in user_ids
+            for template in templates
+        ]
+        if rows:
+            db.execute(insert(AutomatedReminder), rows)
+        logger.info(f"Created {len(rows)} reminders for retrospective {scheduled_retro.id}")
     
     @staticmethod
     def send_preparation_prompts(
@@ -116,21 +130,20 @@ class AutomationService:
             return []
         
         # Get team members
-        members = db.query(TeamMember).filter(
-            TeamMember.workspace_id == scheduled_retro.workspace_id
-        ).all()
+        user_ids = AutomationService._member_user_ids(db, scheduled_retro.workspace_id)
         
-        preparations = []
         questions = AutomationService._generate_preparation_questions(db, scheduled_retro)
         
-        for member in members:
-            prep = TeamPreparation(
-                scheduled_retro_id=scheduled_retro_id,
-                user_id=member.user_id,
-                questions=questions
-            )
-            db.add(prep)
-            preparations.append(prep)
+        preparations = []
+        if user_ids:
+            # One multi-row INSERT ... RETURNING instead of one INSERT per member
+            preparations = list(db.scalars(
+                insert(TeamPreparation).returning(TeamPreparation),
+                [
+                    {"scheduled_retro_id": scheduled_retro_id, "user_id": user_id, "questions": questions}
+                    for user_id in user_ids
+                ]
+            ))
         
         db.commit()
         logger.info(f"Sent preparation prompts for retrospective {scheduled_retro_id}")
@@ -298,7 +311,6 @@ YodaAI Team
         # Mark as completed
         retrospective.status = "completed"
         retrospective.actual_end_time = datetime.now()
-        db.commit()
         
         # Generate and send summary
         summary = AutomationService._generate_retrospective_summary(db, retrospective)
@@ -309,6 +321,7 @@ YodaAI Team
         # Schedule follow-up reminders
         AutomationService._schedule_follow_up_reminders(db, retrospective)
         
+        db.commit()
         logger.info(f"Completed retrospective {retrospective_id}")
         
         return {
@@ -372,26 +385,29 @@ YodaAI Team
         db: Session,
         retrospective: Retrospective
     ):
-        """Schedule follow-up reminders for action items"""
+        """Schedule follow-up reminders for action items (caller commits)"""
         # Get team members
         if not retrospective.workspace_id:
             return
         
-        members = db.query(TeamMember).filter(TeamMember.workspace_id == retrospective.workspace_id).all()
-        
-        for member in members:
-            # Weekly check-in reminder
-            weekly_reminder = AutomatedReminder(
-                reminder_type="weekly_report",
-                user_id=member.user_id,
-                retrospective_id=retrospective.id,
-                scheduled_for=datetime.now() + timedelta(days=7),
-                subject="Weekly Action Items Check-in",
-                message=AutomationService._generate_weekly_checkin_message(retrospective)
-            )
-            db.add(weekly_reminder)
+        user_ids = AutomationService._member_user_ids(db, retrospective.workspace_id)
+        if not user_ids:
+            return
         
-        db.commit()
+        # Weekly check-in reminder
+        scheduled_for = datetime.now() + timedelta(days=7)
+        message = AutomationService._generate_weekly_checkin_message(retrospective)
+        db.execute(insert(AutomatedReminder), [
+            {
+                "reminder_type": "weekly_report",
+                "user_id": user_id,
+                "retrospective_id": retrospective.id,
+                "scheduled_for": scheduled_for,
+                "subject": "Weekly Action Items Check-in",
+                "message": message,
+            }
+            for user_id in user_ids
+        ])
         logger.info(f"Scheduled follow-up reminders for retrospective {retrospective.id}")
     
     @staticmethod
@@ -415,36 +431,12 @@ YodaAI Team
     def generate_monthly_report(
         db: Session,
         team_id: int,
-        user_id: int
+        user_id: int,
+        weeks: int = 4
     ) -> Dict:
-        """Generate monthly retrospective effectiveness report"""
-        # Get retrospectives from the last month
-        one_month_ago = datetime.now() - timedelta(days=30)
-        
-        retrospectives = db.query(Retrospective).filter(
-            Retrospective.workspace_id == team_id,
-            Retrospective.created_at >= one_month_ago,
-            Retrospective.status == "completed"
-        ).all()
-        
-        # Get action items
-        action_items = db.query(ActionItem).filter(
-            ActionItem.workspace_id == team_id,
-            ActionItem.created_at >= one_month_ago
-        ).all()
-        
-        completed_actions = [ai for ai in action_items if ai.status == "completed"]
-        
-        report = {
-            "period": "Last 30 days",
-            "team_id": team_id,
-            "retrospectives_conducted": len(retrospectives),
-            "action_items_created": len(action_items),
-            "action_items_completed": len(completed_actions),
-            "completion_rate": (len(completed_actions) / len(action_items) * 100) if action_items else 0,
-            "trends": [],
-            "recommendations": []
-        }
-        
-        return report
+        """
+        Generate retrospective effectiveness report with weekly trends and recommendations.
+        Closed weeks come from the nightly rollup table; see app/services/report_rollup.py.
+        """
+        return build_workspace_report(db, team_id, weeks=weeks)
 
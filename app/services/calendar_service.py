@@ -3,10 +3,19 @@ Calendar service for generating iCal files and managing calendar events
 """
 
 from icalendar import Calendar, Event, Alarm
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Optional, Tuple
+import hashlib
+import threading
 import pytz
 
+# .ics bytes per (retrospective id, updated_at); a retrospective edit bumps updated_at
+# and therefore misses the cache. Bounded LRU shared by all CalendarService instances.
+_ICS_CACHE_MAX_ENTRIES = 512
+_ics_cache: "OrderedDict[Tuple[int, str], bytes]" = OrderedDict()
+_ics_cache_lock = threading.Lock()
+
 
 class CalendarService:
     """Service for generating calendar events"""
@@ -119,6 +128,57 @@ class CalendarService:
             reminder_minutes=15
         )
     
+    @staticmethod
+    def _calendar_cache_key(retrospective) -> Tuple[int, str]:
+        version = retrospective.updated_at or retrospective.created_at
+        return (retrospective.id, version.isoformat() if version else "")
+    
+    def cached_retrospective_calendar(self, retrospective) -> Optional[bytes]:
+        """Cached .ics bytes for this version of the retrospective, or None"""
+        key = self._calendar_cache_key(retrospective)
+        with _ics_cache_lock:
+            cached = _ics_cache.get(key)
+            if cached is not None:
+                _ics_cache.move_to_end(key)
+            return cached
+    
+    def get_retrospective_calendar(
+        self,
+        retrospective,
+        workspace_name: str,
+        facilitator_name: str = None
+    ) -> bytes:
+        """
+        Cached generate_retrospective_calendar for a Retrospective row
+        
+        Keyed by retrospective id and updated_at (created_at until the first edit).
+        """
+        cached = self.cached_retrospective_calendar(retrospective)
+        if cached is not None:
+            return cached
+        
+        ics_content = self.generate_retrospective_calendar(
+            retrospective_id=retrospective.id,
+            title=retrospective.title,
+            sprint_name=retrospective.sprint_name or "Sprint",
+            start_time=retrospective.scheduled_start_time,
+            end_time=retrospective.scheduled_end_time,
+            workspace_name=workspace_name,
+            facilitator_name=facilitator_name
+        )
+        
+        key = self._calendar_cache_key(retrospective)
+        with _ics_cache_lock:
+            _ics_cache[key] = ics_content
+            _ics_cache.move_to_end(key)
+            while len(_ics_cache) > _ICS_CACHE_MAX_ENTRIES:
+                _ics_cache.popitem(last=False)
+        return ics_content
+    
+    @staticmethod
+    def calendar_etag(ics_content: bytes) -> str:
+        return '"' + hashlib.sha256(ics_content).hexdigest()[:32] + '"'
+    
     def generate_google_calendar_url(
         self,
         title: str,
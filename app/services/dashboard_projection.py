@@ -0,0 +1,247 @@
+"""
+Per-user dashboard projection (GET /api/v1/retrospectives/user/dashboard).
+
+Keeps, per user, the columns of their open retrospectives (scheduled / in_progress), the
+latest DASHBOARD_COMPLETED_LIMIT completed ones and the completed count. It is built with
+three queries on first use and then maintained from events instead of being rebuilt:
+  - Retrospective updates (start, advance-phase, complete, edits) patch the row in every
+    projection holding it and move it between buckets, once the transaction commits.
+  - Participant changes and deleted retrospectives drop the affected projections.
+Each change bumps the projection's version; the route derives a content ETag from it so
+repeat polls get a 304 without a database round trip.
+
+Like auth_cache this is per process. Changes made by other processes are picked up when
+the entry expires (DASHBOARD_CACHE_TTL_SECONDS); 0 disables the projection.
+"""
+
+import itertools
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+from sqlalchemy import event, func, inspect
+from sqlalchemy.orm import Session, object_session
+
+from app.core.config import settings
+from app.models.retrospective_new import Retrospective, RetrospectiveParticipant
+
+ACTIVE_STATUSES = ("scheduled", "in_progress")
+_CHANGES_KEY = "dashboard_projection_changes"
+_RECENT_CHANGES = 1024
+
+_versions = itertools.count(1)
+_lock = threading.Lock()
+_projections: "OrderedDict[int, DashboardProjection]" = OrderedDict()
+_by_retro: Dict[int, Set[int]] = {}
+# (epoch, retro_ids, user_ids) of recently applied changes, to reject builds that raced them
+_recent: deque = deque(maxlen=_RECENT_CHANGES)
+_epoch = 0
+
+
+class DashboardProjection:
+    """One user's dashboard rows. Never modified once stored; updates store a new instance."""
+
+    __slots__ = ("user_id", "active", "completed", "completed_total", "version", "expires_at", "rendered")
+
+    def __init__(
+        self,
+        user_id: int,
+        active: List[Dict],
+        completed: List[Dict],
+        completed_total: int,
+        expires_at: Optional[float] = None
+    ):
+        self.user_id = user_id
+        self.active = active
+        self.completed = completed
+        self.completed_total = completed_total
+        self.version = next(_versions)
+        self.expires_at = expires_at or time.monotonic() + settings.DASHBOARD_CACHE_TTL_SECONDS
+        self.rendered: Dict[Any, Any] = {}  # route-side cache of serialized bodies for this version
+
+    def retro_ids(self) -> Set[int]:
+        return {row["id"] for row in self.active} | {row["id"] for row in self.completed}
+
+
+def _build(db: Session, user_id: int, columns: Sequence[str]) -> DashboardProjection:
+    base = db.query(*[getattr(Retrospective, c) for c in columns]).join(
+        RetrospectiveParticipant,
+        RetrospectiveParticipant.retrospective_id == Retrospective.id
+    ).filter(RetrospectiveParticipant.user_id == user_id)
+
+    active = base.filter(
+        Retrospective.status.in_(ACTIVE_STATUSES)
+    ).order_by(Retrospective.scheduled_start_time.desc()).all()
+    completed = base.filter(
+        Retrospective.status == "completed"
+    ).order_by(Retrospective.id.desc()).limit(settings.DASHBOARD_COMPLETED_LIMIT).all()
+    completed_total = db.query(func.count(RetrospectiveParticipant.id)).join(
+        Retrospective, Retrospective.id == RetrospectiveParticipant.retrospective_id
+    ).filter(
+        RetrospectiveParticipant.user_id == user_id,
+        Retrospective.status == "completed"
+    ).scalar() or 0
+
+    return DashboardProjection(
+        user_id,
+        [dict(row._mapping) for row in active],
+        [dict(row._mapping) for row in completed],
+        completed_total
+    )
+
+
+def _drop(user_id: int) -> None:
+    projection = _projections.pop(user_id, None)
+    if projection is None:
+        return
+    for retro_id in projection.retro_ids():
+        users = _by_retro.get(retro_id)
+        if users is not None:
+            users.discard(user_id)
+            if not users:
+                del _by_retro[retro_id]
+
+
+def _store(projection: DashboardProjection, started_epoch: int) -> None:
+    retro_ids = projection.retro_ids()
+    with _lock:
+        # A change committed while we were querying may be missing from the rows
+        if _recent and _recent[0][0] > started_epoch + 1:
+            return  # the changes since started_epoch are no longer all in _recent
+        for epoch, changed_retros, changed_users in _recent:
+            if epoch > started_epoch and (projection.user_id in changed_users or changed_retros & retro_ids):
+                return
+        _drop(projection.user_id)
+        _projections[projection.user_id] = projection
+        for retro_id in retro_ids:
+            _by_retro.setdefault(retro_id, set()).add(projection.user_id)
+        while len(_projections) > settings.DASHBOARD_CACHE_MAX_USERS:
+            _drop(next(iter(_projections)))
+
+
+def get_dashboard(db: Session, user_id: int, columns: Sequence[str]) -> DashboardProjection:
+    """The user's projection, built from the database when missing or expired."""
+    with _lock:
+        projection = _projections.get(user_id)
+        if projection is not None and projection.expires_at > time.monotonic():
+            _projections.move_to_end(user_id)
+            return projection
+        started_epoch = _epoch
+
+    projection = _build(db, user_id, columns)
+    if settings.DASHBOARD_CACHE_TTL_SECONDS > 0:
+        _store(projection, started_epoch)
+    return projection
+
+
+def _insert_completed(completed: List[Dict], row: Dict) -> List[Dict]:
+    rows = [r for r in completed if r["id"] != row["id"]] + [row]
+    rows.sort(key=lambda r: r["id"], reverse=True)
+    return rows[:settings.DASHBOARD_COMPLETED_LIMIT]
+
+
+def _patch(projection: DashboardProjection, retro_id: int, values: Dict[str, Any]) -> Optional[DashboardProjection]:
+    """The projection with an update applied; None when it can't be patched and must be rebuilt."""
+    was_completed = False
+    current = next((r for r in projection.active if r["id"] == retro_id), None)
+    if current is None:
+        current = next((r for r in projection.completed if r["id"] == retro_id), None)
+        was_completed = True
+    if current is None:
+        return projection
+    row = {**current, **{k: v for k, v in values.items() if k in current}}
+
+    status = row.get("status")
+    active, completed, completed_total = projection.active, projection.completed, projection.completed_total
+    if was_completed:
+        if status != "completed":
+            return None  # Reopened or cancelled: a truncated completed list can't be refilled
+        completed = [row if r["id"] == retro_id else r for r in completed]
+    else:
+        active = [r for r in active if r["id"] != retro_id]
+        if status in ACTIVE_STATUSES:
+            active.append(row)
+            active.sort(key=lambda r: (r.get("scheduled_start_time") is not None, r.get("scheduled_start_time") or 0),
+                        reverse=True)
+        elif status == "completed":
+            completed = _insert_completed(completed, row)
+            completed_total += 1
+    return DashboardProjection(projection.user_id, active, completed, completed_total, projection.expires_at)
+
+
+def _apply(changes: List[tuple]) -> None:
+    global _epoch
+    with _lock:
+        _epoch += 1
+        changed_retros: Set[int] = set()
+        changed_users: Set[int] = set()
+        for kind, key, values in changes:
+            if kind == "retro":
+                changed_retros.add(key)
+                for user_id in list(_by_retro.get(key, ())):
+                    projection = _projections.get(user_id)
+                    if projection is None:
+                        continue
+                    patched = _patch(projection, key, values)
+                    if patched is None:
+                        _drop(user_id)
+                    else:
+                        _projections[user_id] = patched
+            elif kind == "retro_deleted":
+                changed_retros.add(key)
+                for user_id in list(_by_retro.get(key, ())):
+                    _drop(user_id)
+            else:  # "user"
+                changed_users.add(key)
+                _drop(key)
+        _recent.append((_epoch, changed_retros, changed_users))
+
+
+def _queue(session: Optional[Session], change: tuple) -> None:
+    if session is not None:
+        session.info.setdefault(_CHANGES_KEY, []).append(change)
+
+
+def participants_changed(db: Session, user_ids: Iterable[int]) -> None:
+    """Mark users whose retrospective membership changed outside the ORM (bulk inserts)."""
+    for user_id in user_ids:
+        _queue(db, ("user", user_id, None))
+
+
+def clear() -> None:
+    with _lock:
+        _projections.clear()
+        _by_retro.clear()
+
+
+@event.listens_for(Retrospective, "after_update")
+def _retro_updated(mapper, connection, target) -> None:
+    # Only loaded attributes: reading an expired one here would issue SQL mid-flush
+    loaded = inspect(target).dict
+    values = {key: loaded[key] for key in mapper.column_attrs.keys() if key in loaded}
+    _queue(object_session(target), ("retro", target.id, values))
+
+
+@event.listens_for(Retrospective, "after_delete")
+def _retro_deleted(mapper, connection, target) -> None:
+    _queue(object_session(target), ("retro_deleted", target.id, None))
+
+
+@event.listens_for(RetrospectiveParticipant, "after_insert")
+@event.listens_for(RetrospectiveParticipant, "after_delete")
+def _participant_changed(mapper, connection, target) -> None:
+    _queue(object_session(target), ("user", target.user_id, None))
+
+
+@event.listens_for(Session, "after_commit")
+def _session_committed(session) -> None:
+    changes = session.info.pop(_CHANGES_KEY, None)
+    if changes:
+        _apply(changes)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _session_rolled_back(session, previous_transaction) -> None:
+    if not previous_transaction.nested:
+        session.info.pop(_CHANGES_KEY, None)
@@ -0,0 +1,281 @@
+"""
+Email outbox delivery worker
+
+Delivers EmailOutbox rows through a small pool of long-lived, authenticated SMTP
+connections instead of one connect/STARTTLS/login per message.
+
+Run continuously:
+    python -m app.services.email_outbox_worker
+or trigger a single pass (e.g. from a BackgroundTask or cron):
+    EmailOutboxWorker().run_once()
+"""
+
+import base64
+import logging
+import queue
+import random
+import smtplib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, or_
+
+from app.core import metrics
+from app.core.config import settings
+from app.database.database import SessionLocal, is_postgres
+from app.models.email_outbox import EmailOutbox
+from app.services.email_service import EmailService
+
+logger = logging.getLogger(__name__)
+
+# A claimed row is leased for this long; if the worker dies mid-send it becomes due again.
+CLAIM_LEASE = timedelta(minutes=10)
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 3600
+
+# Errors that will not succeed on retry
+PERMANENT_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPNotSupportedError)
+
+
+class SMTPConnectionPool:
+    """Bounded pool of reusable SMTP connections (opened lazily, dropped on error)."""
+
+    def __init__(self, email_service: EmailService, size: int):
+        self.email_service = email_service
+        self.size = max(1, size)
+        self._idle: "queue.LifoQueue[smtplib.SMTP]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self.connections_opened = 0
+
+    @contextmanager
+    def connection(self):
+        self._slots.acquire()
+        conn = None
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self.email_service.open_connection()
+                self.connections_opened += 1
+            yield conn
+        except Exception:
+            if conn is not None:
+                self._close(conn)
+                conn = None
+            raise
+        finally:
+            if conn is not None:
+                self._idle.put(conn)
+            self._slots.release()
+
+    @staticmethod
+    def _close(conn: smtplib.SMTP) -> None:
+        try:
+            conn.quit()
+        except Exception:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def close_all(self) -> None:
+        while True:
+            try:
+                self._close(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+
+def retry_delay_seconds(attempts: int) -> float:
+    """Exponential backoff with jitter for the next delivery attempt."""
+    delay = min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0)))
+    return delay * random.uniform(0.8, 1.2)
+
+
+class EmailOutboxWorker:
+    """Claims due outbox rows in batches and delivers them in parallel."""
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        email_service: Optional[EmailService] = None,
+        pool_size: Optional[int] = None,
+        batch_size: Optional[int] = None
+    ):
+        self.session_factory = session_factory
+        self.email_service = email_service or EmailService()
+        self.pool = SMTPConnectionPool(self.email_service, pool_size or settings.EMAIL_WORKER_POOL_SIZE)
+        self.batch_size = batch_size or settings.EMAIL_WORKER_BATCH_SIZE
+
+    def claim_due(self, db) -> List[Dict[str, Any]]:
+        """Lease up to batch_size due rows and return plain copies of them."""
+        now = datetime.now(timezone.utc)
+        query = db.query(EmailOutbox).filter(
+            or_(EmailOutbox.status == "pending", EmailOutbox.status == "sending"),
+            EmailOutbox.next_attempt_at <= now
+        ).order_by(EmailOutbox.next_attempt_at).limit(self.batch_size)
+        if is_postgres:
+            # Lets several workers run side by side without double-sending
+            query = query.with_for_update(skip_locked=True)
+
+        claimed = []
+        for row in query.all():
+            row.status = "sending"
+            row.attempts = (row.attempts or 0) + 1
+            row.next_attempt_at = now + CLAIM_LEASE
+            claimed.append({
+                "id": row.id,
+                "to_email": row.to_email,
+                "subject": row.subject,
+                "html_content": row.html_content,
+                "text_content": row.text_content,
+                "attachments": row.attachments or [],
+                "attempts": row.attempts,
+                "max_attempts": row.max_attempts or settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+            })
+        db.commit()
+        return claimed
+
+    def _send_one(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        attachments = [
+            (a["filename"], base64.b64decode(a["content_b64"]), a["mime_type"])
+            for a in item["attachments"]
+        ]
+        try:
+            if not settings.ENABLE_EMAIL_NOTIFICATIONS:
+                # Same console-only behaviour as EmailService.send_email
+                self.email_service.send_email(item["to_email"], item["subject"], item["html_content"], item["text_content"], attachments)
+                return {"id": item["id"], "status": "sent", "error": None}
+
+            msg = self.email_service.build_message(
+                item["to_email"], item["subject"], item["html_content"], item["text_content"], attachments
+            )
+            try:
+                with self.pool.connection() as conn:
+                    conn.send_message(msg)
+            except smtplib.SMTPServerDisconnected:
+                # Idle pooled connection was dropped by the server; one retry on a fresh one
+                with self.pool.connection() as conn:
+                    conn.send_message(msg)
+            return {"id": item["id"], "status": "sent", "error": None}
+        except PERMANENT_ERRORS as e:
+            return {"id": item["id"], "status": "failed", "error": str(e), "permanent": True}
+        except Exception as e:
+            return {"id": item["id"], "status": "failed", "error": str(e), "permanent": False}
+
+    def record_results(self, db, claimed: List[Dict[str, Any]], results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        by_id = {item["id"]: item for item in claimed}
+        now = datetime.now(timezone.utc)
+        rows = {r.id: r for r in db.query(EmailOutbox).filter(EmailOutbox.id.in_(list(by_id))).all()}
+        report = []
+        for result in results:
+            row = rows.get(result["id"])
+            if row is None:
+                continue
+            item = by_id[result["id"]]
+            if result["status"] == "sent":
+                row.status = "sent"
+                row.sent_at = now
+                row.last_error = None
+            elif result.get("permanent") or item["attempts"] >= item["max_attempts"]:
+                row.status = "failed"
+                row.last_error = result["error"]
+            else:
+                row.status = "pending"
+                row.last_error = result["error"]
+                row.next_attempt_at = now + timedelta(seconds=retry_delay_seconds(item["attempts"]))
+            report.append({
+                "id": row.id,
+                "to_email": row.to_email,
+                "status": row.status,
+                "attempts": item["attempts"],
+                "error": row.last_error,
+            })
+        db.commit()
+        return report
+
+    def run_once(self) -> List[Dict[str, Any]]:
+        """
+        Deliver one batch of due emails.
+
+        Returns per-message status: [{"id", "to_email", "status": sent|pending|failed, "attempts", "error"}]
+        """
+        db = self.session_factory()
+        try:
+            claimed = self.claim_due(db)
+            if not claimed:
+                return []
+            with ThreadPoolExecutor(max_workers=self.pool.size, thread_name_prefix="email-outbox") as executor:
+                results = list(executor.map(self._send_one, claimed))
+            report = self.record_results(db, claimed, results)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        sent = sum(1 for r in report if r["status"] == "sent")
+        logger.info(f"📧 Email outbox: {sent}/{len(report)} delivered")
+        return report
+
+    def run_until_empty(self, max_batches: int = 50) -> List[Dict[str, Any]]:
+        report: List[Dict[str, Any]] = []
+        for _ in range(max_batches):
+            batch = self.run_once()
+            if not batch:
+                break
+            report.extend(batch)
+        return report
+
+    def run_forever(self, poll_seconds: Optional[float] = None) -> None:
+        poll = poll_seconds or settings.EMAIL_WORKER_POLL_SECONDS
+        logger.info("Email outbox worker started")
+        try:
+            while True:
+                try:
+                    batch = self.run_once()
+                except Exception as e:
+                    logger.error(f"❌ Email outbox pass failed: {e}")
+                    batch = []
+                if len(batch) < self.batch_size:
+                    time.sleep(poll)
+        finally:
+            self.pool.close_all()
+
+
+def deliver_pending_emails() -> None:
+    """Drain the outbox once; used as a FastAPI BackgroundTask so single-process deployments send promptly."""
+    worker = EmailOutboxWorker()
+    try:
+        worker.run_until_empty()
+    except Exception as e:
+        logger.error(f"❌ Email outbox delivery failed: {e}")
+    finally:
+        worker.pool.close_all()
+
+
+def _outbox_depth_samples():
+    """Undelivered outbox rows by status, for /metrics (sent rows are history, not queue)."""
+    db = SessionLocal()
+    try:
+        counts = dict(db.query(EmailOutbox.status, func.count(EmailOutbox.id)).filter(
+            EmailOutbox.status.in_(("pending", "sending", "failed"))
+        ).group_by(EmailOutbox.status).all())
+    finally:
+        db.close()
+    yield (
+        "email_outbox_depth", "gauge", "Email outbox rows not yet delivered",
+        [({"status": status}, counts.get(status, 0)) for status in ("pending", "sending", "failed")],
+    )
+
+
+metrics.register_collector(_outbox_depth_samples)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    EmailOutboxWorker().run_forever()
@@ -9,9 +9,11 @@ from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
 from app.core.config import settings
+from app.services.email_templates import BoundEmailTemplate, CALENDAR_INVITE_TEMPLATE
 import logging
 import secrets
-from datetime import datetime, timedelta
+import base64
+from datetime import datetime, timedelta, timezone
 
 logger = logging.getLogger(__name__)
 
@@ -76,41 +78,9 @@ class EmailService:
                     logger.info("="*60)
                 return True
             
-            msg = MIMEMultipart('alternative')
-            msg['Subject'] = subject
-            msg['From'] = f"{self.from_name} <{self.from_email}>"
-            msg['To'] = to_email
+            msg = self.build_message(to_email, subject, html_content, text_content, attachments)
             
-            if text_content:
-                msg.attach(MIMEText(text_content, 'plain'))
-            msg.attach(MIMEText(html_content, 'html'))
-            
-            # Add attachments
-            if attachments:
-                for filename, content, mime_type in attachments:
-                    # Handle different content types
-                    if isinstance(content, bytes):
-                        # For binary content like .ics files
-                        part = MIMEBase('application', 'octet-stream')
-                        part.set_payload(content)
-                        encoders.encode_base64(part)
-                    else:
-                        # For text content
-                        part = MIMEBase('application', mime_type)
-                        part.set_payload(content)
-                        encoders.encode_base64(part)
-                    
-                    part.add_header(
-                        'Content-Disposition',
-                        f'attachment; filename="{filename}"'
-                    )
-                    part.add_header('Content-Type', f'{mime_type}; name="{filename}"')
-                    msg.attach(part)
-            
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()
-                if self.smtp_user and self.smtp_password:
-                    server.login(self.smtp_user, self.smtp_password)
+            with self.open_connection() as server:
                 server.send_message(msg)
             
             logger.info(f"✅ Email sent successfully to {to_email}")
@@ -120,8 +90,145 @@ class EmailService:
             logger.error(f"❌ Failed to send email to {to_email}: {e}")
             return False
     
+    def build_message(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: Optional[str] = None,
+        attachments: Optional[List[tuple]] = None
+    ) -> MIMEMultipart:
+        """Build the MIME message (attachments: list of (filename, content, mime_type))"""
+        msg = MIMEMultipart('alternative')
+        msg['Subject'] = subject
+        msg['From'] = f"{self.from_name} <{self.from_email}>"
+        msg['To'] = to_email
+        
+        if text_content:
+            msg.attach(MIMEText(text_content, 'plain'))
+        msg.attach(MIMEText(html_content, 'html'))
+        
+        # Add attachments
+        if attachments:
+            for filename, content, mime_type in attachments:
+                # Handle different content types
+                if isinstance(content, bytes):
+                    # For binary content like .ics files
+                    part = MIMEBase('application', 'octet-stream')
+                    part.set_payload(content)
+                    encoders.encode_base64(part)
+                else:
+                    # For text content
+                    part = MIMEBase('application', mime_type)
+                    part.set_payload(content)
+                    encoders.encode_base64(part)
+                
+                part.add_header(
+                    'Content-Disposition',
+                    f'attachment; filename="{filename}"'
+                )
+                part.add_header('Content-Type', f'{mime_type}; name="{filename}"')
+                msg.attach(part)
+        
+        return msg
+    
+    def open_connection(self) -> smtplib.SMTP:
+        """
+        Open an authenticated SMTP connection (STARTTLS when SMTP_USE_TLS is set).
+        
+        The outbox worker keeps these open and sends many messages per connection.
+        """
+        server = smtplib.SMTP(self.smtp_host, self.smtp_port, timeout=settings.SMTP_TIMEOUT_SECONDS)
+        try:
+            server.ehlo()
+            if settings.SMTP_USE_TLS:
+                # Raises SMTPNotSupportedError if the server does not offer STARTTLS,
+                # rather than sending the credentials in the clear
+                server.starttls()
+                server.ehlo()
+            if self.smtp_user and self.smtp_password:
+                server.login(self.smtp_user, self.smtp_password)
+        except Exception:
+            server.close()
+            raise
+        return server
+    
+    @staticmethod
+    def encode_attachments(attachments: List[tuple]) -> List[dict]:
+        """(filename, content, mime_type) tuples -> JSON-safe dicts stored on EmailOutbox rows"""
+        encoded = []
+        for filename, content, mime_type in attachments:
+            raw = content if isinstance(content, bytes) else str(content).encode("utf-8")
+            encoded.append({
+                "filename": filename,
+                "mime_type": mime_type,
+                "content_b64": base64.b64encode(raw).decode("ascii"),
+            })
+        return encoded
+    
+    def outbox_row(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        text_content: Optional[str] = None,
+        attachments: Optional[List[tuple]] = None,
+        kind: str = "generic",
+        retrospective_id: Optional[int] = None,
+        encoded_attachments: Optional[List[dict]] = None
+    ) -> dict:
+        """
+        Column values for one EmailOutbox row.
+        
+        When many rows share the same attachment, pass encode_attachments(...) once as
+        encoded_attachments instead of re-encoding it per recipient.
+        """
+        stored_attachments = encoded_attachments
+        if stored_attachments is None and attachments:
+            stored_attachments = self.encode_attachments(attachments)
+        
+        return {
+            "kind": kind,
+            "retrospective_id": retrospective_id,
+            "to_email": to_email,
+            "subject": subject,
+            "html_content": html_content,
+            "text_content": text_content,
+            "attachments": stored_attachments,
+            "status": "pending",
+            "attempts": 0,
+            "max_attempts": settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+            "next_attempt_at": datetime.now(timezone.utc),
+        }
+    
+    def enqueue_email(self, db, to_email: str, subject: str, html_content: str, **kwargs):
+        """
+        Queue an email in the outbox as part of the caller's transaction (no commit here).
+        
+        Delivered by app/services/email_outbox_worker.py. Accepts the same options as outbox_row.
+        """
+        from app.models.email_outbox import EmailOutbox
+        
+        row = EmailOutbox(**self.outbox_row(to_email, subject, html_content, **kwargs))
+        db.add(row)
+        return row
+    
+    def enqueue_emails(self, db, rows: List[dict]) -> int:
+        """Queue many outbox_row(...) values with a single multi-row INSERT (no commit here)."""
+        from sqlalchemy import insert
+        from app.models.email_outbox import EmailOutbox
+        
+        if rows:
+            db.execute(insert(EmailOutbox), rows)
+        return len(rows)
+
     def send_verification_email(self, to_email: str, verification_link: str, full_name: str) -> bool:
         """Send email verification link"""
+        subject, html_content, text_content = self.render_verification_email(verification_link, full_name)
+        return self.send_email(to_email, subject, html_content, text_content)
+    
+    def render_verification_email(self, verification_link: str, full_name: str) -> tuple:
+        """Render the verification email; returns (subject, html_content, text_content)"""
         subject = "Please verify your email to activate your YodaAI account"
         
         html_content = f"""
@@ -238,7 +345,7 @@ class EmailService:
         © 2025 All rights reserved
         """
         
-        return self.send_email(to_email, subject, html_content, text_content)
+        return subject, html_content, text_content
     
     @staticmethod
     def generate_verification_token() -> str:
@@ -264,134 +371,16 @@ class EmailService:
         retro_link: str
     ) -> bool:
         """Send calendar invite email with .ics attachment"""
-        
-        # Convert to Kenya time for display
-        from app.services.timezone_utils import format_kenya_datetime, utc_to_kenya_time
-        
-        kenya_start = utc_to_kenya_time(start_time)
-        kenya_end = utc_to_kenya_time(end_time)
-        
-        # Format dates in Kenya time
-        start_date = format_kenya_datetime(start_time, "%B %d, %Y")
-        start_time_str = format_kenya_datetime(start_time, "%I:%M %p EAT")
-        end_time_str = format_kenya_datetime(end_time, "%I:%M %p EAT")
-        
-        subject = f"📅 {retrospective_title} - Retrospective Scheduled for {start_date}"
-        
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>Retrospective Calendar Invite</title>
-            <style>
-                body {{ font-family: 'Segoe UI', Arial, sans-serif; line-height: 1.6; color: #333; margin: 0; padding: 0; background-color: #f4f4f4; }}
-                .email-wrapper {{ max-width: 600px; margin: 20px auto; background: white; border-radius: 10px; overflow: hidden; box-shadow: 0 4px 6px rgba(0,0,0,0.1); }}
-                .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 40px 30px; text-align: center; }}
-                .header h1 {{ margin: 0; font-size: 24px; font-weight: 600; }}
-                .content {{ padding: 40px 30px; }}
-                .event-info {{ background: #f8f9fa; border-radius: 8px; padding: 25px; margin: 25px 0; }}
-                .event-row {{ display: flex; margin: 15px 0; align-items: flex-start; }}
-                .event-icon {{ font-size: 24px; margin-right: 15px; min-width: 30px; }}
-                .event-details {{ flex: 1; }}
-                .event-label {{ font-weight: 600; color: #667eea; margin-bottom: 5px; font-size: 13px; text-transform: uppercase; }}
-                .event-value {{ font-size: 16px; color: #333; }}
-                .calendar-buttons {{ margin: 30px 0; text-align: center; }}
-                .calendar-button {{ display: inline-block; margin: 8px; padding: 14px 28px; background: #667eea; color: white; text-decoration: none; border-radius: 8px; font-weight: 600; font-size: 14px; }}
-                .calendar-button:hover {{ background: #5568d3; }}
-                .note {{ background: #e7f3ff; border-left: 4px solid #2196F3; padding: 15px; margin: 25px 0; border-radius: 4px; font-size: 14px; color: #0c5460; }}
-                .footer {{ background: #f8f9fa; padding: 25px; text-align: center; color: #666; font-size: 13px; border-top: 1px solid #e0e0e0; }}
-            </style>
-        </head>
-        <body>
-            <div class="email-wrapper">
-                <div class="header">
-                    <h1>📅 Retrospective Scheduled</h1>
-                    <p style="margin: 10px 0 0 0; opacity: 0.95;">Add to your calendar</p>
-                </div>
-                
-                <div class="content">
-                    <p style="font-size: 18px; font-weight: 600; color: #333;">Hello {full_name}!</p>
-                    
-                    <p style="color: #555; font-size: 16px;">
-                        A new retrospective has been scheduled for your workspace. Add it to your calendar to receive reminders!
-                    </p>
-                    
-                    <div class="event-info">
-                        <div class="event-row">
-                            <div class="event-icon">📋</div>
-                            <div class="event-details">
-                                <div class="event-label">Title</div>
-                                <div class="event-value"><strong>{retrospective_title}</strong></div>
-                            </div>
-                        </div>
-                        
-                        <div class="event-row">
-                            <div class="event-icon">🏃</div>
-                            <div class="event-details">
-                                <div class="event-label">Sprint</div>
-                                <div class="event-value">{sprint_name}</div>
-                            </div>
-                        </div>
-                        
-                        <div class="event-row">
-                            <div class="event-icon">👥</div>
-                            <div class="event-details">
-                                <div class="event-label">Workspace</div>
-                                <div class="event-value">{workspace_name}</div>
-                            </div>
-                        </div>
-                        
-                        <div class="event-row">
-                            <div class="event-icon">👤</div>
-                            <div class="event-details">
-                                <div class="event-label">Facilitator</div>
-                                <div class="event-value">{facilitator_name}</div>
-                            </div>
-                        </div>
-                        
-                        <div class="event-row">
-                            <div class="event-icon">📅</div>
-                            <div class="event-details">
-                                <div class="event-label">Date</div>
-                                <div class="event-value">{start_date}</div>
-                            </div>
-                        </div>
-                        
-                        <div class="event-row">
-                            <div class="event-icon">🕐</div>
-                            <div class="event-details">
-                                <div class="event-label">Time</div>
-                                <div class="event-value">{start_time_str} - {end_time_str}</div>
-                            </div>
-                        </div>
-                    </div>
-                    
-                    <div class="calendar-buttons">
-                        <a href="{retro_link}" class="calendar-button" style="background: #667eea;">View in YodaAI</a>
-                    </div>
-                    
-                    <div class="note">
-                        <strong>📎 Calendar Attachment:</strong> We've attached a calendar file (.ics) to this email. Simply double-click the attachment to add this event to your calendar, or drag it into your calendar app. The event includes a 15-minute reminder!
-                    </div>
-                    
-                    <p style="color: #555; font-size: 14px; margin-top: 25px;">
-                        <strong>What to expect:</strong> This retrospective will help your team reflect on the sprint using the 4Ls framework (Liked, Learned, Lacked, Longed for). AI will help facilitate the discussion and capture insights.
-                    </p>
-                </div>
-                
-                <div class="footer">
-                    <p><strong>YodaAI</strong></p>
-                    <p>AI-Powered Retrospective Assistant for Agile Teams</p>
-                    <p style="margin-top: 15px; font-size: 11px; color: #999;">
-                        © 2025 YodaAI. All rights reserved.
-                    </p>
-                </div>
-            </div>
-        </body>
-        </html>
-        """
+        subject, html_content = self.render_calendar_invite_email(
+            full_name=full_name,
+            retrospective_title=retrospective_title,
+            sprint_name=sprint_name,
+            start_time=start_time,
+            end_time=end_time,
+            workspace_name=workspace_name,
+            facilitator_name=facilitator_name,
+            retro_link=retro_link
+        )
         
         # Send email with .ics attachment
         try:
@@ -410,6 +399,59 @@ class EmailService:
             print(f"   iCal content preview: {ics_content[:100]}...")
             return False
 
+    def calendar_invite_template(
+        self,
+        retrospective_title: str,
+        sprint_name: str,
+        start_time: datetime,
+        end_time: datetime,
+        workspace_name: str,
+        facilitator_name: str,
+        retro_link: str
+    ) -> BoundEmailTemplate:
+        """
+        Render the retrospective-wide parts of the calendar invite once.
+        
+        The result only needs full_name per recipient: .render(full_name=...) -> (subject, html_content)
+        """
+        # Convert to Kenya time for display
+        from app.services.timezone_utils import format_kenya_datetime
+        
+        return CALENDAR_INVITE_TEMPLATE.bind(
+            retrospective_title=retrospective_title,
+            sprint_name=sprint_name,
+            workspace_name=workspace_name,
+            facilitator_name=facilitator_name,
+            retro_link=retro_link,
+            # Format dates in Kenya time
+            start_date=format_kenya_datetime(start_time, "%B %d, %Y"),
+            start_time_str=format_kenya_datetime(start_time, "%I:%M %p EAT"),
+            end_time_str=format_kenya_datetime(end_time, "%I:%M %p EAT"),
+        )
+
+    def render_calendar_invite_email(
+        self,
+        full_name: str,
+        retrospective_title: str,
+        sprint_name: str,
+        start_time: datetime,
+        end_time: datetime,
+        workspace_name: str,
+        facilitator_name: str,
+        retro_link: str
+    ) -> tuple:
+        """Render the calendar invite email; returns (subject, html_content)"""
+        template = self.calendar_invite_template(
+            retrospective_title=retrospective_title,
+            sprint_name=sprint_name,
+            start_time=start_time,
+            end_time=end_time,
+            workspace_name=workspace_name,
+            facilitator_name=facilitator_name,
+            retro_link=retro_link
+        )
+        return template.render(full_name=full_name)
+
 
 # Singleton instance
 email_service = EmailService()
@@ -0,0 +1,206 @@
+"""
+Precompiled HTML email templates
+
+Templates use string.Template ($name) placeholders, so CSS braces need no escaping.
+Bulk emails bind the shared fields once (bind) and substitute only the per-recipient
+fields for each message (render).
+"""
+
+from string import Template
+from typing import Dict, Tuple
+
+
+def _escape(value) -> str:
+    # Bound values must not be re-read as placeholders by the second substitution
+    return str(value).replace("$", "$$")
+
+
+class BoundEmailTemplate:
+    """A template with its shared fields filled in; only per-recipient fields remain."""
+
+    def __init__(self, subject: Template, html: Template):
+        self.subject = subject
+        self.html = html
+
+    def render(self, **fields) -> Tuple[str, str]:
+        """Returns (subject, html_content); raises KeyError if a field is missing."""
+        return self.subject.substitute(fields), self.html.substitute(fields)
+
+
+class EmailTemplate:
+    """An email subject + HTML body compiled once at import time."""
+
+    def __init__(self, name: str, subject: str, html: str):
+        self.name = name
+        self.subject = Template(subject)
+        self.html = Template(html)
+
+    def bind(self, **shared) -> BoundEmailTemplate:
+        escaped: Dict[str, str] = {k: _escape(v) for k, v in shared.items()}
+        return BoundEmailTemplate(
+            Template(self.subject.safe_substitute(escaped)),
+            Template(self.html.safe_substitute(escaped)),
+        )
+
+    def render(self, **fields) -> Tuple[str, str]:
+        return self.subject.substitute(fields), self.html.substitute(fields)
+
+
+CALENDAR_INVITE_TEMPLATE = EmailTemplate(
+    name="calendar_invite",
+    subject="📅 ${retrospective_title} - Retrospective Scheduled for ${start_date}",
+    html="""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="UTF-8">
+            <meta name="viewport" content="width=device-width, initial-scale=1.0">
+            <title>Retrospective Calendar Invite</title>
+            <style>
+                body { font-family: 'Segoe UI', Arial, sans-serif; line-height: 1.6; color: #333; margin: 0; padding: 0; background-color: #f4f4f4; }
+                .email-wrapper { max-width: 600px; margin: 20px auto; background: white; border-radius: 10px; overflow: hidden; box-shadow: 0 4px 6px rgba(0,0,0,0.1); }
+                .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 40px 30px; text-align: center; }
+                .header h1 { margin: 0; font-size: 24px; font-weight: 600; }
+                .content { padding: 40px 30px; }
+                .event-info { background: #f8f9fa; border-radius: 8px; padding: 25px; margin: 25px 0; }
+                .event-row { display: flex; margin: 15px 0; align-items: flex-start; }
+                .event-icon { font-size: 24px; margin-right: 15px; min-width: 30px; }
+                .event-details { flex: 1; }
+                .event-label { font-weight: 600; color: #667eea; margin-bottom: 5px; font-size: 13px; text-transform: uppercase; }
+                .event-value { font-size: 16px; color: #333; }
+                .calendar-buttons { margin: 30px 0; text-align: center; }
+                .calendar-button { display: inline-block; margin: 8px; padding: 14px 28px; background: #667eea; color: white; text-decoration: none; border-radius: 8px; font-weight: 600; font-size: 14px; }
+                .calendar-button:hover { background: #5568d3; }
+                .note { background: #e7f3ff; border-left: 4px solid #2196F3; padding: 15px; margin: 25px 0; border-radius: 4px; font-size: 14px; color: #0c5460; }
+                .footer { background: #f8f9fa; padding: 25px; text-align: center; color: #666; font-size: 13px; border-top: 1px solid #e0e0e0; }
+            </style>
+        </head>
+        <body>
+            <div class="email-wrapper">
+                <div class="header">
+                    <h1>📅 Retrospective Scheduled</h1>
+                    <p style="margin: 10px 0 0 0; opacity: 0.95;">Add to your calendar</p>
+                </div>
+                
+                <div class="content">
+                    <p style="font-size: 18px; font-weight: 600; color: #333;">Hello ${full_name}!</p>
+                    
+                    <p style="color: #555; font-size: 16px;">
+                        A new retrospective has been scheduled for your workspace. Add it to your calendar to receive reminders!
+                    </p>
+                    
+                    <div class="event-info">
+                        <div class="event-row">
+                            <div class="event-icon">📋</div>
+                            <div class="event-details">
+                                <div class="event-label">Title</div>
+                                <div class="event-value"><strong>${retrospective_title}</strong></div>
+                            </div>
+                        </div>
+                        
+                        <div class="event-row">
+                            <div class="event-icon">🏃</div>
+                            <div class="event-details">
+                                <div class="event-label">Sprint</div>
+                                <div class="event-value">${sprint_name}</div>
+                            </div>
+                        </div>
+                        
+                        <div class="event-row">
+                            <div class="event-icon">👥</div>
+                            <div class="event-details">
+                                <div class="event-label">Workspace</div>
+                                <div class="event-value">${workspace_name}</div>
+                            </div>
+                        </div>
+                        
+                        <div class="event-row">
+                            <div class="event-icon">👤</div>
+                            <div class="event-details">
+                                <div class="event-label">Facilitator</div>
+                                <div class="event-value">${facilitator_name}</div>
+                            </div>
+                        </div>
+                        
+                        <div class="event-row">
+                            <div class="event-icon">📅</div>
+                            <div class="event-details">
+                                <div class="event-label">Date</div>
+                                <div class="event-value">${start_date}</div>
+                            </div>
+                        </div>
+                        
+                        <div class="event-row">
+                            <div class="event-icon">🕐</div>
+                            <div class="event-details">
+                                <div class="event-label">Time</div>
+                                <div class="event-value">${start_time_str} - ${end_time_str}</div>
+                            </div>
+                        </div>
+                    </div>
+                    
+                    <div class="calendar-buttons">
+                        <a href="${retro_link}" class="calendar-button" style="background: #667eea;">View in YodaAI</a>
+                    </div>
+                    
+                    <div class="note">
+                        <strong>📎 Calendar Attachment:</strong> We've attached a calendar file (.ics) to this email. Simply double-click the attachment to add this event to your calendar, or drag it into your calendar app. The event includes a 15-minute reminder!
+                    </div>
+                    
+                    <p style="color: #555; font-size: 14px; margin-top: 25px;">
+                        <strong>What to expect:</strong> This retrospective will help your team reflect on the sprint using the 4Ls framework (Liked, Learned, Lacked, Longed for). AI will help facilitate the discussion and capture insights.
+                    </p>
+                </div>
+                
+                <div class="footer">
+                    <p><strong>YodaAI</strong></p>
+                    <p>AI-Powered Retrospective Assistant for Agile Teams</p>
+                    <p style="margin-top: 15px; font-size: 11px; color: #999;">
+                        © 2025 YodaAI. All rights reserved.
+                    </p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """,
+)
+
+
+REMINDER_TEMPLATE = EmailTemplate(
+    name="automated_reminder",
+    subject="${subject}",
+    html="""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="UTF-8">
+            <meta name="viewport" content="width=device-width, initial-scale=1.0">
+            <style>
+                body { font-family: 'Segoe UI', Arial, sans-serif; line-height: 1.6; color: #333; margin: 0; padding: 0; background-color: #f4f4f4; }
+                .email-wrapper { max-width: 600px; margin: 20px auto; background: white; border-radius: 10px; overflow: hidden; box-shadow: 0 4px 6px rgba(0,0,0,0.1); }
+                .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; text-align: center; }
+                .header h1 { margin: 0; font-size: 22px; font-weight: 600; }
+                .content { padding: 30px; font-size: 15px; color: #555; }
+                .button { display: inline-block; margin-top: 20px; padding: 12px 24px; background: #667eea; color: white; text-decoration: none; border-radius: 8px; font-weight: 600; }
+                .footer { background: #f8f9fa; padding: 20px; text-align: center; color: #666; font-size: 13px; border-top: 1px solid #e0e0e0; }
+            </style>
+        </head>
+        <body>
+            <div class="email-wrapper">
+                <div class="header">
+                    <h1>${subject_html}</h1>
+                </div>
+                <div class="content">
+                    <p style="font-weight: 600; color: #333;">Hello ${full_name}!</p>
+                    <p>${message_html}</p>
+                    <a href="${app_url}" class="button">Open YodaAI</a>
+                </div>
+                <div class="footer">
+                    <p><strong>YodaAI</strong></p>
+                    <p>AI-Powered Retrospective Assistant for Agile Teams</p>
+                </div>
+            </div>
+        </body>
+        </html>
+        """,
+)
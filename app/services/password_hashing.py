@@ -0,0 +1,106 @@
+"""
+Password hashing off the event loop
+
+bcrypt takes ~250 ms of CPU per hash at cost 12. Called directly from an async route it
+blocks every other request on the worker. Here it runs in a bounded thread pool instead
+(bcrypt releases the GIL, so throughput scales with cores), with a cap on queued work so a
+login burst gets fast 503s instead of an ever-growing backlog.
+
+Plain `def` routes (already in Starlette's threadpool) call hash_password_pooled() /
+verify_password_pooled() and wait for the result; async code awaits the *_async variants.
+Both go through the same pool and cap.
+
+The cost factor is BCRYPT_ROUNDS. needs_rehash() tells login to upgrade hashes that were
+made with a different cost.
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+import bcrypt
+
+from app.core.config import settings
+
+
+class PasswordHashingBusy(Exception):
+    """Too many hash/verify calls already queued; the caller should retry shortly."""
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_pending = 0
+_pending_lock = threading.Lock()
+
+
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
+    salt = bcrypt.gensalt(rounds=rounds or settings.BCRYPT_ROUNDS)
+    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+
+def verify_password(password: str, hashed_password: str) -> bool:
+    try:
+        return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+    except Exception as e:
+        print(f"Password verification error: {e}")
+        return False
+
+
+def hash_rounds(hashed_password: str) -> Optional[int]:
+    """Cost factor of a "$2b$12$..." hash, or None if it isn't bcrypt."""
+    parts = (hashed_password or "").split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    return hash_rounds(hashed_password) != settings.BCRYPT_ROUNDS
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            workers = settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1
+            _executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="password-hash")
+        return _executor
+
+
+def _submit(fn, *args) -> Future:
+    global _pending
+    with _pending_lock:
+        if _pending >= settings.PASSWORD_HASH_MAX_PENDING:
+            raise PasswordHashingBusy()
+        _pending += 1
+    try:
+        future = _get_executor().submit(fn, *args)
+    except BaseException:
+        _done(None)
+        raise
+    future.add_done_callback(_done)
+    return future
+
+
+def _done(_future) -> None:
+    global _pending
+    with _pending_lock:
+        _pending -= 1
+
+
+def hash_password_pooled(password: str) -> str:
+    return _submit(hash_password, password).result()
+
+
+def verify_password_pooled(password: str, hashed_password: str) -> bool:
+    return _submit(verify_password, password, hashed_password).result()
+
+
+async def hash_password_async(password: str) -> str:
+    return await asyncio.wrap_future(_submit(hash_password, password))
+
+
+async def verify_password_async(password: str, hashed_password: str) -> bool:
+    return await asyncio.wrap_future(_submit(verify_password, password, hashed_password))
@@ -0,0 +1,187 @@
+"""
+Reminder dispatcher
+
+Turns due AutomatedReminder rows into EmailOutbox rows, so they go out through the pooled
+SMTP path of app/services/email_outbox_worker.py.
+
+Each batch claims up to REMINDER_DISPATCH_BATCH_SIZE rows using the
+(status, scheduled_for) index. In one transaction it moves them from pending to sent and
+inserts their outbox rows, so a reminder is queued exactly once even when several
+dispatchers or cron ticks overlap.
+
+Run continuously (reminders + email delivery):
+    python -m app.services.reminder_dispatcher
+or call it from cron via GET/POST /api/v1/scheduling/tick.
+"""
+
+import html
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.database.database import SessionLocal, is_postgres
+from app.models.onboarding import AutomatedReminder
+from app.models.user import User
+from app.services.email_outbox_worker import EmailOutboxWorker
+from app.services.email_service import EmailService
+from app.services.email_templates import REMINDER_TEMPLATE
+
+logger = logging.getLogger(__name__)
+
+
+def _text_to_html(text: str) -> str:
+    return html.escape(text or "").replace("\n", "<br>")
+
+
+class ReminderDispatcher:
+    """Claims due reminders in batches and queues their emails."""
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        email_service: Optional[EmailService] = None,
+        batch_size: Optional[int] = None
+    ):
+        self.session_factory = session_factory
+        self.email_service = email_service or EmailService()
+        self.batch_size = batch_size or settings.REMINDER_DISPATCH_BATCH_SIZE
+
+    def dispatch_batch(self, db, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Queue one batch of due reminders and commit. Returns {"claimed", "queued", "failed"}."""
+        now = now or datetime.now(timezone.utc)
+        query = db.query(
+            AutomatedReminder.id,
+            AutomatedReminder.subject,
+            AutomatedReminder.message,
+            AutomatedReminder.retrospective_id,
+            User.email,
+            User.full_name,
+        ).outerjoin(
+            User, User.id == AutomatedReminder.user_id
+        ).filter(
+            AutomatedReminder.status == "pending",
+            AutomatedReminder.scheduled_for <= now
+        ).order_by(AutomatedReminder.scheduled_for).limit(self.batch_size)
+        if is_postgres:
+            query = query.with_for_update(skip_locked=True, of=AutomatedReminder)
+        due = query.all()
+        if not due:
+            db.rollback()
+            return {"claimed": 0, "queued": 0, "failed": 0}
+
+        deliverable = [r for r in due if r.email]
+        undeliverable_ids = [r.id for r in due if not r.email]
+
+        # Guarded transition first: if another dispatcher already took any of these rows
+        # (possible without SKIP LOCKED, e.g. SQLite), queue nothing and let the next pass retry.
+        claimed = db.query(AutomatedReminder).filter(
+            AutomatedReminder.id.in_([r.id for r in deliverable]),
+            AutomatedReminder.status == "pending"
+        ).update({"status": "sent", "sent_at": now}, synchronize_session=False) if deliverable else 0
+        if claimed != len(deliverable):
+            db.rollback()
+            logger.warning("Reminder batch raced with another dispatcher; retrying next pass")
+            return {"claimed": 0, "queued": 0, "failed": 0}
+
+        if undeliverable_ids:
+            db.query(AutomatedReminder).filter(
+                AutomatedReminder.id.in_(undeliverable_ids),
+                AutomatedReminder.status == "pending"
+            ).update({"status": "failed"}, synchronize_session=False)
+
+        app_url = settings.APP_URL
+        outbox_rows = []
+        for r in deliverable:
+            subject, html_content = REMINDER_TEMPLATE.render(
+                subject=r.subject,
+                subject_html=html.escape(r.subject),
+                full_name=html.escape(r.full_name or "there"),
+                message_html=_text_to_html(r.message),
+                app_url=app_url,
+            )
+            outbox_rows.append(self.email_service.outbox_row(
+                to_email=r.email,
+                subject=subject,
+                html_content=html_content,
+                text_content=r.message,
+                kind="reminder",
+                retrospective_id=r.retrospective_id
+            ))
+        queued = self.email_service.enqueue_emails(db, outbox_rows)
+        db.commit()
+        return {"claimed": len(due), "queued": queued, "failed": len(undeliverable_ids)}
+
+    def run_once(self, max_seconds: Optional[float] = None, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Dispatch batches until nothing is due or max_seconds is spent."""
+        totals = {"claimed": 0, "queued": 0, "failed": 0, "batches": 0}
+        if not settings.ENABLE_AUTOMATED_REMINDERS:
+            return totals
+
+        deadline = time.monotonic() + max_seconds if max_seconds else None
+        db = self.session_factory()
+        try:
+            while True:
+                result = self.dispatch_batch(db, now=now)
+                if not result["claimed"]:
+                    break
+                totals["batches"] += 1
+                for key in ("claimed", "queued", "failed"):
+                    totals[key] += result[key]
+                if result["claimed"] < self.batch_size:
+                    break
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        if totals["claimed"]:
+            logger.info(f"⏰ Reminders: queued {totals['queued']}, undeliverable {totals['failed']}")
+        return totals
+
+    def run_forever(self, poll_seconds: Optional[float] = None) -> None:
+        poll = poll_seconds or settings.REMINDER_DISPATCH_POLL_SECONDS
+        outbox_worker = EmailOutboxWorker(session_factory=self.session_factory, email_service=self.email_service)
+        logger.info("Reminder dispatcher started")
+        try:
+            while True:
+                try:
+                    self.run_once()
+                    outbox_worker.run_until_empty()
+                except Exception as e:
+                    logger.error(f"❌ Reminder dispatch pass failed: {e}")
+                time.sleep(poll)
+        finally:
+            outbox_worker.pool.close_all()
+
+
+def run_tick(max_seconds: Optional[float] = None) -> Dict[str, Dict]:
+    """One cron tick: dispatch due reminders, then deliver queued email within the time budget."""
+    budget = max_seconds or settings.REMINDER_TICK_MAX_SECONDS
+    started = time.monotonic()
+    reminders = ReminderDispatcher().run_once(max_seconds=budget / 2)
+
+    outbox_worker = EmailOutboxWorker()
+    delivered = []
+    try:
+        while time.monotonic() - started < budget:
+            batch = outbox_worker.run_once()
+            if not batch:
+                break
+            delivered.extend(batch)
+    finally:
+        outbox_worker.pool.close_all()
+
+    emails: Dict[str, int] = {}
+    for item in delivered:
+        emails[item["status"]] = emails.get(item["status"], 0) + 1
+    return {"reminders": reminders, "emails": emails}
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    ReminderDispatcher().run_forever()
@@ -0,0 +1,287 @@
+"""
+Workspace report aggregates
+
+Team reports are computed with grouped SQL rather than by loading rows into Python:
+  - aggregate_weeks(): per (workspace, ISO week) counts of completed retrospectives and
+    created/completed action items, by status and assignee, plus the time-to-complete sum.
+  - refresh_weekly_rollups(): stores those aggregates for closed weeks in
+    workspace_weekly_rollups. Run it nightly; it recomputes the last
+    REPORT_ROLLUP_RECOMPUTE_WEEKS weeks so later status changes are picked up.
+  - build_workspace_report(): reads the rollup rows for the window and computes only the
+    current week (and any closed week not rolled up yet) live. The cost depends on the
+    window size, not on how much history the workspace has.
+
+Run the rollup:
+    python -m app.services.report_rollup
+or call it from a nightly cron via GET/POST /api/v1/scheduling/rollup.
+"""
+
+import logging
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Date, case, cast, func, insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database.database import SessionLocal
+from app.models.action_item import ActionItem
+from app.models.report_rollup import WorkspaceWeeklyRollup
+from app.models.retrospective_new import Retrospective
+from app.models.workspace import Workspace
+
+logger = logging.getLogger(__name__)
+
+UNASSIGNED = "unassigned"
+_INSERT_CHUNK = 1000
+
+
+def week_start(day: date) -> date:
+    """Monday of the ISO week containing day."""
+    return day - timedelta(days=day.weekday())
+
+
+def _week_expr(db: Session, column):
+    if db.get_bind().dialect.name == "postgresql":
+        return cast(func.date_trunc("week", column), Date)
+    # SQLite: forward to Sunday (no-op on Sundays), then back to Monday
+    return func.date(column, "weekday 0", "-6 days")
+
+
+def _seconds_between(db: Session, start, end):
+    if db.get_bind().dialect.name == "postgresql":
+        return func.extract("epoch", end - start)
+    return (func.julianday(end) - func.julianday(start)) * 86400.0
+
+
+def _as_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _empty_week() -> Dict:
+    return {
+        "retrospectives_completed": 0,
+        "action_items_created": 0,
+        "action_items_completed": 0,
+        "completion_seconds_total": 0.0,
+        "completed_with_duration": 0,
+        "status_counts": {},
+        "assignee_counts": {},
+    }
+
+
+def aggregate_weeks(
+    db: Session,
+    since: date,
+    until: date,
+    workspace_id: Optional[int] = None
+) -> Dict[Tuple[int, date], Dict]:
+    """Weekly metrics for [since, until), keyed by (workspace_id, week_start). Two grouped queries."""
+    start = datetime.combine(since, time.min)
+    end = datetime.combine(until, time.min)
+    weeks: Dict[Tuple[int, date], Dict] = {}
+
+    retro_week = _week_expr(db, Retrospective.created_at)
+    retro_query = db.query(
+        Retrospective.workspace_id, retro_week, func.count(Retrospective.id)
+    ).filter(
+        Retrospective.status == "completed",
+        Retrospective.created_at >= start,
+        Retrospective.created_at < end
+    )
+    if workspace_id is not None:
+        retro_query = retro_query.filter(Retrospective.workspace_id == workspace_id)
+    for ws_id, week, count in retro_query.group_by(Retrospective.workspace_id, retro_week).all():
+        weeks.setdefault((ws_id, _as_date(week)), _empty_week())["retrospectives_completed"] += count
+
+    item_week = _week_expr(db, ActionItem.created_at)
+    completed_with_time = (ActionItem.status == "completed") & ActionItem.completed_at.isnot(None)
+    item_query = db.query(
+        ActionItem.workspace_id,
+        item_week,
+        ActionItem.status,
+        ActionItem.assigned_to,
+        func.count(ActionItem.id),
+        func.coalesce(func.sum(case(
+            (completed_with_time, _seconds_between(db, ActionItem.created_at, ActionItem.completed_at)),
+            else_=None
+        )), 0.0),
+        func.count(case((completed_with_time, ActionItem.id), else_=None)),
+    ).filter(
+        ActionItem.workspace_id.isnot(None),
+        ActionItem.created_at >= start,
+        ActionItem.created_at < end
+    )
+    if workspace_id is not None:
+        item_query = item_query.filter(ActionItem.workspace_id == workspace_id)
+    item_query = item_query.group_by(ActionItem.workspace_id, item_week, ActionItem.status, ActionItem.assigned_to)
+
+    for ws_id, week, status, assignee, count, seconds, timed in item_query.all():
+        metrics = weeks.setdefault((ws_id, _as_date(week)), _empty_week())
+        status = status or "pending"
+        completed = count if status == "completed" else 0
+        metrics["action_items_created"] += count
+        metrics["action_items_completed"] += completed
+        metrics["completion_seconds_total"] += float(seconds or 0)
+        metrics["completed_with_duration"] += timed
+        metrics["status_counts"][status] = metrics["status_counts"].get(status, 0) + count
+        person = metrics["assignee_counts"].setdefault(
+            str(assignee) if assignee is not None else UNASSIGNED, {"created": 0, "completed": 0}
+        )
+        person["created"] += count
+        person["completed"] += completed
+
+    return weeks
+
+
+def refresh_weekly_rollups(
+    db: Session,
+    weeks: Optional[int] = None,
+    workspace_id: Optional[int] = None,
+    today: Optional[date] = None
+) -> int:
+    """Recompute rollup rows for the last `weeks` closed weeks (every workspace, or one). Commits."""
+    weeks = weeks or settings.REPORT_ROLLUP_RECOMPUTE_WEEKS
+    current = week_start(today or date.today())
+    since = current - timedelta(weeks=weeks)
+    week_starts = [since + timedelta(weeks=i) for i in range(weeks)]
+
+    aggregates = aggregate_weeks(db, since, current, workspace_id)
+    if workspace_id is not None:
+        workspace_ids = [workspace_id]
+    else:
+        workspace_ids = [ws_id for (ws_id,) in db.query(Workspace.id).all()]
+
+    stale = db.query(WorkspaceWeeklyRollup).filter(
+        WorkspaceWeeklyRollup.week_start >= since,
+        WorkspaceWeeklyRollup.week_start < current
+    )
+    if workspace_id is not None:
+        stale = stale.filter(WorkspaceWeeklyRollup.workspace_id == workspace_id)
+    stale.delete(synchronize_session=False)
+
+    # Zero rows included: a stored row marks the week as rolled up
+    rows = [
+        {"workspace_id": ws_id, "week_start": week, **aggregates.get((ws_id, week), _empty_week())}
+        for ws_id in workspace_ids
+        for week in week_starts
+    ]
+    for i in range(0, len(rows), _INSERT_CHUNK):
+        db.execute(insert(WorkspaceWeeklyRollup), rows[i:i + _INSERT_CHUNK])
+    db.commit()
+    return len(rows)
+
+
+def _merge(into: Dict, week: Dict) -> None:
+    for key in ("retrospectives_completed", "action_items_created", "action_items_completed",
+                "completion_seconds_total", "completed_with_duration"):
+        into[key] += week[key] or 0
+    for status, count in (week["status_counts"] or {}).items():
+        into["status_counts"][status] = into["status_counts"].get(status, 0) + count
+    for assignee, counts in (week["assignee_counts"] or {}).items():
+        person = into["assignee_counts"].setdefault(assignee, {"created": 0, "completed": 0})
+        person["created"] += counts.get("created", 0)
+        person["completed"] += counts.get("completed", 0)
+
+
+def _rate(completed: int, created: int) -> float:
+    return round(completed / created * 100, 1) if created else 0
+
+
+def _recommendations(totals: Dict, trends: List[Dict], weeks: int) -> List[str]:
+    recommendations = []
+    if not totals["retrospectives_completed"]:
+        recommendations.append(f"No retrospectives were completed in the last {weeks} weeks; schedule one to keep the feedback loop going.")
+    created = totals["action_items_created"]
+    if created and _rate(totals["action_items_completed"], created) < 50:
+        recommendations.append("Fewer than half of the action items were completed; agree on fewer, smaller actions per retrospective.")
+    unassigned = totals["assignee_counts"].get(UNASSIGNED, {}).get("created", 0)
+    if unassigned:
+        recommendations.append(f"{unassigned} action item(s) have no owner; assign each action to a person.")
+    closed = [t for t in trends[:-1] if t["action_items_created"]]
+    if len(closed) >= 4:
+        half = len(closed) // 2
+        earlier = sum(t["completion_rate"] for t in closed[:half]) / half
+        recent = sum(t["completion_rate"] for t in closed[half:]) / (len(closed) - half)
+        if recent < earlier - 15:
+            recommendations.append(
+                f"Action item completion is trending down ({earlier:.0f}% -> {recent:.0f}%); revisit open items at the next retrospective."
+            )
+    return recommendations
+
+
+def build_workspace_report(db: Session, workspace_id: int, weeks: int = 4, today: Optional[date] = None) -> Dict:
+    """Report over the last `weeks` ISO weeks (the current, partial week included)."""
+    weeks = max(1, weeks)
+    current = week_start(today or date.today())
+    week_starts = [current - timedelta(weeks=weeks - 1 - i) for i in range(weeks)]
+
+    stored = {
+        row.week_start: {
+            "retrospectives_completed": row.retrospectives_completed,
+            "action_items_created": row.action_items_created,
+            "action_items_completed": row.action_items_completed,
+            "completion_seconds_total": row.completion_seconds_total,
+            "completed_with_duration": row.completed_with_duration,
+            "status_counts": row.status_counts or {},
+            "assignee_counts": row.assignee_counts or {},
+        }
+        for row in db.query(WorkspaceWeeklyRollup).filter(
+            WorkspaceWeeklyRollup.workspace_id == workspace_id,
+            WorkspaceWeeklyRollup.week_start >= week_starts[0],
+            WorkspaceWeeklyRollup.week_start < current
+        ).all()
+    }
+    # Current week, plus closed weeks the nightly rollup hasn't covered yet
+    live_from = min([w for w in week_starts if w not in stored] or [current])
+    live = aggregate_weeks(db, live_from, current + timedelta(weeks=1), workspace_id)
+
+    totals = _empty_week()
+    trends = []
+    for week in week_starts:
+        metrics = stored.get(week) or live.get((workspace_id, week)) or _empty_week()
+        _merge(totals, metrics)
+        trends.append({
+            "week_start": week.isoformat(),
+            "retrospectives_completed": metrics["retrospectives_completed"],
+            "action_items_created": metrics["action_items_created"],
+            "action_items_completed": metrics["action_items_completed"],
+            "completion_rate": _rate(metrics["action_items_completed"], metrics["action_items_created"]),
+        })
+
+    timed = totals["completed_with_duration"]
+    return {
+        "period": f"Last {weeks} weeks",
+        "team_id": workspace_id,
+        "retrospectives_conducted": totals["retrospectives_completed"],
+        "action_items_created": totals["action_items_created"],
+        "action_items_completed": totals["action_items_completed"],
+        "completion_rate": _rate(totals["action_items_completed"], totals["action_items_created"]),
+        "mean_days_to_complete": round(totals["completion_seconds_total"] / timed / 86400, 1) if timed else None,
+        "action_items_by_status": totals["status_counts"],
+        "action_items_by_assignee": totals["assignee_counts"],
+        "trends": trends,
+        "recommendations": _recommendations(totals, trends, weeks),
+    }
+
+
+def run_nightly_rollup(weeks: Optional[int] = None) -> Dict[str, int]:
+    db = SessionLocal()
+    try:
+        rows = refresh_weekly_rollups(db, weeks=weeks)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    logger.info(f"📊 Weekly report rollup refreshed: {rows} rows")
+    return {"rows": rows}
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run_nightly_rollup()
@@ -0,0 +1,484 @@
+"""
+Retrospective summary PDF export
+
+- summary_content_version(): one aggregate query that changes whenever anything shown in
+  the PDF changes; used as the cache key and the HTTP ETag.
+- collect_summary_snapshot(): loads everything the PDF shows into plain, picklable objects.
+- render_summary_pdf(): pure reportlab layout over a snapshot; safe to run in a worker
+  thread or process.
+- get_summary_pdf(): cache lookup (summary_exports table), else render off the event loop
+  and store. Its queries run in the threadpool, the render in the worker pool, so nothing
+  blocks the loop. Concurrent requests for the same version share one render.
+"""
+
+import asyncio
+import hashlib
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import case, func, or_, select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.models.action_item import ActionItem
+from app.models.retrospective_new import (
+    DARecommendation, DiscussionTopic, Retrospective, RetrospectiveParticipant, ThemeGroup
+)
+from app.models.summary_export import SummaryExport
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Bump when render_summary_pdf's layout changes so cached PDFs are re-rendered
+PDF_LAYOUT_VERSION = "1"
+PDF_KIND = "summary_pdf"
+
+
+def summary_content_version(db: Session, retro: Retrospective) -> str:
+    """Hash of counts and latest timestamps of every table the summary PDF reads from."""
+    rid = retro.id
+    participant_user_ids = select(RetrospectiveParticipant.user_id).where(
+        RetrospectiveParticipant.retrospective_id == rid
+    )
+    assignee_ids = select(ActionItem.assigned_to).where(
+        ActionItem.retrospective_id == rid, ActionItem.assigned_to.isnot(None)
+    )
+    row = db.execute(select(
+        select(func.count(RetrospectiveParticipant.id)).where(
+            RetrospectiveParticipant.retrospective_id == rid).scalar_subquery(),
+        select(func.sum(case((RetrospectiveParticipant.completed_voting == True, 1), else_=0))).where(
+            RetrospectiveParticipant.retrospective_id == rid).scalar_subquery(),
+        select(func.count(ActionItem.id)).where(ActionItem.retrospective_id == rid).scalar_subquery(),
+        select(func.max(func.coalesce(ActionItem.updated_at, ActionItem.created_at))).where(
+            ActionItem.retrospective_id == rid).scalar_subquery(),
+        select(func.max(func.coalesce(DARecommendation.updated_at, DARecommendation.created_at))).where(
+            DARecommendation.retrospective_id == rid).scalar_subquery(),
+        select(func.count(DiscussionTopic.id)).where(DiscussionTopic.retrospective_id == rid).scalar_subquery(),
+        select(func.sum(DiscussionTopic.total_votes)).where(DiscussionTopic.retrospective_id == rid).scalar_subquery(),
+        select(func.max(func.coalesce(ThemeGroup.updated_at, ThemeGroup.created_at))).where(
+            ThemeGroup.retrospective_id == rid).scalar_subquery(),
+        select(func.max(func.coalesce(User.updated_at, User.created_at))).where(
+            or_(User.id.in_(participant_user_ids), User.id.in_(assignee_ids))).scalar_subquery(),
+    )).one()
+
+    parts = [PDF_LAYOUT_VERSION, str(rid), str(retro.updated_at or retro.created_at)] + [str(v) for v in row]
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def collect_summary_snapshot(db: Session, retro: Retrospective) -> SimpleNamespace:
+    """Load everything the PDF shows, detached from the session."""
+    retro_id = retro.id
+
+    # Get participants for listing
+    participant_rows = db.query(
+        RetrospectiveParticipant.completed_voting, User.id, User.full_name, User.email
+    ).join(
+        User, RetrospectiveParticipant.user_id == User.id
+    ).filter(
+        RetrospectiveParticipant.retrospective_id == retro_id
+    ).order_by(
+        func.lower(func.coalesce(User.full_name, User.email, ''))
+    ).all()
+
+    # Get action items associated with this retrospective
+    priority_order = case(
+        (ActionItem.priority == 'critical', 4),
+        (ActionItem.priority == 'high', 3),
+        (ActionItem.priority == 'medium', 2),
+        (ActionItem.priority == 'low', 1),
+        else_=0
+    )
+
+    action_rows = db.query(
+        ActionItem.title, ActionItem.status, ActionItem.due_date, ActionItem.progress_percentage,
+        User.id, User.full_name, User.email
+    ).outerjoin(
+        User, ActionItem.assigned_to == User.id
+    ).filter(
+        ActionItem.retrospective_id == retro_id
+    ).order_by(
+        ActionItem.status,
+        priority_order.desc(),
+        ActionItem.due_date.is_(None),
+        ActionItem.due_date.asc()
+    ).all()
+
+    # Get DA recommendations and top themes
+    da_content = db.query(DARecommendation.content).filter(
+        DARecommendation.retrospective_id == retro_id
+    ).limit(1).scalar()
+
+    # Get top discussion topics
+    topics = db.query(DiscussionTopic.total_votes, ThemeGroup.title, ThemeGroup.description).join(
+        ThemeGroup, DiscussionTopic.theme_group_id == ThemeGroup.id
+    ).filter(
+        DiscussionTopic.retrospective_id == retro_id
+    ).order_by(DiscussionTopic.total_votes.desc()).limit(5).all()
+
+    return SimpleNamespace(
+        retro=SimpleNamespace(
+            title=retro.title,
+            sprint_name=retro.sprint_name,
+            actual_start_time=retro.actual_start_time,
+            ai_summary=retro.ai_summary,
+        ),
+        insights=dict(retro.ai_insights or {}),
+        topics=[
+            (SimpleNamespace(total_votes=t.total_votes), SimpleNamespace(title=t.title, description=t.description))
+            for t in topics
+        ],
+        participant_rows=[
+            (SimpleNamespace(completed_voting=p.completed_voting), SimpleNamespace(id=p.id, full_name=p.full_name, email=p.email))
+            for p in participant_rows
+        ],
+        action_items=[
+            SimpleNamespace(
+                title=a.title,
+                status=a.status,
+                due_date=a.due_date,
+                progress_percentage=a.progress_percentage,
+                assignee=SimpleNamespace(id=a.id, full_name=a.full_name, email=a.email) if a.id else None,
+            )
+            for a in action_rows
+        ],
+        da_rec=SimpleNamespace(content=da_content) if da_content else None,
+    )
+
+
+def render_summary_pdf(snapshot: SimpleNamespace) -> bytes:
+    """Lay out the summary PDF (CPU-bound; no DB or event loop access)."""
+    retro = snapshot.retro
+    insights = snapshot.insights
+    topics = snapshot.topics
+    participant_rows = snapshot.participant_rows
+    action_items = snapshot.action_items
+    da_rec = snapshot.da_rec
+
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle
+    from reportlab.lib.units import inch
+    import io
+    from xml.sax.saxutils import escape as xml_escape
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter,
+                          rightMargin=72, leftMargin=72,
+                          topMargin=72, bottomMargin=72)
+
+    # Container for the 'Flowable' objects
+    elements = []
+
+    # Define styles
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=22,
+        textColor=colors.HexColor('#667eea'),
+        spaceAfter=18,
+        alignment=1,  # Center alignment
+    )
+    heading_style = ParagraphStyle(
+        'CustomHeading',
+        parent=styles['Heading2'],
+        fontSize=14,
+        textColor=colors.HexColor('#667eea'),
+        spaceAfter=10,
+        spaceBefore=10,
+    )
+    subheading_style = ParagraphStyle(
+        'SubHeading',
+        parent=styles['Heading3'],
+        fontSize=12,
+        textColor=colors.HexColor('#4a5568'),
+        spaceAfter=6,
+    )
+    normal_style = ParagraphStyle(
+        'Normal',
+        parent=styles['Normal'],
+        fontSize=9,
+        leading=12,
+    )
+
+    # Title
+    elements.append(Paragraph(f"Retrospective Summary", title_style))
+    elements.append(Paragraph(f"{retro.title or 'Team Retrospective'}", styles['Title']))
+    if retro.sprint_name:
+        elements.append(Paragraph(f"Sprint: {retro.sprint_name}", styles['Normal']))
+    if retro.actual_start_time:
+        elements.append(Paragraph(
+            f"Date: {retro.actual_start_time.strftime('%B %d, %Y')}", 
+            styles['Normal']
+        ))
+    elements.append(Spacer(1, 0.3*inch))
+
+    # Top Themes for Discussion
+    if topics:
+        elements.append(Paragraph("Top Themes Discussed", heading_style))
+        for i, (topic, theme) in enumerate(topics, 1):
+            elements.append(Paragraph(
+                f"{i}. {theme.title} ({topic.total_votes} votes)",
+                subheading_style
+            ))
+            if theme.description:
+                elements.append(Paragraph(theme.description, normal_style))
+            elements.append(Spacer(1, 0.1*inch))
+        elements.append(Spacer(1, 0.2*inch))
+
+    # Overall Assessment
+    if retro.ai_summary:
+        elements.append(Paragraph("Overall Assessment", heading_style))
+        elements.append(Paragraph(retro.ai_summary, normal_style))
+        elements.append(Spacer(1, 0.3*inch))
+
+    # Achievements
+    achievements = insights.get('achievements', [])
+    if achievements:
+        elements.append(Paragraph("Key Achievements", heading_style))
+        for achievement in achievements:
+            elements.append(Paragraph(f"✓ {achievement}", normal_style))
+        elements.append(Spacer(1, 0.3*inch))
+
+    # Challenges
+    challenges = insights.get('challenges', [])
+    if challenges:
+        elements.append(Paragraph("Main Challenges", heading_style))
+        for challenge in challenges:
+            elements.append(Paragraph(f"⚠ {challenge}", normal_style))
+        elements.append(Spacer(1, 0.3*inch))
+
+    # Page break before Participants and Action Items (Page 2)
+    elements.append(PageBreak())
+
+    # Participants and Action Items on their own page
+    if participant_rows:
+        elements.append(Paragraph("Participants", heading_style))
+        participant_table_data = [["Name", "Email", "Voting Complete"]]
+        for rp, user in participant_rows:
+            name = xml_escape(user.full_name or user.email or f"User {user.id}")
+            email = xml_escape(user.email or "—")
+            voting_complete = "Yes" if rp.completed_voting else "No"
+            participant_table_data.append([
+                Paragraph(name, normal_style),
+                Paragraph(email, normal_style),
+                Paragraph(voting_complete, normal_style)
+            ])
+        participant_table = Table(participant_table_data)
+        participant_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#667eea')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+            ('ALIGN', (0, 1), (-1, -1), 'LEFT'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.whitesmoke, colors.lightgrey]),
+            ('GRID', (0, 0), (-1, -1), 0.25, colors.HexColor('#cbd5f5')),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ]))
+        elements.append(participant_table)
+        elements.append(Spacer(1, 0.3*inch))
+
+    elements.append(Paragraph("Action Items", heading_style))
+    if action_items:
+        action_table_data = [["Title", "Owner", "Status", "Due Date", "Progress"]]
+        for item in action_items:
+            title_text = xml_escape(item.title or "Untitled action item")
+            assignee = "Unassigned"
+            if item.assignee:
+                assignee = item.assignee.full_name or item.assignee.email or f"User {item.assignee.id}"
+            assignee = xml_escape(assignee)
+            status_text = xml_escape((item.status or "pending").replace('_', ' ').title())
+            due_text = item.due_date.strftime('%b %d, %Y') if item.due_date else "—"
+            progress_text = f"{item.progress_percentage or 0}%"
+            action_table_data.append([
+                Paragraph(f"<b>{title_text}</b>", normal_style),
+                Paragraph(assignee, normal_style),
+                Paragraph(status_text, normal_style),
+                Paragraph(xml_escape(due_text), normal_style),
+                Paragraph(progress_text, normal_style)
+            ])
+        action_table = Table(action_table_data)
+        action_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4c51bf')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+            ('ALIGN', (0, 1), (-1, -1), 'LEFT'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.whitesmoke, colors.HexColor('#edf2ff')]),
+            ('GRID', (0, 0), (-1, -1), 0.25, colors.HexColor('#d0d7f9')),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+        ]))
+        elements.append(action_table)
+    else:
+        elements.append(Paragraph("No action items were captured for this retrospective.", normal_style))
+    elements.append(Spacer(1, 0.3*inch))
+
+    # Disciplined Agile Recommendations (format: number titles only, bullets for recommendations)
+    if da_rec and da_rec.content:
+        elements.append(PageBreak())
+        elements.append(Paragraph("Disciplined Agile Recommendations", heading_style))
+        try:
+            import re
+            raw = da_rec.content or ""
+            # Convert **bold** to <b> for reportlab Paragraph
+            raw = re.sub(r"\*\*(.*?)\*\*", r"<b>\1</b>", raw)
+            # Split into lines
+            lines = [l.strip() for l in raw.splitlines() if l.strip()]
+
+            number_idx = 1
+            i = 0
+            while i < len(lines):
+                line = lines[i]
+
+                # Remove leading bullets/dashes/numbers if present
+                clean_line = re.sub(r"^[-•]\s*", "", line)
+                clean_line = re.sub(r"^\d+\.\s*", "", clean_line)
+
+                # Check if this line is a title (contains bold tags or is short)
+                is_title = '<b>' in clean_line and '</b>' in clean_line
+
+                # Also check if it's a standalone title (next line is a recommendation)
+                if not is_title and i + 1 < len(lines):
+                    next_line = lines[i + 1].strip()
+                    # If next line starts with action verb or "Use/Apply/Implement", current is title
+                    if re.match(r"^(Use|Apply|Implement|Practice|Leverage|Optimize)", next_line, re.IGNORECASE):
+                        is_title = True
+
+                if is_title:
+                    # Extract title text (remove bold tags for numbering, but keep content)
+                    title_text = re.sub(r"</?b>", "", clean_line)
+                    elements.append(Paragraph(f"{number_idx}. <b>{title_text}</b>", normal_style))
+                    number_idx += 1
+                    i += 1
+
+                    # Add following recommendations as bullets until next title
+                    while i < len(lines):
+                        next_line = lines[i].strip()
+                        next_clean = re.sub(r"^[-•]\s*", "", next_line)
+                        next_clean = re.sub(r"^\d+\.\s*", "", next_clean)
+
+                        # Check if next line is a title
+                        is_next_title = '<b>' in next_clean and '</b>' in next_clean
+                        if not is_next_title and i + 1 < len(lines):
+                            check_line = lines[i + 1].strip()
+                            if re.match(r"^(Use|Apply|Implement|Practice|Leverage|Optimize)", check_line, re.IGNORECASE):
+                                is_next_title = True
+
+                        if is_next_title:
+                            break
+
+                        # This is a recommendation - use bullet
+                        rec_text = re.sub(r"</?b>", "", next_clean)
+                        elements.append(Paragraph(f"• {rec_text}", normal_style))
+                        i += 1
+                else:
+                    # Regular line - treat as recommendation
+                    rec_text = re.sub(r"</?b>", "", clean_line)
+                    elements.append(Paragraph(f"• {rec_text}", normal_style))
+                    i += 1
+
+        except Exception as e:
+            print(f"DA recommendations formatting error: {e}")
+            # Fallback to raw paragraph
+            elements.append(Paragraph(da_rec.content, normal_style))
+        elements.append(Spacer(1, 0.3*inch))
+
+    # Recommendations (if in insights)
+    recommendations = insights.get('recommendations', [])
+    if recommendations:
+        elements.append(Paragraph("AI Suggested Action Ideas", heading_style))
+        for recommendation in recommendations:
+            elements.append(Paragraph(f"→ {recommendation}", normal_style))
+        elements.append(Spacer(1, 0.3*inch))
+
+    # Build PDF
+    doc.build(elements)
+
+    # Get the value of the BytesIO buffer
+    pdf = buffer.getvalue()
+    buffer.close()
+    return pdf
+
+
+_executor: Optional[Executor] = None
+_inflight: Dict[Tuple[int, str], "asyncio.Future[bytes]"] = {}
+
+
+def _get_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        workers = max(1, int(getattr(settings, "PDF_RENDER_WORKERS", 2) or 2))
+        if getattr(settings, "PDF_RENDER_USE_PROCESSES", False):
+            _executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pdf-render")
+    return _executor
+
+
+def load_cached_pdf(db: Session, retro_id: int, version: str) -> Optional[bytes]:
+    return db.query(SummaryExport.content).filter(
+        SummaryExport.retrospective_id == retro_id,
+        SummaryExport.kind == PDF_KIND,
+        SummaryExport.content_version == version
+    ).scalar()
+
+
+def store_pdf(db: Session, retro_id: int, version: str, pdf: bytes) -> None:
+    """Keep only the latest version per retrospective."""
+    try:
+        db.query(SummaryExport).filter(
+            SummaryExport.retrospective_id == retro_id,
+            SummaryExport.kind == PDF_KIND
+        ).delete(synchronize_session=False)
+        db.add(SummaryExport(
+            retrospective_id=retro_id,
+            kind=PDF_KIND,
+            content_version=version,
+            media_type="application/pdf",
+            content=pdf,
+            size_bytes=len(pdf),
+        ))
+        db.commit()
+    except Exception as e:
+        # Another request stored the same version first; the PDF is still valid to return
+        db.rollback()
+        logger.warning(f"Could not cache summary PDF for retro {retro_id}: {e}")
+
+
+async def get_summary_pdf(db: Session, retro: Retrospective, version: Optional[str] = None) -> Tuple[bytes, str]:
+    """Return (pdf_bytes, content_version), rendering in the worker pool only on a cache miss."""
+    version = version or await run_in_threadpool(summary_content_version, db, retro)
+    cached = await run_in_threadpool(load_cached_pdf, db, retro.id, version)
+    if cached is not None:
+        return cached, version
+
+    key = (retro.id, version)
+    future = _inflight.get(key)
+    if future is not None:
+        return await asyncio.shield(future), version
+
+    # Registered before the first await, so requests arriving meanwhile wait on this render
+    loop = asyncio.get_running_loop()
+    future = _inflight[key] = loop.create_future()
+    # Failures reach this request; don't warn when no one else was waiting
+    future.add_done_callback(lambda f: f.cancelled() or f.exception())
+    try:
+        snapshot = await run_in_threadpool(collect_summary_snapshot, db, retro)
+        pdf = await loop.run_in_executor(_get_executor(), render_summary_pdf, snapshot)
+        future.set_result(pdf)
+    except BaseException as e:
+        if isinstance(e, asyncio.CancelledError):
+            future.cancel()
+        else:
+            future.set_exception(e)
+        raise
+    finally:
+        _inflight.pop(key, None)
+    await run_in_threadpool(store_pdf, db, retro.id, version, pdf)
+    return pdf, version
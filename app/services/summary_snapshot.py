@@ -0,0 +1,64 @@
+"""
+Per-retrospective summary snapshot
+
+Voting tallies are fixed once voting is finalized, so finalize_voting materializes them onto
+Retrospective.summary_snapshot and GET /discussion/{retro_id}/summary reads them from there.
+voting_results() is the single grouped aggregate used to build them (and as the fallback for
+retrospectives finalized before snapshots existed).
+"""
+
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Session
+
+from app.models.retrospective_new import Retrospective, ThemeGroup, VoteAllocation, VotingSession
+
+
+def latest_voting_session_id(db: Session, retro_id: int) -> Optional[int]:
+    return db.query(VotingSession.id).filter(
+        VotingSession.retrospective_id == retro_id
+    ).order_by(VotingSession.started_at.desc(), VotingSession.id.desc()).limit(1).scalar()
+
+
+def voting_results(db: Session, retro_id: int, voting_session_id: int) -> List[Dict]:
+    """Total votes per theme (themes without votes included as 0), most voted first."""
+    total_votes = func.coalesce(func.sum(VoteAllocation.votes_allocated), 0)
+    rows = db.query(
+        ThemeGroup.id,
+        ThemeGroup.title,
+        ThemeGroup.description,
+        ThemeGroup.primary_category,
+        total_votes.label("total_votes")
+    ).outerjoin(
+        VoteAllocation, and_(
+            VoteAllocation.theme_group_id == ThemeGroup.id,
+            VoteAllocation.voting_session_id == voting_session_id
+        )
+    ).filter(
+        ThemeGroup.retrospective_id == retro_id
+    ).group_by(
+        ThemeGroup.id, ThemeGroup.title, ThemeGroup.description, ThemeGroup.primary_category
+    ).order_by(total_votes.desc(), ThemeGroup.id).all()
+
+    return [
+        {
+            "theme_title": row.title,
+            "theme_description": row.description,
+            "total_votes": int(row.total_votes or 0),
+            "category": row.primary_category
+        }
+        for row in rows
+    ]
+
+
+def write_summary_snapshot(db: Session, retro: Retrospective, voting_session: VotingSession) -> Dict:
+    """Materialize the final voting results on the retrospective (caller commits)."""
+    snapshot = {
+        "voting_session_id": voting_session.id,
+        "voting_results": voting_results(db, retro.id, voting_session.id),
+        "finalized_at": datetime.now(timezone.utc).isoformat(),
+    }
+    retro.summary_snapshot = snapshot
+    return snapshot
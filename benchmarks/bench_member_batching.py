@@ -0,0 +1,154 @@
+"""
+Query-count benchmark for workspace fan-out paths.
+
+Creates a workspace with N members in an in-memory SQLite database and counts the SQL
+statements issued by:
+  - POST /retrospectives/ (create_retrospective: participants + queued calendar invites)
+  - AutomationService.schedule_retrospective (pre-retro reminders)
+  - AutomationService.send_preparation_prompts
+  - AutomationService.complete_retrospective (follow-up reminders)
+
+The counts must not grow with N. Usage:
+    python benchmarks/bench_member_batching.py --sizes 5 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+
+def _repo_root() -> Path:
+    return Path(__file__).resolve().parents[1]
+
+
+sys.path.insert(0, str(_repo_root()))
+
+
+@contextmanager
+def count_queries(engine):
+    from sqlalchemy import event
+
+    counter = {"statements": 0}
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        counter["statements"] += 1
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+
+
+def _make_session_factory():
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    from app.database.database import Base
+    import app.models  # noqa: F401  (register all tables)
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    return engine, sessionmaker(bind=engine, autoflush=False)
+
+
+def _seed_workspace(db, n_members: int):
+    from app.models.user import User
+    from app.models.workspace import Workspace, WorkspaceMember
+
+    owner = User(email="owner@bench.local", username="owner", full_name="Owner", hashed_password="x")
+    db.add(owner)
+    db.flush()
+    workspace = Workspace(name="Bench", created_by=owner.id)
+    db.add(workspace)
+    db.flush()
+    db.add(WorkspaceMember(workspace_id=workspace.id, user_id=owner.id, role="owner"))
+    users = [
+        User(email=f"member{i}@bench.local", username=f"member{i}", full_name=f"Member {i}", hashed_password="x")
+        for i in range(n_members - 1)
+    ]
+    db.add_all(users)
+    db.flush()
+    db.add_all([WorkspaceMember(workspace_id=workspace.id, user_id=u.id, role="member") for u in users])
+    db.commit()
+    return owner, workspace
+
+
+def run(n_members: int) -> dict:
+    from fastapi import BackgroundTasks
+
+    from app.api.routes.retrospectives_full import RetrospectiveCreate, create_retrospective
+    from app.services.automation_service import AutomationService
+
+    engine, Session = _make_session_factory()
+    db = Session()
+    owner, workspace = _seed_workspace(db, n_members)
+    start = datetime.now(timezone.utc) + timedelta(days=10)
+    results = {"members": n_members}
+
+    with count_queries(engine) as q:
+        t0 = time.perf_counter()
+        retro = create_retrospective(
+            RetrospectiveCreate(
+                workspace_id=workspace.id,
+                title="Bench retro",
+                sprint_name="Sprint 1",
+                scheduled_start_time=start,
+                scheduled_end_time=start + timedelta(hours=1),
+            ),
+            BackgroundTasks(),  # not run: delivery is the outbox worker's job
+            current_user=owner,
+            db=db,
+        )
+        results["create_retrospective"] = (q["statements"], time.perf_counter() - t0)
+
+    with count_queries(engine) as q:
+        t0 = time.perf_counter()
+        scheduled = AutomationService.schedule_retrospective(
+            db, title="Bench scheduled", team_id=workspace.id, created_by=owner.id, scheduled_date=start,
+        )
+        results["schedule_retrospective"] = (q["statements"], time.perf_counter() - t0)
+
+    with count_queries(engine) as q:
+        t0 = time.perf_counter()
+        AutomationService.send_preparation_prompts(db, scheduled.id)
+        results["send_preparation_prompts"] = (q["statements"], time.perf_counter() - t0)
+
+    with count_queries(engine) as q:
+        t0 = time.perf_counter()
+        AutomationService.complete_retrospective(db, retro.id)
+        results["complete_retrospective"] = (q["statements"], time.perf_counter() - t0)
+
+    db.close()
+    engine.dispose()
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Count SQL statements per workspace fan-out path.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[5, 500], help="Workspace sizes to compare.")
+    args = parser.parse_args()
+
+    runs = [run(n) for n in args.sizes]
+    paths = [k for k in runs[0] if k != "members"]
+
+    print(f"{'path':<28}" + "".join(f"{'n=' + str(r['members']):>22}" for r in runs))
+    constant = True
+    for path in paths:
+        cells = "".join(f"{r[path][0]:>8} queries {r[path][1] * 1000:>6.1f}ms" for r in runs)
+        print(f"{path:<28}{cells}")
+        if len({r[path][0] for r in runs}) != 1:
+            constant = False
+
+    print("query counts constant across sizes" if constant else "query counts GROW with workspace size")
+    return 0 if constant else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,92 @@
+"""
+Login-burst benchmark for password verification.
+
+Runs N concurrent bcrypt verifications on one event loop and reports logins/s plus the
+longest event-loop stall seen by a 10 ms heartbeat:
+  - inline:     bcrypt.checkpw called directly in the coroutine (the old login path)
+  - pool(w=K):  app.services.password_hashing.verify_password_async with K worker threads
+
+Throughput of the pool should grow with K up to the core count while the loop stays responsive.
+Usage:
+    python benchmarks/bench_password_hashing.py --logins 32 --rounds 12
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+
+def _repo_root() -> Path:
+    return Path(__file__).resolve().parents[1]
+
+
+sys.path.insert(0, str(_repo_root()))
+
+
+async def _heartbeat(stop: asyncio.Event, interval: float = 0.01) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - t0 - interval)
+    return worst
+
+
+async def _burst(verify, logins: int, password: str, hashed: str):
+    stop = asyncio.Event()
+    heartbeat = asyncio.create_task(_heartbeat(stop))
+    await asyncio.sleep(0)
+    t0 = time.perf_counter()
+    results = await asyncio.gather(*(verify(password, hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    worst_stall = await heartbeat
+    assert all(results)
+    return logins / elapsed, worst_stall
+
+
+def run(logins: int, rounds: int, workers: list) -> list:
+    from app.core.config import settings
+    from app.services import password_hashing
+
+    password = "correct horse battery staple"
+    hashed = password_hashing.hash_password(password, rounds=rounds)
+
+    async def inline_verify(pw, h):
+        return password_hashing.verify_password(pw, h)
+
+    rows = [("inline",) + asyncio.run(_burst(inline_verify, logins, password, hashed))]
+    settings.PASSWORD_HASH_MAX_PENDING = max(settings.PASSWORD_HASH_MAX_PENDING, logins)
+    for k in workers:
+        settings.PASSWORD_HASH_WORKERS = k
+        if password_hashing._executor is not None:
+            password_hashing._executor.shutdown()
+            password_hashing._executor = None
+        rows.append((f"pool(w={k})",) + asyncio.run(
+            _burst(password_hashing.verify_password_async, logins, password, hashed)
+        ))
+    return rows
+
+
+def main() -> int:
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Compare inline vs pooled bcrypt verification under a login burst.")
+    parser.add_argument("--logins", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost factor of the test hash.")
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, 4, cores}))
+    args = parser.parse_args()
+
+    print(f"{args.logins} concurrent logins, bcrypt cost {args.rounds}, {cores} cores")
+    print(f"{'mode':<12}{'logins/s':>10}{'max loop stall':>18}")
+    for mode, rate, stall in run(args.logins, args.rounds, args.workers):
+        print(f"{mode:<12}{rate:>10.1f}{stall * 1000:>15.1f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
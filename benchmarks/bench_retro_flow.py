@@ -0,0 +1,115 @@
+"""
+End-to-end benchmark of a whole retrospective against the real app.
+
+Runs the app in-process (httpx ASGI transport, full lifespan) on a fresh SQLite file, or on
+--database-url, with OpenAI replaced by benchmarks/openai_stub.py and Chroma by a local
+in-process store in a temp directory. Seeds N participants, then times every request of
+the flow: 4Ls chat (M messages each), grouping, voting, discussion, summary and PDF.
+
+Prints a JSON report (per-step count/errors/p50/p95/p99/max, per-phase wall time, stub
+calls, git commit) so runs can be compared across commits:
+    python benchmarks/bench_retro_flow.py --participants 8 --responses 8 --output flow.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from openai_stub import OpenAIStub, StubConfig  # noqa: E402
+import retro_harness  # noqa: E402
+
+
+async def _run(args, stub: OpenAIStub) -> dict:
+    import httpx
+
+    async with retro_harness.running_app() as app:
+        fixtures = retro_harness.seed_retrospectives(args.retros, args.participants)
+        if args.da_kb_chars:
+            retro_harness.seed_da_knowledge_base(args.da_kb_chars)
+        stub.config.requests.update({"chat": 0, "embeddings": 0})
+
+        phases: dict = {}
+        timings = retro_harness.Timings()
+        transport = httpx.ASGITransport(app=app)
+        start = time.perf_counter()
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+            for fixture in fixtures:
+                timings.merge(await retro_harness.run_retro_flow(
+                    client,
+                    fixture,
+                    responses=args.responses,
+                    discussion_messages=args.discussion_messages,
+                    concurrency=args.concurrency,
+                    pdf=not args.no_pdf,
+                    phase_seconds=phases,
+                ))
+        elapsed = time.perf_counter() - start
+
+    steps = timings.summary()
+    total_requests = sum(s["count"] for s in steps.values())
+    return {
+        "benchmark": "retro_flow",
+        "commit": retro_harness.git_commit(),
+        "config": {
+            "database": "sqlite" if args.database_url is None else args.database_url.split(":", 1)[0],
+            "retros": args.retros,
+            "participants": args.participants,
+            "responses": args.responses,
+            "discussion_messages": args.discussion_messages,
+            "concurrency": args.concurrency,
+            "openai_latency_ms": args.latency_ms,
+            "openai_jitter_ms": args.jitter_ms,
+            "completion_tokens": args.completion_tokens,
+        },
+        "total_seconds": round(elapsed, 3),
+        "requests": total_requests,
+        "requests_per_second": round(total_requests / elapsed, 2) if elapsed else None,
+        "errors": sum(s["errors"] for s in steps.values()),
+        "phases_seconds": {name: round(seconds, 3) for name, seconds in phases.items()},
+        "steps": steps,
+        "error_examples": timings.error_examples,
+        "stub_requests": dict(stub.config.requests),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="End-to-end retrospective flow benchmark (stubbed OpenAI/Chroma).")
+    parser.add_argument("--participants", type=int, default=6)
+    parser.add_argument("--responses", type=int, default=6, help="4Ls chat messages per participant.")
+    parser.add_argument("--discussion-messages", type=int, default=2, help="Topic messages per participant.")
+    parser.add_argument("--retros", type=int, default=1, help="Retrospectives to run back to back.")
+    parser.add_argument("--concurrency", type=int, default=50, help="Participants acting at once within a phase.")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="Stub OpenAI latency per chat completion.")
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--completion-tokens", type=int, default=120)
+    parser.add_argument("--database-url", default=None, help="Default: a fresh SQLite file in a temp directory.")
+    parser.add_argument("--da-kb-chars", type=int, default=20000, help="DA knowledge base size to index; 0 skips.")
+    parser.add_argument("--no-pdf", action="store_true")
+    parser.add_argument("--output", default=None, help="Write the JSON report here as well as to stdout.")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    config = StubConfig(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, completion_tokens=args.completion_tokens)
+    with tempfile.TemporaryDirectory() as tmp, OpenAIStub(config) as stub:
+        database_url = args.database_url or f"sqlite:///{Path(tmp) / 'bench.db'}"
+        retro_harness.configure_environment(database_url, stub.base_url, str(Path(tmp) / "chroma"))
+        report = asyncio.run(_run(args, stub))
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
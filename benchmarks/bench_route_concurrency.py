@@ -0,0 +1,133 @@
+"""
+Concurrency benchmark for blocking DB work in route handlers.
+
+Serves GET /retrospectives/{id} two ways from one app, against a file SQLite database whose
+every statement sleeps --latency-ms to stand in for a Neon round trip:
+  - before: an `async def` wrapper calling the handler inline, so each query blocks the
+            event loop (how every route used to run)
+  - after:  the real handler, a plain `def` that FastAPI runs in its thread pool
+
+Fires --requests requests with --concurrency in flight and reports requests/sec.
+Usage:
+    python benchmarks/bench_route_concurrency.py --requests 200 --concurrency 20 --latency-ms 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def _repo_root() -> Path:
+    return Path(__file__).resolve().parents[1]
+
+
+sys.path.insert(0, str(_repo_root()))
+
+
+def _build(db_path: str, latency: float):
+    from fastapi import Depends, FastAPI
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.orm import sessionmaker
+
+    from app.api.dependencies.auth import get_current_user
+    from app.api.routes.retrospectives_full import get_retrospective
+    from app.api.routes.user_auth import create_access_token
+    from app.database.database import Base, get_db
+    import app.models  # noqa: F401  (register all tables)
+    from app.models.retrospective_new import Retrospective, RetrospectiveParticipant
+    from app.models.user import User
+    from app.models.workspace import Workspace
+
+    engine = create_engine(
+        f"sqlite:///{db_path}", connect_args={"check_same_thread": False}, pool_size=40, max_overflow=0
+    )
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+
+    db = Session()
+    user = User(email="bench@bench.local", username="bench", full_name="Bench", hashed_password="x")
+    db.add(user)
+    db.flush()
+    workspace = Workspace(name="Bench", created_by=user.id)
+    db.add(workspace)
+    db.flush()
+    retro = Retrospective(workspace_id=workspace.id, title="Bench", facilitator_id=user.id, created_by=user.id, code="BENCH1")
+    db.add(retro)
+    db.flush()
+    db.add(RetrospectiveParticipant(retrospective_id=retro.id, user_id=user.id))
+    db.commit()
+    retro_id, token = retro.id, create_access_token({"sub": str(user.id), "email": user.email})
+    db.close()
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _network_latency(conn, cursor, statement, parameters, context, executemany):
+        time.sleep(latency)
+
+    def _db():
+        session = Session()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app = FastAPI()
+    app.dependency_overrides[get_db] = _db
+
+    @app.get("/before/{retro_id}")
+    async def before(retro_id: int, current_user=Depends(get_current_user), db=Depends(get_db)):
+        return get_retrospective(retro_id, current_user=current_user, db=db)
+
+    app.get("/after/{retro_id}")(get_retrospective)
+    return app, engine, retro_id, token
+
+
+async def _drive(app, path: str, token: str, requests: int, concurrency: int) -> float:
+    import httpx
+
+    headers = {"Authorization": f"Bearer {token}"}
+    remaining = iter(range(requests))
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        async def worker():
+            for _ in remaining:
+                response = await client.get(path, headers=headers)
+                assert response.status_code == 200, response.text
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return requests / (time.perf_counter() - t0)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Requests/sec of inline-blocking vs threadpool route handlers.")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Simulated DB round trip per statement.")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app, engine, retro_id, token = _build(str(Path(tmp) / "bench.db"), args.latency_ms / 1000)
+        try:
+            results = {
+                mode: asyncio.run(_drive(app, f"/{mode}/{retro_id}", token, args.requests, args.concurrency))
+                for mode in ("before", "after")
+            }
+        finally:
+            engine.dispose()
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}, {args.latency_ms:.0f}ms per statement")
+    for mode, rps in results.items():
+        print(f"{mode:<8}{rps:>8.1f} req/s")
+    print(f"speedup {results['after'] / results['before']:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,216 @@
+"""
+Load test: many retrospectives running at once, as at a sprint boundary.
+
+Each simulated retrospective is the whole flow from benchmarks/retro_harness.py: every
+participant starts a 4Ls chat and sends messages, the facilitator generates groups,
+everyone polls /voting/{id}/status and votes, then discussion, summary and PDF. Steps
+are spaced by --think-ms so participants behave like people rather than a tight loop.
+
+The run steps through --levels (retrospectives in flight at once), fresh retrospectives
+per level, and reports for each level: throughput, per-phase and per-step latency
+percentiles, error rates and retrospective wall time. The saturation point is the first
+level where throughput grows by less than --min-gain over the previous level, the error
+rate exceeds --max-error-rate, or the overall p95 exceeds --max-p95-ms; the level before
+it is the most this worker configuration sustains.
+
+In-process (default): the app runs under httpx's ASGI transport with its real lifespan
+(API_THREADPOOL_SIZE etc.), OpenAI is benchmarks/openai_stub.py and Chroma a local store.
+    python benchmarks/load_retros.py --levels 1,2,4,8,16 --participants 8 --think-ms 500
+
+Against a running deployment (e.g. uvicorn --workers 4 pointed at the stub with
+OPENAI_BASE_URL), seeding goes straight to its database, so it must share SECRET_KEY:
+    python benchmarks/openai_stub.py --port 8765 &
+    python benchmarks/load_retros.py --base-url http://127.0.0.1:8000 --database-url postgresql://...
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from openai_stub import OpenAIStub, StubConfig  # noqa: E402
+import retro_harness  # noqa: E402
+
+
+async def _run_level(client, args, level: int) -> dict:
+    fixtures = retro_harness.seed_retrospectives(level, args.participants)
+    retro_seconds: List[float] = []
+
+    async def one(fixture):
+        start = time.perf_counter()
+        timings = await retro_harness.run_retro_flow(
+            client,
+            fixture,
+            responses=args.responses,
+            discussion_messages=args.discussion_messages,
+            concurrency=args.participants,
+            status_polls=args.status_polls,
+            pdf=not args.no_pdf,
+            think_ms=args.think_ms,
+        )
+        retro_seconds.append(time.perf_counter() - start)
+        return timings
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one(f) for f in fixtures))
+    elapsed = time.perf_counter() - start
+
+    timings = retro_harness.Timings()
+    for result in results:
+        timings.merge(result)
+    all_samples = sorted(ms for values in timings.samples.values() for ms in values)
+    requests = len(all_samples)
+    errors = sum(timings.errors.values())
+    retro_seconds.sort()
+    return {
+        "retros_in_flight": level,
+        "participants_in_flight": level * args.participants,
+        "seconds": round(elapsed, 3),
+        "requests": requests,
+        "requests_per_second": round(requests / elapsed, 2) if elapsed else 0.0,
+        "errors": errors,
+        "error_rate": round(errors / requests, 4) if requests else 0.0,
+        "p50_ms": round(retro_harness.percentile(all_samples, 50), 2),
+        "p95_ms": round(retro_harness.percentile(all_samples, 95), 2),
+        "p99_ms": round(retro_harness.percentile(all_samples, 99), 2),
+        "retro_seconds": {
+            "p50": round(retro_harness.percentile(retro_seconds, 50), 3),
+            "max": round(retro_seconds[-1], 3) if retro_seconds else 0.0,
+        },
+        "phases": timings.phase_summary(),
+        "steps": timings.summary(),
+        "error_examples": timings.error_examples,
+    }
+
+
+def _saturation(levels: List[dict], args) -> Optional[dict]:
+    previous = None
+    for result in levels:
+        reason = None
+        if result["error_rate"] > args.max_error_rate:
+            reason = f"error rate {result['error_rate']:.2%} > {args.max_error_rate:.2%}"
+        elif args.max_p95_ms and result["p95_ms"] > args.max_p95_ms:
+            reason = f"p95 {result['p95_ms']:.0f} ms > {args.max_p95_ms:.0f} ms"
+        elif previous is not None and result["requests_per_second"] < previous["requests_per_second"] * (1 + args.min_gain):
+            reason = (
+                f"throughput {result['requests_per_second']} req/s vs {previous['requests_per_second']} req/s "
+                f"at {previous['retros_in_flight']} (< {args.min_gain:.0%} gain)"
+            )
+        if reason:
+            return {
+                "retros_in_flight": result["retros_in_flight"],
+                "reason": reason,
+                "max_sustainable_retros": previous["retros_in_flight"] if previous else 0,
+            }
+        previous = result
+    return None
+
+
+async def _run(args, stub: Optional[OpenAIStub]) -> dict:
+    import httpx
+
+    levels = [int(x) for x in args.levels.split(",") if x.strip()]
+    results = []
+
+    async def drive(client):
+        if args.da_kb_chars and stub is not None:
+            retro_harness.seed_da_knowledge_base(args.da_kb_chars)
+        for level in levels:
+            result = await _run_level(client, args, level)
+            results.append(result)
+            print(
+                f"{level:4d} retros: {result['requests_per_second']:8.2f} req/s  p95 {result['p95_ms']:8.1f} ms  "
+                f"errors {result['error_rate']:.2%}",
+                file=sys.stderr,
+            )
+            if args.stop_at_saturation and _saturation(results, args):
+                break
+
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    if args.base_url:
+        async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+            await drive(client)
+    else:
+        async with retro_harness.running_app() as app:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://load", timeout=args.timeout) as client:
+                await drive(client)
+
+    from app.core.config import settings
+
+    return {
+        "benchmark": "load_retros",
+        "commit": retro_harness.git_commit(),
+        "config": {
+            "target": args.base_url or "in-process",
+            "database": "sqlite" if args.database_url is None else args.database_url.split(":", 1)[0],
+            "api_threadpool_size": settings.API_THREADPOOL_SIZE if not args.base_url else None,
+            "participants": args.participants,
+            "responses": args.responses,
+            "discussion_messages": args.discussion_messages,
+            "status_polls": args.status_polls,
+            "think_ms": args.think_ms,
+            "openai_latency_ms": args.latency_ms if stub is not None else None,
+            "levels": levels,
+        },
+        "saturation": _saturation(results, args),
+        "levels": results,
+        "stub_requests": dict(stub.config.requests) if stub is not None else None,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Concurrent retrospectives load test (stubbed OpenAI/Chroma).")
+    parser.add_argument("--levels", default="1,2,4,8", help="Comma-separated retrospectives in flight per step.")
+    parser.add_argument("--participants", type=int, default=8)
+    parser.add_argument("--responses", type=int, default=4, help="4Ls chat messages per participant.")
+    parser.add_argument("--discussion-messages", type=int, default=1)
+    parser.add_argument("--status-polls", type=int, default=3, help="/voting/{id}/status polls per participant.")
+    parser.add_argument("--think-ms", type=float, default=200.0, help="Mean pause between a participant's actions.")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="Stub OpenAI latency per chat completion.")
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--min-gain", type=float, default=0.10, help="Throughput gain below which a level saturates.")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--max-p95-ms", type=float, default=None)
+    parser.add_argument("--stop-at-saturation", action="store_true", help="Skip the levels after the saturation point.")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--no-pdf", action="store_true")
+    parser.add_argument("--da-kb-chars", type=int, default=5000, help="DA knowledge base size to index; 0 skips.")
+    parser.add_argument("--database-url", default=None, help="Default: a fresh SQLite file in a temp directory.")
+    parser.add_argument("--base-url", default=None, help="Load a running server instead of the in-process app.")
+    parser.add_argument("--output", default=None, help="Write the JSON report here as well as to stdout.")
+    args = parser.parse_args()
+    if args.base_url and not args.database_url:
+        parser.error("--base-url needs --database-url (the server's database, for seeding)")
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.base_url:
+            os.environ.update({"DATABASE_URL": args.database_url, "USE_LOCAL_DB": "true", "NEON_DATABASE_URL": ""})
+            report = asyncio.run(_run(args, None))
+        else:
+            config = StubConfig(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms)
+            with OpenAIStub(config) as stub:
+                database_url = args.database_url or f"sqlite:///{Path(tmp) / 'load.db'}"
+                retro_harness.configure_environment(database_url, stub.base_url, str(Path(tmp) / "chroma"))
+                report = asyncio.run(_run(args, stub))
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,220 @@
+"""
+Deterministic local stand-in for the OpenAI API, for benchmarks and load tests.
+
+Serves POST /v1/chat/completions and POST /v1/embeddings over HTTP, so the app's real
+OpenAI client, retries and circuit breakers stay in the measured path. Point the app at it
+with OPENAI_BASE_URL=http://127.0.0.1:<port>/v1 (and any OPENAI_API_KEY).
+
+Replies are shaped for the features that call them:
+  - json_object requests listing responses (grouping) get themes with response_ids
+  - other json_object requests (sprint summary) get summary/achievements/challenges
+  - chat replies nudge to the next 4Ls category after two user messages, like the model does
+Latency (--latency-ms +/- --jitter-ms) and completion token counts are configurable.
+
+Standalone:
+    python benchmarks/openai_stub.py --port 8765 --latency-ms 400
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+_RESPONSE_ID = re.compile(r'"id":\s*(\d+)')
+_CATEGORY = re.compile(r'"category":\s*"(\w+)"')
+
+
+class StubConfig:
+    def __init__(
+        self,
+        latency_ms: float = 300.0,
+        jitter_ms: float = 0.0,
+        completion_tokens: int = 120,
+        embedding_dim: int = 64,
+        embedding_latency_ms: float = 50.0,
+        seed: int = 7,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.completion_tokens = completion_tokens
+        self.embedding_dim = embedding_dim
+        self.embedding_latency_ms = embedding_latency_ms
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests: Dict[str, int] = {"chat": 0, "embeddings": 0}
+
+    def sleep(self, base_ms: float) -> None:
+        with self.lock:
+            jitter = self.random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        time.sleep(max(0.0, base_ms + jitter) / 1000)
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _grouping(prompt: str) -> Dict[str, Any]:
+    ids = [int(i) for i in _RESPONSE_ID.findall(prompt)]
+    categories = _CATEGORY.findall(prompt)
+    themes = []
+    count = min(5, max(1, math.ceil(len(ids) / 6)))
+    for t in range(count):
+        members = ids[t::count]
+        category = categories[t] if t < len(categories) else "liked"
+        themes.append({
+            "title": f"Theme {t + 1}",
+            "description": f"Responses about topic {t + 1}. Grouped by the benchmark stub.",
+            "primary_category": category,
+            "response_ids": members,
+        })
+    return {"themes": themes}
+
+
+def _summary() -> Dict[str, Any]:
+    return {
+        "summary": "The team delivered the sprint goal with some friction in reviews and planning.",
+        "achievements": ["Shipped the main feature", "Improved test coverage"],
+        "challenges": ["Slow code reviews", "Unclear acceptance criteria"],
+        "recommendations": ["Timebox reviews to one day", "Refine stories before planning"],
+    }
+
+
+def _chat_reply(messages: List[Dict[str, Any]]) -> str:
+    user_turns = sum(1 for m in messages if m.get("role") == "user")
+    if user_turns and user_turns % 2 == 0:
+        return "Thanks, that is clear. Now let's talk about the next category: what did you learn?"
+    return "Thanks for sharing. Can you say a bit more about the impact on the team?"
+
+
+def chat_completion(config: StubConfig, body: Dict[str, Any]) -> Dict[str, Any]:
+    messages = body.get("messages") or []
+    prompt = "\n".join(str(m.get("content") or "") for m in messages)
+    if (body.get("response_format") or {}).get("type") == "json_object":
+        payload = _grouping(prompt) if _RESPONSE_ID.search(prompt) else _summary()
+        content = json.dumps(payload)
+    else:
+        content = _chat_reply(messages)
+    prompt_tokens = _estimate_tokens(prompt)
+    completion_tokens = config.completion_tokens
+    config.sleep(config.latency_ms)
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model") or "stub",
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+def _embed(text: str, dim: int) -> List[float]:
+    digest = hashlib.sha256(text.encode()).digest()
+    values = [((digest[i % len(digest)] + i * 31) % 251) / 125.0 - 1.0 for i in range(dim)]
+    norm = math.sqrt(sum(v * v for v in values)) or 1.0
+    return [v / norm for v in values]
+
+
+def embeddings(config: StubConfig, body: Dict[str, Any]) -> Dict[str, Any]:
+    inputs = body.get("input") or []
+    if isinstance(inputs, str):
+        inputs = [inputs]
+    config.sleep(config.embedding_latency_ms)
+    tokens = sum(_estimate_tokens(str(t)) for t in inputs)
+    return {
+        "object": "list",
+        "data": [
+            {"object": "embedding", "index": i, "embedding": _embed(str(text), config.embedding_dim)}
+            for i, text in enumerate(inputs)
+        ],
+        "model": body.get("model") or "stub-embedding",
+        "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+    }
+
+
+def _handler(config: StubConfig):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):  # quiet
+            pass
+
+        def do_POST(self):
+            length = int(self.headers.get("content-length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+            if self.path.endswith("/chat/completions"):
+                kind, result = "chat", chat_completion(config, body)
+            elif self.path.endswith("/embeddings"):
+                kind, result = "embeddings", embeddings(config, body)
+            else:
+                self.send_error(404)
+                return
+            with config.lock:
+                config.requests[kind] += 1
+            data = json.dumps(result).encode()
+            self.send_response(200)
+            self.send_header("content-type", "application/json")
+            self.send_header("content-length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    return Handler
+
+
+class OpenAIStub:
+    """Runs the stub on a background thread; use as a context manager."""
+
+    def __init__(self, config: Optional[StubConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or StubConfig()
+        self._server = ThreadingHTTPServer((host, port), _handler(self.config))
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def __enter__(self) -> "OpenAIStub":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Deterministic local OpenAI API stub.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--completion-tokens", type=int, default=120)
+    args = parser.parse_args()
+    config = StubConfig(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, completion_tokens=args.completion_tokens)
+    stub = OpenAIStub(config, port=args.port)
+    print(f"OpenAI stub listening on {stub.base_url}")
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,356 @@
+"""
+Shared setup for the end-to-end benchmarks: environment, seeding and the retrospective flow.
+
+configure_environment() must run before anything imports `app`: it points the app at the
+benchmark database, the OpenAI stub (benchmarks/openai_stub.py) and a throwaway local
+Chroma directory (chromadb's in-process PersistentClient), so nothing leaves the machine.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+def _repo_root() -> Path:
+    return Path(__file__).resolve().parents[1]
+
+
+sys.path.insert(0, str(_repo_root()))
+
+CATEGORIES = ("liked", "learned", "lacked", "longed_for")
+
+
+def configure_environment(database_url: str, openai_base_url: str, chroma_dir: str) -> None:
+    os.environ.update({
+        "DATABASE_URL": database_url,
+        "USE_LOCAL_DB": "true",
+        "NEON_DATABASE_URL": "",
+        "OPENAI_API_KEY": "benchmark-stub",
+        "OPENAI_BASE_URL": openai_base_url,
+        "CHROMA_PERSIST_DIR": chroma_dir,
+        "CHROMA_API_KEY": "",
+        "CHROMA_TENANT": "",
+        "CHROMA_HOST": "",
+        "CHROMA_FORCE_CLOUD": "false",
+        "ANONYMIZED_TELEMETRY": "False",
+        "METRICS_ENABLED": "false",
+    })
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=_repo_root(), capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+@asynccontextmanager
+async def running_app():
+    """The real app with its lifespan (thread pool size, prompt registry, init_db)."""
+    import main
+
+    async with main.app.router.lifespan_context(main.app):
+        yield main.app
+
+
+@dataclass
+class RetroFixture:
+    retro_id: int
+    facilitator_token: str
+    participant_tokens: List[str]  # facilitator first
+
+    @property
+    def participants(self) -> int:
+        return len(self.participant_tokens)
+
+
+def seed_retrospectives(count: int, participants: int) -> List[RetroFixture]:
+    """count workspaces, each with `participants` members (owner = facilitator) and one in-progress retro."""
+    from sqlalchemy import insert
+
+    from app.api.routes.user_auth import create_access_token
+    from app.database.database import SessionLocal
+    from app.models.retrospective_new import Retrospective, RetrospectiveParticipant
+    from app.models.user import User
+    from app.models.workspace import Workspace, WorkspaceMember
+
+    db = SessionLocal()
+    fixtures = []
+    try:
+        offset = db.query(User).count()
+        for r in range(count):
+            users = [
+                User(
+                    email=f"bench{offset}-{r}-{i}@bench.local",
+                    username=f"bench{offset}_{r}_{i}",
+                    full_name=f"Participant {r}.{i}",
+                    hashed_password="x",
+                )
+                for i in range(participants)
+            ]
+            db.add_all(users)
+            db.flush()
+            facilitator = users[0]
+            workspace = Workspace(name=f"Bench {r}", created_by=facilitator.id)
+            db.add(workspace)
+            db.flush()
+            db.execute(insert(WorkspaceMember), [
+                {"workspace_id": workspace.id, "user_id": u.id, "role": "owner" if u is facilitator else "member"}
+                for u in users
+            ])
+            retro = Retrospective(
+                workspace_id=workspace.id,
+                code=f"{offset + r:05d}"[-5:],
+                title=f"Sprint {r} retrospective",
+                sprint_name=f"Sprint {r}",
+                facilitator_id=facilitator.id,
+                created_by=facilitator.id,
+                status="in_progress",
+                current_phase="input",
+            )
+            db.add(retro)
+            db.flush()
+            db.execute(insert(RetrospectiveParticipant), [
+                {"retrospective_id": retro.id, "user_id": u.id} for u in users
+            ])
+            fixtures.append(RetroFixture(
+                retro_id=retro.id,
+                facilitator_token=create_access_token({"sub": str(facilitator.id), "email": facilitator.email}),
+                participant_tokens=[
+                    create_access_token({"sub": str(u.id), "email": u.email}) for u in users
+                ],
+            ))
+        db.commit()
+    finally:
+        db.close()
+    return fixtures
+
+
+def seed_da_knowledge_base(max_chars: int = 20000) -> int:
+    """Index part of disciplined_agile_scrape.md into the local DA collection (stub embeddings)."""
+    from app.ai.openai_client import AIClient
+    from app.ai.rag.chroma_store import ChromaStore
+    from app.core.config import settings
+
+    source = _repo_root() / "disciplined_agile_scrape.md"
+    text = source.read_text(encoding="utf-8")[:max_chars] if source.exists() else "Disciplined Agile " * 2000
+    store = ChromaStore(collection_name=settings.CHROMA_DA_COLLECTION)
+    store.upsert_text_document(
+        ai=AIClient(),
+        source="disciplined_agile",
+        doc_id="benchmark",
+        text=text,
+        embedding_model=settings.AI_EMBEDDING_MODEL,
+        extra_metadata={"kb": "disciplined_agile"},
+    )
+    return len(text)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+@dataclass
+class Timings:
+    """Latency samples (ms) and errors per step, e.g. "input.message"."""
+
+    samples: Dict[str, List[float]] = field(default_factory=dict)
+    errors: Dict[str, int] = field(default_factory=dict)
+    error_examples: Dict[str, str] = field(default_factory=dict)
+
+    def record(self, step: str, ms: float, ok: bool, detail: str = "") -> None:
+        self.samples.setdefault(step, []).append(ms)
+        if not ok:
+            self.errors[step] = self.errors.get(step, 0) + 1
+            self.error_examples.setdefault(step, detail[:300])
+
+    def merge(self, other: "Timings") -> None:
+        for step, values in other.samples.items():
+            self.samples.setdefault(step, []).extend(values)
+        for step, n in other.errors.items():
+            self.errors[step] = self.errors.get(step, 0) + n
+        for step, detail in other.error_examples.items():
+            self.error_examples.setdefault(step, detail)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {step: _stats(values, self.errors.get(step, 0)) for step, values in self.samples.items()}
+
+    def phase_summary(self) -> Dict[str, Dict[str, float]]:
+        """The same figures per phase: all steps sharing the prefix before the first dot."""
+        samples: Dict[str, List[float]] = {}
+        errors: Dict[str, int] = {}
+        for step, values in self.samples.items():
+            phase = step.split(".", 1)[0]
+            samples.setdefault(phase, []).extend(values)
+            errors[phase] = errors.get(phase, 0) + self.errors.get(step, 0)
+        return {phase: _stats(values, errors[phase]) for phase, values in samples.items()}
+
+
+def _stats(values: List[float], errors: int) -> Dict[str, float]:
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        "errors": errors,
+        "error_rate": round(errors / len(ordered), 4),
+        "mean_ms": round(sum(ordered) / len(ordered), 2),
+        "p50_ms": round(percentile(ordered, 50), 2),
+        "p95_ms": round(percentile(ordered, 95), 2),
+        "p99_ms": round(percentile(ordered, 99), 2),
+        "max_ms": round(ordered[-1], 2),
+    }
+
+
+async def call(client, timings: Timings, step: str, method: str, url: str, token: str, **kwargs):
+    headers = {"Authorization": f"Bearer {token}", **kwargs.pop("headers", {})}
+    start = time.perf_counter()
+    try:
+        response = await client.request(method, url, headers=headers, **kwargs)
+    except Exception as e:
+        timings.record(step, (time.perf_counter() - start) * 1000, False, repr(e))
+        return None
+    ok = response.status_code < 400
+    timings.record(step, (time.perf_counter() - start) * 1000, ok, "" if ok else f"{response.status_code} {response.text}")
+    return response
+
+
+async def _gather_limited(coros, limit: int):
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def run(coro):
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*(run(c) for c in coros))
+
+
+async def _think(think_ms: float) -> None:
+    if think_ms > 0:
+        await asyncio.sleep(random.uniform(0.5, 1.5) * think_ms / 1000)
+
+
+async def _participant_input(
+    client, timings: Timings, retro_id: int, token: str, responses: int, think_ms: float = 0.0
+) -> None:
+    started = await call(client, timings, "input.start", "POST", f"/api/v1/fourls-chat/start?retrospective_id={retro_id}", token)
+    if started is None or started.status_code >= 400:
+        return
+    session_id = started.json()["session_id"]
+    for i in range(responses):
+        await _think(think_ms)
+        category = CATEGORIES[(i * len(CATEGORIES)) // max(1, responses)]
+        await call(
+            client, timings, "input.message", "POST", f"/api/v1/fourls-chat/{session_id}/message", token,
+            json={"message": f"About {category}: item {i} went as expected, with some notes for next sprint."},
+        )
+    await call(client, timings, "input.complete", "POST", f"/api/v1/fourls-chat/{session_id}/complete", token)
+
+
+async def run_retro_flow(
+    client,
+    fixture: RetroFixture,
+    *,
+    responses: int,
+    discussion_messages: int = 2,
+    concurrency: int = 50,
+    status_polls: int = 1,
+    pdf: bool = True,
+    think_ms: float = 0.0,
+    phase_seconds: Optional[Dict[str, float]] = None,
+) -> Timings:
+    """
+    One retrospective end to end: 4Ls input, grouping, voting, discussion, summary, PDF.
+
+    think_ms spaces out each participant's chat messages and status polls (randomised
+    +/-50%), as people typing and the UI's poll interval would.
+    """
+    timings = Timings()
+    retro_id, facilitator = fixture.retro_id, fixture.facilitator_token
+    tokens = fixture.participant_tokens
+
+    async def phase(name, coro):
+        start = time.perf_counter()
+        result = await coro
+        if phase_seconds is not None:
+            phase_seconds[name] = phase_seconds.get(name, 0.0) + time.perf_counter() - start
+        return result
+
+    await phase("input", _gather_limited(
+        [_participant_input(client, timings, retro_id, t, responses, think_ms) for t in tokens], concurrency
+    ))
+
+    async def grouping():
+        await call(client, timings, "grouping.generate", "POST", f"/api/v1/grouping/{retro_id}/generate", facilitator)
+        await _gather_limited(
+            [call(client, timings, "grouping.get", "GET", f"/api/v1/grouping/{retro_id}", t) for t in tokens], concurrency
+        )
+
+    await phase("grouping", grouping())
+
+    async def voting():
+        await call(client, timings, "voting.start", "POST", f"/api/v1/voting/{retro_id}/start", facilitator)
+
+        async def vote(token):
+            status = None
+            for _ in range(max(1, status_polls)):
+                await _think(think_ms)
+                status = await call(client, timings, "voting.status", "GET", f"/api/v1/voting/{retro_id}/status", token)
+            themes = [t["theme_id"] for t in (status.json().get("theme_votes") or [])] if status is not None and status.status_code < 400 else []
+            if not themes:
+                return
+            allocations = [{"theme_group_id": themes[i % len(themes)], "votes": 1} for i in range(min(10, 3 * len(themes)))]
+            await call(
+                client, timings, "voting.submit", "POST", f"/api/v1/voting/{retro_id}/submit-votes", token,
+                json={"allocations": allocations},
+            )
+
+        await _gather_limited([vote(t) for t in tokens], concurrency)
+        await call(client, timings, "voting.finalize", "POST", f"/api/v1/voting/{retro_id}/finalize", facilitator, json={"bypass": True})
+
+    await phase("voting", voting())
+
+    async def discussion():
+        topics = await call(client, timings, "discussion.topics", "GET", f"/api/v1/discussion/{retro_id}/topics", facilitator)
+        topic_ids = [t["id"] for t in topics.json()] if topics is not None and topics.status_code < 400 else []
+
+        async def talk(token, i):
+            if topic_ids:
+                for m in range(discussion_messages):
+                    await _think(think_ms)
+                    await call(
+                        client, timings, "discussion.message", "POST", f"/api/v1/discussion/{topic_ids[0]}/message", token,
+                        json={"message": f"Suggestion {m} from participant {i}: pair on reviews."},
+                    )
+            await call(
+                client, timings, "discussion.chat", "POST", f"/api/v1/discussion/{retro_id}/chat", token,
+                json={"message": "Which theme should we tackle first?"},
+            )
+
+        await _gather_limited([talk(t, i) for i, t in enumerate(tokens)], concurrency)
+        await call(client, timings, "discussion.da_recommendations", "GET", f"/api/v1/discussion/{retro_id}/da-recommendations", facilitator)
+
+    await phase("discussion", discussion())
+
+    async def summary():
+        await call(client, timings, "summary.generate", "POST", f"/api/v1/discussion/{retro_id}/generate-summary", facilitator)
+        await call(client, timings, "summary.get", "GET", f"/api/v1/discussion/{retro_id}/summary", facilitator)
+
+    await phase("summary", summary())
+
+    if pdf:
+        await phase("pdf", call(client, timings, "pdf.download", "GET", f"/api/v1/discussion/{retro_id}/summary/pdf", facilitator))
+
+    return timings
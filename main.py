@@ -3,20 +3,24 @@ YodaAI - Conversational 4Ls Retrospective Assistant
 Main FastAPI application entry point
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 import uvicorn
-import os
 import logging
 from contextlib import asynccontextmanager
+from typing import Optional
 
+from app.ai import usage_ledger
+from app.core import metrics, ui_assets
 from app.core.config import settings
+from app.core.query_profiler import QueryProfilerMiddleware
+from app.api.dependencies.auth import require_bearer_secret
 from app.api.routes import (
     action_items, scheduling, user_auth, users,
     workspaces, retrospectives_full, fourls_chat, grouping, voting, discussion_summary, 
-    google_auth, workspace_invitations, onboarding, workspace_documents
+    google_auth, workspace_invitations, onboarding, workspace_documents, admin
 )
 
 # Configure logging
@@ -28,6 +32,23 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     """Application lifespan manager"""
     # Startup
+    # Sync (def) route handlers and dependencies run in this thread pool; size it to the DB pool
+    import anyio.to_thread
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.API_THREADPOOL_SIZE
+
+    # Compile prompt templates once and fail fast on placeholder mismatches
+    from app.ai.prompt_loader import prompt_registry
+    prompt_registry.load_all()
+    prompt_registry.validate()
+    logger.info("✅ Prompt templates compiled and validated")
+
+    # Load and compress the UI documents now rather than on the first page view
+    for name in ("yodaai-app.html", "retrospective.html"):
+        try:
+            ui_assets.get_asset(name)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not preload UI asset {name}: {e}")
+
     try:
         logger.info("Starting YodaAI application...")
         logger.info(f"Environment: {settings.ENVIRONMENT}")
@@ -46,6 +67,11 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down YodaAI application")
+    from app.ai.usage_ledger import ledger
+    try:
+        ledger.flush()  # buffered AI usage rows
+    except Exception as e:
+        logger.warning(f"⚠️ Could not flush AI usage ledger: {e}")
 
 
 # Create FastAPI application
@@ -63,7 +89,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # keyset pagination cursor for list endpoints
 )
+# Added first so it runs inside MetricsMiddleware and shares its per-request SQL stats
+app.add_middleware(QueryProfilerMiddleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+if usage_ledger.flush_per_request():
+    app.add_middleware(usage_ledger.UsageLedgerFlushMiddleware)
 
 # Include API routes
 app.include_router(user_auth.router, prefix="/api/v1/user-auth", tags=["authentication"])
@@ -96,45 +129,45 @@ app.include_router(voting.router)  # Has its own prefix
 app.include_router(discussion_summary.router)  # Has its own prefix
 app.include_router(action_items.router, prefix="/api/v1/action-items", tags=["action-items"])
 app.include_router(scheduling.router, prefix="/api/v1/scheduling", tags=["scheduling"])
+app.include_router(admin.router)  # Has its own prefix
+
+# UI documents come from an in-memory cache with gzip/brotli variants, ETags and 304s
+# (app/core/ui_assets.py). Plain def: the first load of a file reads and compresses it.
 
 # Serve yodaai-app.html at /yodaai-app (clean URL without /ui and .html)
 @app.get("/yodaai-app")
-async def serve_yodaai_app():
+def serve_yodaai_app(request: Request):
     """Serve the main YodaAI application"""
-    file_path = os.path.join("app/ui", "yodaai-app.html")
-    if os.path.exists(file_path):
-        return FileResponse(file_path, media_type="text/html")
-    raise HTTPException(status_code=404, detail="Application file not found")
+    return ui_assets.serve_ui_file(request, "yodaai-app.html")
 
 # Serve retrospective.html at /retrospective (clean URL without /ui and .html)
 @app.get("/retrospective")
-async def serve_retrospective():
+def serve_retrospective(request: Request):
     """Serve the retrospective application"""
-    file_path = os.path.join("app/ui", "retrospective.html")
-    if os.path.exists(file_path):
-        return FileResponse(file_path, media_type="text/html")
-    raise HTTPException(status_code=404, detail="Retrospective file not found")
+    return ui_assets.serve_ui_file(request, "retrospective.html")
 
 # Handle retrospective with code path (e.g., /retrospective/{code})
 @app.get("/retrospective/{code}")
-async def serve_retrospective_with_code(code: str):
+def serve_retrospective_with_code(code: str, request: Request):
     """Serve the retrospective application with a specific code"""
-    file_path = os.path.join("app/ui", "retrospective.html")
-    if os.path.exists(file_path):
-        return FileResponse(file_path, media_type="text/html")
-    raise HTTPException(status_code=404, detail="Retrospective file not found")
+    return ui_assets.serve_ui_file(request, "retrospective.html")
+
+# The same documents under their /ui paths; other files fall through to the static mount
+@app.get("/ui/{name}.html", include_in_schema=False)
+def serve_ui_html(name: str, request: Request):
+    """Serve an HTML document from app/ui"""
+    if "/" in name or name.startswith("."):
+        raise HTTPException(status_code=404, detail="Not Found")
+    return ui_assets.serve_ui_file(request, f"{name}.html")
 
 # Mount static UI under /ui (for backward compatibility and static assets)
 app.mount("/ui", StaticFiles(directory="app/ui", html=True), name="ui")
 
 
 @app.get("/")
-async def root():
+def root(request: Request):
     """Root endpoint - serves the main YodaAI application"""
-    file_path = os.path.join("app/ui", "yodaai-app.html")
-    if os.path.exists(file_path):
-        return FileResponse(file_path, media_type="text/html")
-    raise HTTPException(status_code=404, detail="Application file not found")
+    return ui_assets.serve_ui_file(request, "yodaai-app.html")
 
 
 @app.get("/health")
@@ -143,6 +176,19 @@ async def health_check():
     return {"status": "healthy", "service": "yodaai"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics_endpoint(authorization: Optional[str] = Header(None)):
+    """Prometheus scrape endpoint"""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    # Without METRICS_TOKEN: open in development (e.g. scraped over a private network); 503 on
+    # serverless or production deployments, which are reachable by anyone
+    from app.database.database import IS_SERVERLESS
+    public = IS_SERVERLESS or settings.ENVIRONMENT.lower() == "production"
+    require_bearer_secret(authorization, settings.METRICS_TOKEN, "METRICS_TOKEN", required=public)
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
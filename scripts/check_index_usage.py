@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+
+def _repo_root() -> Path:
+    return Path(__file__).resolve().parents[1]
+
+
+def _hot_queries():
+    """(description, statement, index the planner must use) for the hottest filters."""
+    from sqlalchemy import func, select
+
+    from app.models.onboarding import AutomatedReminder
+    from app.models.email_outbox import EmailOutbox
+    from app.models.retrospective_new import (
+        ChatMessage, DiscussionMessage, DiscussionTopic, RetrospectiveParticipant,
+        RetrospectiveResponse, VoteAllocation,
+    )
+    from app.models.workspace import WorkspaceMember
+
+    return [
+        (
+            "participant check",
+            select(RetrospectiveParticipant.id).where(
+                RetrospectiveParticipant.retrospective_id == 1, RetrospectiveParticipant.user_id == 1),
+            "uq_retrospective_participants_retro_user",
+        ),
+        (
+            "theme tally in a voting session",
+            select(func.sum(VoteAllocation.votes_allocated)).where(
+                VoteAllocation.voting_session_id == 1, VoteAllocation.theme_group_id == 1),
+            "uq_vote_allocations_session_theme_user",
+        ),
+        (
+            "user's votes in a voting session",
+            select(func.sum(VoteAllocation.votes_allocated)).where(
+                VoteAllocation.voting_session_id == 1, VoteAllocation.user_id == 1),
+            "ix_vote_allocations_session_user",
+        ),
+        (
+            "chat history",
+            select(ChatMessage.id).where(ChatMessage.session_id == 1).order_by(ChatMessage.created_at),
+            "ix_chat_messages_session_created",
+        ),
+        (
+            "discussion history",
+            select(DiscussionMessage.id).where(
+                DiscussionMessage.discussion_topic_id == 1).order_by(DiscussionMessage.created_at),
+            "ix_discussion_messages_topic_created",
+        ),
+        (
+            "discussion topic for theme",
+            select(DiscussionTopic.id).where(DiscussionTopic.retrospective_id == 1, DiscussionTopic.theme_group_id == 1),
+            "uq_discussion_topics_retro_theme",
+        ),
+        (
+            "active workspace membership",
+            select(WorkspaceMember.id).where(
+                WorkspaceMember.workspace_id == 1, WorkspaceMember.user_id == 1, WorkspaceMember.is_active == True),
+            "ix_workspace_members_ws_user_active",
+        ),
+        (
+            "responses in a theme",
+            select(RetrospectiveResponse.id).where(
+                RetrospectiveResponse.retrospective_id == 1, RetrospectiveResponse.theme_group_id == 1),
+            "ix_retrospective_responses_retro_theme",
+        ),
+        (
+            "due reminders",
+            select(AutomatedReminder.id).where(
+                AutomatedReminder.status == "pending", AutomatedReminder.scheduled_for <= func.now()),
+            "ix_automated_reminders_status_scheduled_for",
+        ),
+        (
+            "due outbox emails",
+            select(EmailOutbox.id).where(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= func.now()),
+            "ix_email_outbox_status_next_attempt",
+        ),
+    ]
+
+
+def _plan(conn, statement) -> str:
+    from sqlalchemy import text
+
+    sql = str(statement.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    if conn.dialect.name == "sqlite":
+        rows = conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+        return "\n".join(str(row[-1]) for row in rows)
+    rows = conn.execute(text(f"EXPLAIN {sql}")).all()
+    return "\n".join(str(row[0]) for row in rows)
+
+
+def main() -> int:
+    root = _repo_root()
+    # Allow `python scripts/...py` from repo root without installing as a package
+    sys.path.insert(0, str(root))
+
+    parser = argparse.ArgumentParser(
+        description="EXPLAIN the hottest queries and fail unless each one uses its composite index.",
+    )
+    parser.add_argument(
+        "--database-url",
+        default=None,
+        help="Database to check (e.g. a migrated Postgres). Default: in-memory SQLite built from the models.",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Print every query plan.")
+    args = parser.parse_args()
+
+    from sqlalchemy import create_engine, text
+
+    from app.database.database import Base
+    import app.models  # noqa: F401  (register all tables)
+
+    if args.database_url:
+        engine = create_engine(args.database_url)
+    else:
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(bind=engine)
+
+    failures = 0
+    with engine.connect() as conn:
+        if conn.dialect.name == "postgresql":
+            # Tiny tables make a seq scan cheapest; we want to know the index is usable at all
+            conn.execute(text("SET enable_seqscan = off"))
+
+        for description, statement, index_name in _hot_queries():
+            plan = _plan(conn, statement)
+            ok = index_name in plan
+            failures += 0 if ok else 1
+            print(f"{'OK  ' if ok else 'FAIL'} {description:<34} {index_name}")
+            if args.verbose or not ok:
+                for line in plan.splitlines():
+                    print(f"       {line}")
+
+    engine.dispose()
+    print("all hot queries use their indexes" if not failures else f"{failures} queries do not use their index")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,54 @@
+"""
+Build step: write <file>.gz and <file>.br next to each UI document in app/ui.
+
+app/core/ui_assets.py serves these instead of compressing at startup (brotli at maximum
+quality is too slow to do per process). Run it before deploying, after any UI change:
+    python scripts/precompress_ui.py
+Brotli variants need the `brotli` package; without it only .gz files are written.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import sys
+from pathlib import Path
+
+
+def _repo_root() -> Path:
+    return Path(__file__).resolve().parents[1]
+
+
+sys.path.insert(0, str(_repo_root()))
+
+
+def main() -> int:
+    from app.core import ui_assets
+
+    parser = argparse.ArgumentParser(description="Precompress the UI documents (gzip + brotli).")
+    parser.add_argument("--dir", default=str(_repo_root() / ui_assets.UI_DIR))
+    parser.add_argument("--pattern", default="*.html")
+    args = parser.parse_args()
+
+    sources = sorted(Path(args.dir).glob(args.pattern))
+    if not sources:
+        print(f"No files matching {args.pattern} in {args.dir}")
+        return 1
+    if ui_assets.brotli is None:
+        print("brotli is not installed: writing .gz only")
+    for source in sources:
+        data = source.read_bytes()
+        sizes = [f"{len(data) // 1024} KB"]
+        gz = gzip.compress(data, compresslevel=9, mtime=0)
+        source.with_name(source.name + ".gz").write_bytes(gz)
+        sizes.append(f"gzip {len(gz) // 1024} KB")
+        br = ui_assets.brotli_bytes(data, quality=ui_assets.BUILD_BROTLI_QUALITY)
+        if br is not None:
+            source.with_name(source.name + ".br").write_bytes(br)
+            sizes.append(f"br {len(br) // 1024} KB")
+        print(f"✅ {source.name}: " + ", ".join(sizes))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())